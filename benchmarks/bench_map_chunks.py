@@ -0,0 +1,92 @@
+"""
+區塊化地圖基準測試
+
+對不同大小的地圖量測建立時間，並讓攝影機橫越地圖、每幀繪製可視範圍，
+回報區塊載入與卸載次數、平均每幀時間以及行程的峰值記憶體（RSS）。
+每個地圖大小在獨立的子行程中執行，峰值 RSS 因此互不影響。
+
+執行方式：
+    python benchmarks/bench_map_chunks.py
+    python benchmarks/bench_map_chunks.py --size 2000x2000 --budget-mb 32
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame  # noqa: E402
+
+from src.map import Map  # noqa: E402
+
+SIZES = ["20x15", "200x200", "2000x2000", "10000x10000"]
+VIEWPORT = (800, 600)
+FRAMES = 600
+CAMERA_SPEED = 40  # 攝影機每幀移動的像素
+
+
+def peak_rss_mb() -> float:
+    """取得行程的峰值 RSS（MB，Linux 的 ru_maxrss 單位為 KB）"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(width: int, height: int, budget_mb: int) -> None:
+    pygame.init()
+    screen = pygame.display.set_mode(VIEWPORT)
+
+    start = time.perf_counter()
+    budget = budget_mb << 20
+    game_map = Map(seed=1, width=width, height=height, memory_budget=budget)
+    construct = time.perf_counter() - start
+
+    # 攝影機從左上往右下斜向移動，撞到地圖邊緣就停止
+    view = pygame.Rect((0, 0), VIEWPORT)
+    world = game_map.rect
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        game_map.draw(screen, view, view.topleft)
+        game_map.draw_bushes(screen, [view], view.topleft)
+        view.move_ip(CAMERA_SPEED, CAMERA_SPEED // 2)
+        view.clamp_ip(world)
+    frame = (time.perf_counter() - start) / FRAMES
+
+    print(
+        f"{f'{width}x{height}':<12} construct: {construct * 1e3:8.2f} ms   "
+        f"frame: {frame * 1e3:6.2f} ms   "
+        f"loads: {game_map.chunk_loads:4d}   "
+        f"evictions: {game_map.chunk_evictions:4d}   "
+        f"resident: {game_map.memory_usage / (1 << 20):6.1f} MB   "
+        f"peak RSS: {peak_rss_mb():7.1f} MB"
+    )
+    pygame.quit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="區塊化地圖基準測試")
+    parser.add_argument("--size", help="只執行單一地圖大小，例如 2000x2000")
+    parser.add_argument(
+        "--budget-mb",
+        type=int,
+        default=Map.MEMORY_BUDGET >> 20,
+        help="區塊記憶體預算（MB）",
+    )
+    args = parser.parse_args()
+
+    if args.size:
+        width, height = (int(value) for value in args.size.split("x"))
+        run(width, height, args.budget_mb)
+        return
+
+    for size in SIZES:
+        command = [sys.executable, __file__, "--size", size]
+        subprocess.run(command + ["--budget-mb", str(args.budget_mb)], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+地圖繪製基準測試
+
+比較清除畫面後逐一 blit 地形精靈（舊做法）與預先繪製地形層（新做法）的
+每幀 blit 次數與平均繪製時間。
+
+執行方式：
+    python benchmarks/bench_map_draw.py
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame  # noqa: E402
+
+from src.map import Map  # noqa: E402
+
+FRAMES = 2000
+
+
+class CountingSurface(pygame.Surface):
+    """記錄 blit 次數的 Surface"""
+
+    def __init__(self, size) -> None:
+        super().__init__(size)
+        self.blit_count = 0
+
+    def blit(self, *args, **kwargs):
+        self.blit_count += 1
+        return super().blit(*args, **kwargs)
+
+    def blits(self, blit_sequence, *args, **kwargs):
+        blit_sequence = list(blit_sequence)
+        self.blit_count += len(blit_sequence)
+        return super().blits(blit_sequence, *args, **kwargs)
+
+
+def draw_per_sprite(game_map: Map, surface: pygame.Surface) -> None:
+    """舊做法：每幀清除畫面後逐一繪製減速地帶與障礙物"""
+    surface.fill(Map.BACKGROUND_COLOR)
+    for grid_y in range(game_map.height):
+        for grid_x in range(game_map.width):
+            position = (grid_x * Map.GRID_SIZE, grid_y * Map.GRID_SIZE)
+            for image in game_map._tile_layers(game_map.tile_code(grid_x, grid_y)):
+                surface.blit(image, position)
+
+
+def draw_cached(game_map: Map, surface: pygame.Surface) -> None:
+    """新做法：繪製不透明的地形層（同時取代清除畫面）"""
+    game_map.draw(surface)
+
+
+def run(name: str, draw, game_map: Map, size) -> None:
+    surface = CountingSurface(size)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        draw(game_map, surface)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<12} blits/frame: {surface.blit_count / FRAMES:6.1f}   "
+        f"avg: {elapsed / FRAMES * 1e6:8.1f} us/frame"
+    )
+
+
+def main() -> None:
+    pygame.init()
+    size = (Map.MAP_WIDTH * Map.GRID_SIZE, Map.MAP_HEIGHT * Map.GRID_SIZE)
+    pygame.display.set_mode(size)
+
+    game_map = Map()
+    tiles = [
+        game_map.tile_code(grid_x, grid_y)
+        for grid_y in range(game_map.height)
+        for grid_x in range(game_map.width)
+    ]
+    obstacles = sum(1 for tile in tiles if tile & Map.TILE_SOLID)
+    slow_zones = sum(1 for tile in tiles if tile & Map.TILE_SLOW)
+    print(f"obstacles: {obstacles}  slow zones: {slow_zones}")
+    run("per-sprite", draw_per_sprite, game_map, size)
+    run("cached", draw_cached, game_map, size)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+子彈與爆炸物件池基準測試
+
+模擬長時間的激烈交火：每幀從地圖各處發射大量玩家子彈，
+敵人被擊毀後立即補充，讓子彈池與爆炸物件池持續回收再利用。
+回報平均每幀時間、垃圾回收（GC）次數與暫停時間、記憶體區塊的淨增加量，
+以及兩個物件池的容量與最高紀錄。
+
+執行方式：
+    python benchmarks/bench_pools.py
+    python benchmarks/bench_pools.py --frames 20000 --bullets 20
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame  # noqa: E402
+
+from src.game import Game  # noqa: E402
+
+ENEMIES = 12  # 同時存在的敵人數量
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+
+class GCTimer:
+    """透過 gc.callbacks 統計各世代的回收次數與總暫停時間"""
+
+    def __init__(self) -> None:
+        self.collections = [0, 0, 0]
+        self.pause = 0.0
+        self._start = 0.0
+
+    def __call__(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._start = time.perf_counter()
+        else:
+            self.pause += time.perf_counter() - self._start
+            self.collections[info["generation"]] += 1
+
+
+def run(frames: int, bullets_per_frame: int) -> None:
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    rng = random.Random(1)
+    game = Game()
+    keys = pygame.key.get_pressed()
+    width, height = game.map.pixel_width, game.map.pixel_height
+
+    def step() -> None:
+        # 玩家不會死亡，敵人被擊毀後立即補充
+        game.player.lives = 99
+        game.game_over = game.game_won = False
+        while len(game.enemies) < ENEMIES:
+            game.spawn_enemy()
+        for _ in range(bullets_per_frame):
+            position = (rng.randrange(width), rng.randrange(height))
+            game.bullets.spawn(*position, rng.choice(DIRECTIONS), owner="player")
+        game.update(keys)
+
+    # 暖機：讓物件池達到穩定容量後再開始量測
+    for _ in range(600):
+        step()
+
+    timer = GCTimer()
+    gc.callbacks.append(timer)
+    blocks = sys.getallocatedblocks()
+    start = time.perf_counter()
+    for _ in range(frames):
+        step()
+    elapsed = time.perf_counter() - start
+    gc.callbacks.remove(timer)
+    growth = sys.getallocatedblocks() - blocks
+
+    bullets = game.bullets
+    explosions = game.explosion_pool
+    print(f"frames: {frames}   bullets/frame: {bullets_per_frame}")
+    print(f"frame time:       {elapsed / frames * 1e3:8.3f} ms")
+    print(
+        "gc collections:   "
+        f"gen0 {timer.collections[0]}  gen1 {timer.collections[1]}  "
+        f"gen2 {timer.collections[2]}   pause {timer.pause * 1e3:.2f} ms"
+    )
+    print(f"allocated blocks: {growth:+d}")
+    print(
+        f"bullet pool:      capacity {bullets.capacity}  "
+        f"high water {bullets.high_water}  live {len(bullets)}"
+    )
+    print(
+        f"explosion pool:   capacity {explosions.capacity}  "
+        f"high water {explosions.high_water}  created {explosions.created}"
+    )
+    pygame.quit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="子彈與爆炸物件池基準測試")
+    parser.add_argument("--frames", type=int, default=10000, help="量測的幀數")
+    parser.add_argument("--bullets", type=int, default=10, help="每幀發射的子彈數")
+    args = parser.parse_args()
+    run(args.frames, args.bullets)
+
+
+if __name__ == "__main__":
+    main()
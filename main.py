@@ -5,7 +5,9 @@
 視窗尺寸：800x600 像素
 """
 
+import argparse
 import sys
+from typing import List, Optional
 
 try:
     import pygame
@@ -17,16 +19,173 @@ except ImportError:
     print("  pip install pygame-ce>=2.5.0")
     sys.exit(1)
 
+from src import headless, replay, stress
 from src.game import Game
+from src.map import Map
+from src.renderer import DirtyRectRenderer
+from src.waves import WaveScheduler
 
 
-def main() -> None:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    解析命令列參數
+
+    參數：
+        argv: 命令列參數列表，None 表示使用 sys.argv
+
+    返回：
+        argparse.Namespace - 解析後的參數
+    """
+    parser = argparse.ArgumentParser(prog="tank-war", description="坦克大戰")
+    parser.add_argument(
+        "--dirty-rects",
+        action="store_true",
+        help="只重繪有變動的區域（降低低階機台的 CPU 使用）",
+    )
+    parser.add_argument(
+        "--map-width",
+        type=int,
+        default=Map.MAP_WIDTH,
+        help=f"地圖寬度（格子數，預設 {Map.MAP_WIDTH}）",
+    )
+    parser.add_argument(
+        "--map-height",
+        type=int,
+        default=Map.MAP_HEIGHT,
+        help=f"地圖高度（格子數，預設 {Map.MAP_HEIGHT}）",
+    )
+    parser.add_argument(
+        "--fps",
+        type=int,
+        default=60,
+        help="繪製幀率上限（預設 60，不影響模擬速度）",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="模擬速度倍率（預設 1.0，大於 1 表示快轉）",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="無頭模式：不開視窗、不播音效、不限幀率，由腳本操作玩家",
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=10000,
+        help="無頭模式的模擬步數（預設 10000）",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="對局的亂數種子（預設隨機），相同種子與相同操作得到相同結果",
+    )
+    parser.add_argument(
+        "--waves",
+        action="store_true",
+        help="啟用敵人波次：對局中依波次表陸續派出敵人，全部擊毀才獲勝",
+    )
+    parser.add_argument(
+        "--spawn-budget-ms",
+        type=float,
+        default=None,
+        metavar="MS",
+        help="每一步生成波次敵人的時間預算（毫秒，預設只限制每步生成數）；"
+        "會使模擬失去確定性，錄製與播放回放時不套用",
+    )
+    parser.add_argument(
+        "--ai-budget-ms",
+        type=float,
+        default=None,
+        metavar="MS",
+        help="每一步遠處敵人 AI 的時間預算（毫秒，預設不限制）；"
+        "會使模擬失去確定性，錄製與播放回放時不套用",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="錄製回放（種子與每一步的輸入）並在結束時寫入檔案",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="播放回放檔案（搭配 --headless 時不開視窗並回報最慢的幾步）",
+    )
+    parser.add_argument(
+        "--seek",
+        type=float,
+        default=0.0,
+        help="回放開始的時間點（秒）",
+    )
+    parser.add_argument(
+        "--stress",
+        action="store_true",
+        help="壓力測試：建立重度戰鬥場景，模擬 --frames 步並回報每幀耗時的百分位數",
+    )
+    parser.add_argument(
+        "--stress-enemies",
+        type=int,
+        default=stress.DEFAULT_ENEMIES,
+        metavar="N",
+        help=f"壓力測試中每種類型的敵人數（預設 {stress.DEFAULT_ENEMIES}）",
+    )
+    parser.add_argument(
+        "--stress-bullets",
+        type=int,
+        default=stress.DEFAULT_BULLETS,
+        metavar="M",
+        help=f"壓力測試中維持的子彈數（預設 {stress.DEFAULT_BULLETS}）",
+    )
+    parser.add_argument(
+        "--stress-bricks",
+        type=float,
+        default=stress.DEFAULT_BRICK_DENSITY,
+        metavar="DENSITY",
+        help=f"壓力測試的磚塊密度（預設 {stress.DEFAULT_BRICK_DENSITY}，上限約 0.25）",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """
     遊戲主程式進入點。
 
     初始化 pygame 並啟動遊戲主循環。
     視窗尺寸為 800x600 像素。
+
+    遊戲狀態以固定的模擬步長更新，與繪製幀率分開：
+    每幀把經過的真實時間（乘以速度倍率）累積起來，足夠幾步就更新幾步，
+    因此不論 --fps 設定為多少，模擬結果都相同。
+
+    參數：
+        argv: 命令列參數列表，None 表示使用 sys.argv
     """
+    args = parse_args(argv)
+
+    if args.stress:
+        stress.run(
+            args.frames,
+            args.stress_enemies,
+            args.stress_bullets,
+            args.stress_bricks,
+            args.seed,
+            args.map_width,
+            args.map_height,
+        )
+        return
+
+    if args.headless:
+        if args.replay:
+            replay.play_headless(args.replay, args.seek)
+        else:
+            headless.run(
+                args.frames, args.seed, args.map_width, args.map_height, args.waves
+            )
+        return
+
     # 初始化 pygame
     pygame.init()
 
@@ -37,7 +196,8 @@ def main() -> None:
     WINDOW_WIDTH = 800
     WINDOW_HEIGHT = 600
     WINDOW_TITLE = "坦克大戰"
-    FPS = 60
+    FPS = args.fps
+    MAX_FRAME_TIME = 250  # 單幀最多累積的真實時間（毫秒），避免卡頓後瘋狂追趕
 
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption(WINDOW_TITLE)
@@ -48,8 +208,52 @@ def main() -> None:
     # 顏色常數（RGB 格式）
     BLACK = (0, 0, 0)
 
-    # 創建遊戲實例
-    game = Game()
+    # 回放播放器與錄製器（--replay / --record）
+    replay_player: Optional[replay.ReplayPlayer] = None
+    recorder: Optional[replay.ReplayRecorder] = None
+
+    if args.replay:
+        # 播放回放：以回放的種子、地圖大小與波次表建立遊戲，輸入來自回放檔案
+        recording = replay.Replay.load(args.replay)
+        game = Game(
+            map_width=recording.map_width,
+            map_height=recording.map_height,
+            viewport_size=(WINDOW_WIDTH, WINDOW_HEIGHT),
+            seed=recording.seed,
+            waves=recording.waves,
+        )
+        replay_player = replay.ReplayPlayer(recording, game)
+        replay_player.seek(int(args.seek * recording.tick_rate))
+    else:
+        # 創建遊戲實例（地圖大於視窗時攝影機會跟隨玩家捲動）
+        game = Game(
+            map_width=args.map_width,
+            map_height=args.map_height,
+            viewport_size=(WINDOW_WIDTH, WINDOW_HEIGHT),
+            seed=args.seed,
+            waves=WaveScheduler.default_waves() if args.waves else (),
+        )
+        if args.record:
+            recorder = replay.ReplayRecorder(game)
+
+    # 時間預算取決於實際執行時間，回放必須逐步重現，只在一般遊玩時套用
+    if args.ai_budget_ms is not None or args.spawn_budget_ms is not None:
+        if replay_player is not None or recorder is not None:
+            print("注意：錄製或播放回放時不套用 --ai-budget-ms 與 --spawn-budget-ms")
+        else:
+            game.ai_scheduler.budget_ms = args.ai_budget_ms
+            game.wave_scheduler.budget_ms = args.spawn_budget_ms
+
+    # 射擊與重新開始在下一個模擬步套用（並記錄在該步的輸入中）
+    shoot_pending = False
+    reset_pending = False
+
+    # 髒矩形渲染器（僅在 --dirty-rects 模式使用）
+    renderer = DirtyRectRenderer(game) if args.dirty_rects else None
+
+    # 尚未模擬的累積時間（毫秒）
+    accumulator = 0.0
+    step_ms = game.clock.step_ms
 
     # 遊戲運行標誌
     running = True
@@ -67,12 +271,12 @@ def main() -> None:
                 # Q 鍵也可以退出
                 elif event.key == pygame.K_q:
                     running = False
-                # 空格鍵射擊
+                # 空格鍵射擊（回放時忽略玩家輸入）
                 elif event.key == pygame.K_SPACE:
-                    game.player_shoot()
+                    shoot_pending = True
 
-        # 檢查遊戲結束條件
-        if game.game_over:
+        # 檢查遊戲結束條件（回放時由回放中的重新開始輸入繼續）
+        if game.game_over and replay_player is None:
             # 顯示遊戲結束畫面
             screen.fill(BLACK)
             font = pygame.font.Font(None, 74)
@@ -110,15 +314,19 @@ def main() -> None:
                         if event.key == pygame.K_r:
                             # 重新開始遊戲
                             game.reset()
+                            reset_pending = True
                             waiting_for_input = False
                         elif event.key == pygame.K_q:
                             # 退出遊戲
                             running = False
                             waiting_for_input = False
                 clock.tick(30)  # 降低幀率以減少 CPU 使用
+            if renderer is not None:
+                # 結束畫面覆蓋了整個螢幕，下一幀需要完整重繪
+                renderer.invalidate()
             continue
 
-        if game.game_won:
+        if game.game_won and replay_player is None:
             # 顯示勝利畫面
             screen.fill(BLACK)
             font = pygame.font.Font(None, 74)
@@ -156,31 +364,56 @@ def main() -> None:
                         if event.key == pygame.K_r:
                             # 重新開始遊戲
                             game.reset()
+                            reset_pending = True
                             waiting_for_input = False
                         elif event.key == pygame.K_q:
                             # 退出遊戲
                             running = False
                             waiting_for_input = False
                 clock.tick(30)  # 降低幀率以減少 CPU 使用
+            if renderer is not None:
+                # 結束畫面覆蓋了整個螢幕，下一幀需要完整重繪
+                renderer.invalidate()
             continue
 
         # 獲取按鍵狀態
         keys = pygame.key.get_pressed()
 
-        # 更新遊戲狀態
-        game.update(keys)
-
-        # 清除螢幕（用黑色填充）
-        screen.fill(BLACK)
-
-        # 繪製遊戲元素
-        game.draw(screen)
+        # 以固定步長更新遊戲狀態（累積時間不足一步時本幀只重繪）
+        while accumulator >= step_ms:
+            if replay_player is not None:
+                if not replay_player.step():
+                    # 回放結束
+                    running = False
+                    break
+            else:
+                mask = replay.encode_input(keys, shoot_pending, reset_pending)
+                shoot_pending = reset_pending = False
+                # 重新開始已在結束畫面立即執行，這裡只套用射擊與移動
+                replay.apply_input(game, mask & ~replay.INPUT_RESET)
+                if recorder is not None:
+                    recorder.record(mask)
+            accumulator -= step_ms
+            if game.game_over or game.game_won:
+                accumulator = 0.0
+                break
+
+        if renderer is not None:
+            # 只重繪並更新有變動的區域
+            pygame.display.update(renderer.draw(screen))
+        else:
+            # 繪製遊戲元素（地形層不透明且覆蓋整個畫面，不需先清除螢幕）
+            game.draw(screen)
+
+            # 更新顯示
+            pygame.display.flip()
 
-        # 更新顯示
-        pygame.display.flip()
+        # 控制幀率，並累積經過的時間供下一幀的模擬使用
+        elapsed = min(clock.tick(FPS), MAX_FRAME_TIME)
+        accumulator += elapsed * args.speed
 
-        # 控制幀率
-        clock.tick(FPS)
+    if recorder is not None:
+        recorder.save(args.record)
 
     # 清理資源並結束
     pygame.quit()
@@ -0,0 +1,263 @@
+"""
+批次模擬模組
+
+把大量以種子區分的對局分配到行程池，每個工作行程只建立一個無頭 Game 並反覆重設，
+收集每局的分數、勝負、存活步數與各類型敵人的擊毀數，
+以欄式（每個欄位一段連續陣列）的二進位檔案儲存，供平衡調整統計使用。
+
+執行方式：
+    python -m src.batch --matches 10000 --output results.twb
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from src import headless
+from src.enemy import EnemyTank
+from src.game import Game
+from src.map import Map
+
+# 每局的結果欄位與 array 型別代碼（欄位順序即 _run_match 回傳的順序）
+COLUMNS: List[Tuple[str, str]] = [
+    ("seed", "Q"),
+    ("score", "i"),
+    ("outcome", "b"),
+    ("frames", "I"),
+] + [(f"kills_{enemy_type}", "H") for enemy_type in EnemyTank.ENEMY_CONFIGS]
+
+# outcome 欄位的值
+OUTCOME_LOSS = 0
+OUTCOME_WIN = 1
+OUTCOME_TIMEOUT = 2  # 達到步數上限仍未分出勝負
+
+MAX_FRAMES = 60 * 60 * 10  # 每局步數上限（10 分鐘的模擬時間）
+
+# 檔案格式：標頭、欄位描述（名稱與型別代碼）、各欄位的連續資料（小端序）
+MAGIC = b"TWBATCH\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHIH")  # 魔術字、版本、列數、欄位數
+
+# 工作行程內的遊戲實例（每個工作行程只建立一次）
+_game: Optional[Game] = None
+_max_frames = MAX_FRAMES
+
+
+def _init_worker(map_width: int, map_height: int, max_frames: int) -> None:
+    """
+    工作行程初始化：以無頭模式建立此行程專用的遊戲
+
+    參數：
+        map_width: 地圖寬度（格子數）
+        map_height: 地圖高度（格子數）
+        max_frames: 每局步數上限
+    """
+    global _game, _max_frames
+    headless.init_headless()
+    _game = Game(map_width=map_width, map_height=map_height, headless=True)
+    _max_frames = max_frames
+
+
+def _run_match(seed: int) -> Tuple[int, ...]:
+    """
+    以指定種子模擬一局
+
+    參數：
+        seed: 對局種子（決定地圖、敵人與玩家腳本）
+
+    返回：
+        Tuple[int, ...] - 依 COLUMNS 順序排列的結果
+    """
+    game = _game
+    assert game is not None, "工作行程尚未初始化"
+    game.reset(seed)
+    frames = headless.simulate(game, headless.ScriptedPlayer(seed), _max_frames)
+
+    if game.game_won:
+        outcome = OUTCOME_WIN
+    elif game.game_over:
+        outcome = OUTCOME_LOSS
+    else:
+        outcome = OUTCOME_TIMEOUT
+    return (seed, game.score, outcome, frames, *game.kills.values())
+
+
+def run_batch(
+    matches: int,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    max_frames: int = MAX_FRAMES,
+    map_width: int = Map.MAP_WIDTH,
+    map_height: int = Map.MAP_HEIGHT,
+) -> Dict[str, array]:
+    """
+    在行程池中模擬多局對局
+
+    第 i 局使用種子 seed + i，相同參數的兩次批次得到相同結果。
+
+    參數：
+        matches: 對局數
+        workers: 工作行程數，None 表示使用所有 CPU 核心
+        seed: 第一局的種子
+        max_frames: 每局步數上限
+        map_width: 地圖寬度（格子數）
+        map_height: 地圖高度（格子數）
+
+    返回：
+        Dict[str, array] - 欄位名稱對應該欄位所有對局的結果（依種子排列）
+    """
+    workers = workers or os.cpu_count() or 1
+    columns = {name: array(typecode) for name, typecode in COLUMNS}
+    appenders = [column.append for column in columns.values()]
+
+    # 每次分派一批對局，減少行程間的通訊次數
+    chunksize = max(1, matches // (workers * 8))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(map_width, map_height, max_frames),
+    ) as executor:
+        seeds = range(seed, seed + matches)
+        for row in executor.map(_run_match, seeds, chunksize=chunksize):
+            for append, value in zip(appenders, row):
+                append(value)
+    return columns
+
+
+def write_results(path: Union[str, Path], columns: Dict[str, array]) -> None:
+    """
+    將結果寫入欄式二進位檔案
+
+    參數：
+        path: 輸出檔案路徑
+        columns: 欄位名稱對應結果陣列（所有陣列長度相同）
+    """
+    rows = len(next(iter(columns.values()), []))
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, rows, len(columns)))
+        for name, column in columns.items():
+            encoded = name.encode("utf-8")
+            file.write(struct.pack("<B", len(encoded)) + encoded)
+            file.write(column.typecode.encode("ascii"))
+        for column in columns.values():
+            if sys.byteorder == "big":
+                column = array(column.typecode, column)
+                column.byteswap()
+            file.write(column.tobytes())
+
+
+def read_results(path: Union[str, Path]) -> Dict[str, array]:
+    """
+    讀取 write_results 寫入的欄式二進位檔案
+
+    參數：
+        path: 檔案路徑
+
+    返回：
+        Dict[str, array] - 欄位名稱對應結果陣列
+
+    異常：
+        ValueError: 檔案不是批次結果檔或版本不符
+    """
+    data = Path(path).read_bytes()
+    magic, version, rows, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"無法辨識的批次結果檔: {path}")
+
+    offset = HEADER.size
+    layout = []
+    for _ in range(count):
+        length = data[offset]
+        name = data[offset + 1 : offset + 1 + length].decode("utf-8")
+        typecode = chr(data[offset + 1 + length])
+        layout.append((name, typecode))
+        offset += length + 2
+
+    columns = {}
+    for name, typecode in layout:
+        column = array(typecode)
+        size = rows * column.itemsize
+        column.frombytes(data[offset : offset + size])
+        if sys.byteorder == "big":
+            column.byteswap()
+        columns[name] = column
+        offset += size
+    return columns
+
+
+def summarize(columns: Dict[str, array]) -> None:
+    """
+    印出批次結果的摘要統計
+
+    參數：
+        columns: 欄位名稱對應結果陣列
+    """
+    matches = len(columns["seed"])
+    if not matches:
+        print("matches: 0")
+        return
+    outcomes = columns["outcome"]
+    print(f"matches:    {matches}")
+    print(
+        f"win rate:   {outcomes.count(OUTCOME_WIN) / matches:.1%}   "
+        f"timeouts: {outcomes.count(OUTCOME_TIMEOUT)}"
+    )
+    print(f"avg score:  {sum(columns['score']) / matches:.1f}")
+    print(f"avg frames: {sum(columns['frames']) / matches:.1f}")
+    for enemy_type in EnemyTank.ENEMY_CONFIGS:
+        kills = columns[f"kills_{enemy_type}"]
+        print(f"kills/{enemy_type + ':':<6} {sum(kills) / matches:.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    批次模擬命令列進入點
+
+    參數：
+        argv: 命令列參數列表，None 表示使用 sys.argv
+    """
+    parser = argparse.ArgumentParser(description="坦克大戰批次模擬")
+    parser.add_argument("--matches", type=int, default=1000, help="對局數")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="工作行程數（預設為 CPU 核心數）"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="第一局的種子")
+    parser.add_argument(
+        "--max-frames", type=int, default=MAX_FRAMES, help="每局步數上限"
+    )
+    parser.add_argument("--map-width", type=int, default=Map.MAP_WIDTH)
+    parser.add_argument("--map-height", type=int, default=Map.MAP_HEIGHT)
+    parser.add_argument(
+        "--output", default="batch_results.twb", help="結果檔案（欄式二進位格式）"
+    )
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    columns = run_batch(
+        args.matches,
+        args.workers,
+        args.seed,
+        args.max_frames,
+        args.map_width,
+        args.map_height,
+    )
+    elapsed = time.perf_counter() - start
+
+    write_results(args.output, columns)
+    summarize(columns)
+    frames = sum(columns["frames"])
+    print(
+        f"elapsed:    {elapsed:.2f} s   "
+        f"({args.matches / elapsed:.1f} matches/s, {frames / elapsed:.0f} steps/s)"
+    )
+    print(f"written:    {args.output}")
+
+
+if __name__ == "__main__":
+    main()
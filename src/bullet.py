@@ -1,40 +1,144 @@
 """
-子彈類別實現
+子彈系統實現
 
 子彈是遊戲中的可射擊物體，由玩家或敵人發射。
 子彈以直線移動，飛出邊界時被自動移除。
+
+所有子彈的資料存放在平行的 Python 串列中（位置、速度、所有者、傷害各自一個串列），
+不再為每顆子彈建立精靈與矩形。每幀以一次 map/列表推導式推進並剔除全部子彈，
+並共用同一張子彈圖像以 fblits 繪製。這仍是純 Python 的逐元素運算而非向量化，
+省下的是精靈物件與逐一方法呼叫的開銷。
+
+各陣列是預先配置容量的子彈池：只有前 count 個位置是存活的子彈，
+移除子彈時以最後一顆存活子彈填補空位，陣列本身不會重建；
+發射子彈只是覆寫一個閒置位置，存活數量超過容量時才擴充。
 """
 
-from typing import Literal, Tuple
+from itertools import islice
+from operator import add
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import pygame
 
+from src.sprite_cache import SpriteCache
+
+if TYPE_CHECKING:
+    from src.camera import Camera
+
 
-class Bullet(pygame.sprite.Sprite):
+class BulletSystem:
     """
-    子彈精靈類別
+    子彈系統類別
 
-    表示遊戲中的子彈，包含位置、速度、方向等屬性。
-    子彈會自動在邊界外時標記為移除。
+    以平行陣列儲存所有存活的子彈，第 i 顆子彈的資料位於各陣列的索引 i。
+    陣列長度即池的容量，只有索引小於 count 的資料有效。
 
     屬性：
-        rect: pygame.Rect - 子彈的矩形碰撞區域
-        x: float - 水平位置（像素）
-        y: float - 垂直位置（像素）
-        direction: Tuple[int, int] - 移動方向向量 (-1, 0, 1)
-        speed: float - 移動速度（像素/幀）
-        damage: int - 子彈傷害值
-        owner: str - 所有者（'player' 或 'enemy'）
+        count: int - 存活的子彈數量
+        high_water: int - 同時存活的子彈數量最高紀錄
+        fired: Dict[str, int] - 各所有者累計發射的子彈數
+        x: List[float] - 水平位置（像素）
+        y: List[float] - 垂直位置（像素）
+        vx: List[int] - 水平速度（像素/幀）
+        vy: List[int] - 垂直速度（像素/幀）
+        owner: List[str] - 所有者（'player' 或 'enemy'）
+        damage: List[int] - 子彈傷害值
+        image: pygame.Surface - 所有子彈共用的圖像
+        world_width: int - 世界寬度（像素），飛出世界的子彈會被移除
+        world_height: int - 世界高度（像素）
     """
 
     # 子彈常數設定
     BULLET_RADIUS = 4  # 子彈半徑（8-10 像素直徑）
     BULLET_SPEED = 8  # 子彈速度（像素/幀）
     BULLET_COLOR = (255, 255, 0)  # 黃色 (RGB)
-    WINDOW_WIDTH = 800
-    WINDOW_HEIGHT = 600
+    INITIAL_CAPACITY = 64  # 預先配置的子彈數量
 
     def __init__(
+        self,
+        world_width: int,
+        world_height: int,
+        capacity: int = INITIAL_CAPACITY,
+    ) -> None:
+        """
+        初始化空的子彈系統並預先配置子彈池
+
+        參數：
+            world_width: 世界寬度（像素，通常是地圖的 pixel_width）
+            world_height: 世界高度（像素，通常是地圖的 pixel_height）
+            capacity: 預先配置的子彈數量
+        """
+        self.world_width = world_width
+        self.world_height = world_height
+        self.count = 0
+        self.high_water = 0
+        self.fired: Dict[str, int] = {"player": 0, "enemy": 0}
+        self.x: List[float] = [0.0] * capacity
+        self.y: List[float] = [0.0] * capacity
+        self.vx: List[int] = [0] * capacity
+        self.vy: List[int] = [0] * capacity
+        self.owner: List[str] = ["player"] * capacity
+        self.damage: List[int] = [0] * capacity
+
+        # 建立共用的子彈圖像（黃色圓形）
+        self.image = SpriteCache.get_or_create("bullet", self._render_image)
+
+    @classmethod
+    def _render_image(cls) -> pygame.Surface:
+        """
+        繪製子彈圖像
+
+        返回：
+            pygame.Surface - 黃色圓形子彈圖像
+        """
+        image = pygame.Surface(
+            (cls.BULLET_RADIUS * 2, cls.BULLET_RADIUS * 2), pygame.SRCALPHA
+        )
+        pygame.draw.circle(
+            image,
+            cls.BULLET_COLOR,
+            (cls.BULLET_RADIUS, cls.BULLET_RADIUS),
+            cls.BULLET_RADIUS,
+        )
+        return image
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def capacity(self) -> int:
+        """子彈池的容量（已配置的位置數量）"""
+        return len(self.x)
+
+    def _columns(self) -> Tuple[list, ...]:
+        """
+        取得所有平行陣列
+
+        返回：
+            Tuple[list, ...] - 位置、速度、所有者與傷害陣列
+        """
+        return (self.x, self.y, self.vx, self.vy, self.owner, self.damage)
+
+    def _grow(self) -> None:
+        """容量用盡時將子彈池加倍（只有存活數量創新高時才會發生）"""
+        extra = max(self.capacity, 1)
+        self.x.extend([0.0] * extra)
+        self.y.extend([0.0] * extra)
+        self.vx.extend([0] * extra)
+        self.vy.extend([0] * extra)
+        self.owner.extend(["player"] * extra)
+        self.damage.extend([0] * extra)
+
+    def spawn(
         self,
         x: float,
         y: float,
@@ -43,7 +147,7 @@ class Bullet(pygame.sprite.Sprite):
         damage: int = 1,
     ) -> None:
         """
-        初始化子彈
+        發射一顆子彈
 
         參數：
             x: 初始水平位置（像素）
@@ -52,97 +156,162 @@ class Bullet(pygame.sprite.Sprite):
             owner: 所有者，'player' 或 'enemy'
             damage: 傷害值，預設 1
         """
-        super().__init__()
+        index = self.count
+        if index == self.capacity:
+            self._grow()
+        self.x[index] = float(x)
+        self.y[index] = float(y)
+        self.vx[index] = direction[0] * self.BULLET_SPEED
+        self.vy[index] = direction[1] * self.BULLET_SPEED
+        self.owner[index] = owner
+        self.damage[index] = damage
+        self.count = index + 1
+        if self.count > self.high_water:
+            self.high_water = self.count
+        self.fired[owner] += 1
 
-        # 位置屬性
-        self.x = float(x)
-        self.y = float(y)
+    def update(self) -> None:
+        """
+        更新所有子彈位置並移除超出邊界的子彈
 
-        # 方向和速度
-        self.direction = direction
-        self.speed = self.BULLET_SPEED
+        每幀調用一次，以一次 map 推進全部子彈，再一次剔除飛出邊界的子彈。
+        """
+        count = self.count
+        if not count:
+            return
 
-        # 子彈屬性
-        self.damage = damage
-        self.owner = owner
+        # 就地計算新位置（移動方向的向量乘以速度）
+        self.x[:count] = map(add, islice(self.x, count), islice(self.vx, count))
+        self.y[:count] = map(add, islice(self.y, count), islice(self.vy, count))
 
-        # 建立子彈圖像（黃色圓形）
-        self.image = pygame.Surface(
-            (self.BULLET_RADIUS * 2, self.BULLET_RADIUS * 2), pygame.SRCALPHA
+        # 邊界檢測：飛出邊界的子彈一次全部移除
+        radius = self.BULLET_RADIUS
+        x_min, x_max = -radius, self.world_width + radius
+        y_min, y_max = -radius, self.world_height + radius
+        self.remove(
+            [
+                i
+                for i, (x, y) in enumerate(self._positions())
+                if not (x_min <= x <= x_max and y_min <= y <= y_max)
+            ]
         )
-        pygame.draw.circle(
-            self.image,
-            self.BULLET_COLOR,
-            (self.BULLET_RADIUS, self.BULLET_RADIUS),
-            self.BULLET_RADIUS,
-        )
-
-        # 建立碰撞矩形
-        self.rect = self.image.get_rect(center=(int(self.x), int(self.y)))
 
-    def update(self) -> None:
+    def remove(self, indices: Sequence[int]) -> None:
         """
-        更新子彈位置並檢查邊界
+        移除指定索引的子彈（例如命中目標後）
 
-        每幀調用一次，移動子彈並移除超出邊界的子彈。
+        參數：
+            indices: 要移除的子彈索引
         """
-        # 計算新位置
-        # 移動方向的向量乘以速度
-        self.x += self.direction[0] * self.speed
-        self.y += self.direction[1] * self.speed
+        if not indices:
+            return
+        # 由大到小移除，以最後一顆存活子彈填補空位（被搬移的子彈不會是待移除的）
+        columns = self._columns()
+        last = self.count
+        for index in sorted(indices, reverse=True):
+            last -= 1
+            if index != last:
+                for column in columns:
+                    column[index] = column[last]
+        self.count = last
 
-        # 更新矩形位置
-        self.rect.centerx = int(self.x)
-        self.rect.centery = int(self.y)
+    def clear(self) -> None:
+        """移除所有子彈（保留已配置的容量）"""
+        self.count = 0
 
-        # 邊界檢測：如果子彈飛出邊界，標記為移除
-        if not self._is_in_bounds():
-            self.kill()
+    def _positions(self) -> Iterator[Tuple[float, float]]:
+        """
+        逐一取得存活子彈的位置
 
-    def _is_in_bounds(self) -> bool:
+        返回：
+            Iterator[Tuple[float, float]] - 依索引排列的 (x, y)
         """
-        檢查子彈是否在遊戲邊界內
+        return zip(islice(self.x, self.count), islice(self.y, self.count))
+
+    def get_state(self) -> Tuple[list, ...]:
+        """
+        取得所有存活子彈的資料
 
         返回：
-            bool - 子彈在邊界內返回 True，否則返回 False
+            Tuple[list, ...] - 位置、速度、所有者與傷害陣列中存活部分的複本
         """
-        return (
-            -self.BULLET_RADIUS <= self.x <= self.WINDOW_WIDTH + self.BULLET_RADIUS
-            and -self.BULLET_RADIUS <= self.y <= self.WINDOW_HEIGHT + self.BULLET_RADIUS
-        )
+        return tuple(column[: self.count] for column in self._columns())
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def set_state(self, state: Sequence[Sequence]) -> None:
         """
-        繪製子彈到指定的表面
+        以 get_state 取得的資料取代所有子彈
 
         參數：
-            surface: pygame.Surface - 目標繪製表面（通常是遊戲螢幕）
+            state: get_state 的返回值
         """
-        surface.blit(self.image, self.rect)
+        count = len(state[0])
+        while self.capacity < count:
+            self._grow()
+        for column, values in zip(self._columns(), state):
+            column[:count] = values
+        self.count = count
+        self.high_water = max(self.high_water, count)
 
-    def get_position(self) -> Tuple[float, float]:
+    def get_rect(self, index: int) -> pygame.Rect:
         """
-        取得子彈當前位置
+        取得子彈的碰撞矩形
+
+        參數：
+            index: 子彈索引
 
         返回：
-            Tuple[float, float] - (x, y) 座標
+            pygame.Rect - 以子彈位置為中心的矩形
         """
-        return (self.x, self.y)
+        radius = self.BULLET_RADIUS
+        return pygame.Rect(
+            int(self.x[index]) - radius,
+            int(self.y[index]) - radius,
+            radius * 2,
+            radius * 2,
+        )
 
-    def get_owner(self) -> Literal["player", "enemy"]:
+    def get_rects(self) -> List[pygame.Rect]:
         """
-        取得子彈所有者
+        取得所有子彈的碰撞矩形
 
         返回：
-            str - 'player' 或 'enemy'
+            List[pygame.Rect] - 依索引排列的矩形列表
         """
-        return self.owner
+        radius = self.BULLET_RADIUS
+        size = radius * 2
+        return [
+            pygame.Rect(int(x) - radius, int(y) - radius, size, size)
+            for x, y in self._positions()
+        ]
 
-    def get_damage(self) -> int:
+    def draw(self, surface: pygame.Surface, camera: Optional["Camera"] = None) -> None:
         """
-        取得子彈傷害值
+        以單次批次呼叫繪製所有子彈
 
-        返回：
-            int - 傷害值
+        參數：
+            surface: pygame.Surface - 目標繪製表面（通常是遊戲螢幕）
+            camera: 攝影機，提供時只繪製可視範圍內的子彈並轉換為螢幕座標
         """
-        return self.damage
+        image = self.image
+        radius = self.BULLET_RADIUS
+        if camera is None:
+            surface.fblits(
+                [
+                    (image, (int(x) - radius, int(y) - radius))
+                    for x, y in self._positions()
+                ]
+            )
+            return
+
+        view = camera.rect
+        offset_x = view.x + radius
+        offset_y = view.y + radius
+        left, right = view.left - radius, view.right + radius
+        top, bottom = view.top - radius, view.bottom + radius
+        surface.fblits(
+            [
+                (image, (int(x) - offset_x, int(y) - offset_y))
+                for x, y in self._positions()
+                if left <= x < right and top <= y < bottom
+            ]
+        )
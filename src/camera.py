@@ -0,0 +1,81 @@
+"""
+攝影機模組
+
+將世界座標（地圖像素）轉換為螢幕座標。攝影機跟隨玩家坦克，
+並限制在地圖範圍內，繪製時只處理與可視範圍重疊的格子與精靈。
+"""
+
+from typing import Tuple
+
+import pygame
+
+
+class Camera:
+    """
+    跟隨目標的攝影機類別
+
+    屬性：
+        rect: pygame.Rect - 可視範圍（世界座標，大小等於視窗）
+        world_rect: pygame.Rect - 世界範圍（地圖像素大小）
+    """
+
+    def __init__(
+        self, width: int, height: int, world_width: int, world_height: int
+    ) -> None:
+        """
+        初始化攝影機，可視範圍位於世界左上角
+
+        參數：
+            width: 可視範圍寬度（像素，通常等於視窗寬度）
+            height: 可視範圍高度（像素，通常等於視窗高度）
+            world_width: 世界寬度（像素）
+            world_height: 世界高度（像素）
+        """
+        self.rect = pygame.Rect(0, 0, width, height)
+        self.world_rect = pygame.Rect(0, 0, world_width, world_height)
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        """
+        世界座標轉換為螢幕座標時要減去的位移
+
+        返回：
+            Tuple[int, int] - 可視範圍左上角的世界座標
+        """
+        return self.rect.topleft
+
+    def follow(self, target: pygame.Rect) -> None:
+        """
+        將可視範圍置中於目標，並限制在世界範圍內
+
+        世界小於可視範圍時，世界會置中顯示。
+
+        參數：
+            target: pygame.Rect - 要跟隨的目標（通常是玩家坦克）
+        """
+        self.rect.center = target.center
+        self.rect.clamp_ip(self.world_rect)
+
+    def apply(self, rect: pygame.Rect) -> pygame.Rect:
+        """
+        將世界座標的矩形轉換為螢幕座標
+
+        參數：
+            rect: pygame.Rect - 世界座標的矩形
+
+        返回：
+            pygame.Rect - 螢幕座標的新矩形
+        """
+        return rect.move(-self.rect.x, -self.rect.y)
+
+    def is_visible(self, rect: pygame.Rect) -> bool:
+        """
+        檢查矩形是否與可視範圍重疊
+
+        參數：
+            rect: pygame.Rect - 世界座標的矩形
+
+        返回：
+            bool - True 表示需要繪製
+        """
+        return self.rect.colliderect(rect)
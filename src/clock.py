@@ -0,0 +1,49 @@
+"""
+模擬時鐘模組
+
+遊戲中所有與時間相關的邏輯（射擊冷卻、無敵時間、敵人轉向）都讀取同一個模擬時鐘，
+而不是讀取真實時間。模擬時鐘只在遊戲更新一步時以固定步長前進，
+因此不論繪製幀率是 30、60 還是 240 FPS，模擬結果都完全相同，也可以快轉。
+"""
+
+
+class SimulationClock:
+    """
+    以固定步長前進的模擬時鐘類別
+
+    屬性：
+        tick_rate: int - 每秒模擬步數
+        step_ms: float - 每一步的長度（毫秒）
+        ticks: int - 已經前進的步數
+    """
+
+    TICK_RATE = 60  # 每秒模擬步數（坦克與子彈速度以每步像素計）
+
+    def __init__(self, tick_rate: int = TICK_RATE) -> None:
+        """
+        初始化模擬時鐘，時間從 0 開始
+
+        參數：
+            tick_rate: 每秒模擬步數
+        """
+        self.tick_rate = tick_rate
+        self.step_ms = 1000 / tick_rate
+        self.ticks = 0
+
+    @property
+    def time_ms(self) -> float:
+        """目前的模擬時間（毫秒）"""
+        return self.ticks * self.step_ms
+
+    @property
+    def time(self) -> float:
+        """目前的模擬時間（秒）"""
+        return self.ticks / self.tick_rate
+
+    def advance(self) -> None:
+        """前進一個模擬步長"""
+        self.ticks += 1
+
+    def reset(self) -> None:
+        """將模擬時間歸零（重新開始遊戲時使用）"""
+        self.ticks = 0
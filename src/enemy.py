@@ -6,13 +6,18 @@
 """
 
 import random
-import time
-from pathlib import Path
-from typing import Literal, Optional, Tuple
+from typing import TYPE_CHECKING, Literal, Optional, Tuple
 
 import pygame
 
-from src.bullet import Bullet
+from src.bullet import BulletSystem
+from src.clock import SimulationClock
+from src.sprite_cache import SpriteCache
+
+if TYPE_CHECKING:
+    from src.flowfield import FlowField
+    from src.map import Map
+    from src.sight import LineOfSight
 
 
 class EnemyTank(pygame.sprite.Sprite):
@@ -32,15 +37,28 @@ class EnemyTank(pygame.sprite.Sprite):
             enemy_type: Literal["basic", "fast", "heavy"] - 敵人類型
             color: tuple - 坦克顏色 (RGB)
             move_interval: int - 改變方向的時間間隔（毫秒，範圍 1000-2000）
-            last_direction_change: int - 最後一次改變方向的時間戳
-            last_shot_time: float - 最後射擊的時間戳（秒）
+            last_direction_change: float - 最後一次改變方向的模擬時間（毫秒）
+            last_shot_time: float - 最後射擊的模擬時間（秒）
             shoot_interval: float - 射擊冷卻時間間隔（秒）
+            clock: SimulationClock - 提供模擬時間的時鐘
+            rng: random.Random - 轉向與射擊間隔使用的亂數產生器
+            coast_ticks: int - 剩餘可不經 AI 與碰撞檢查、沿原方向外推移動的步數
     """
 
     TANK_SIZE = 40
-    WINDOW_WIDTH = 800
-    WINDOW_HEIGHT = 600
-    ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+    IMAGE_FILES = {  # 各方向的圖像檔名
+        "up": "tank_enemy_up.png",
+        "down": "tank_enemy_down.png",
+        "left": "tank_enemy_left.png",
+        "right": "tank_enemy_right.png",
+    }
+
+    DIRECTION_VECTORS = {
+        "up": (0, -1),
+        "down": (0, 1),
+        "left": (-1, 0),
+        "right": (1, 0),
+    }
 
     ENEMY_CONFIGS = {
         "basic": {
@@ -68,6 +86,8 @@ class EnemyTank(pygame.sprite.Sprite):
         x: int,
         y: int,
         enemy_type: Literal["basic", "fast", "heavy"] = "basic",
+        clock: Optional[SimulationClock] = None,
+        rng: Optional[random.Random] = None,
     ) -> None:
         """
         初始化敵人坦克
@@ -76,6 +96,8 @@ class EnemyTank(pygame.sprite.Sprite):
                 x: 初始水平位置（像素）
                 y: 初始垂直位置（像素）
                 enemy_type: 敵人類型（'basic', 'fast', 'heavy'），預設為 'basic'
+                clock: 模擬時鐘（通常由 Game 提供），None 表示使用獨立的時鐘
+                rng: 亂數產生器（通常由 Game 提供），None 表示新建一個
 
         異常：
                 ValueError: 如果 enemy_type 不是有效的類型
@@ -90,6 +112,10 @@ class EnemyTank(pygame.sprite.Sprite):
         self.x = float(x)
         self.y = float(y)
 
+        # 模擬時鐘與亂數產生器（轉向與射擊間隔都以模擬時間計算）
+        self.clock = clock if clock is not None else SimulationClock()
+        self.rng = rng if rng is not None else random.Random()
+
         self.enemy_type = enemy_type
         config = self.ENEMY_CONFIGS[enemy_type]
         self.speed = config["speed"]
@@ -99,81 +125,95 @@ class EnemyTank(pygame.sprite.Sprite):
 
         self.direction: Literal["up", "down", "left", "right"] = "down"
 
-        self.move_interval = random.randint(1000, 2000)
-        self.last_direction_change = pygame.time.get_ticks()
+        self.move_interval = self.rng.randint(1000, 2000)
+        self.last_direction_change = self.clock.time_ms
 
         # 射擊相關屬性（根據敵人類型設定射擊間隔）
-        self.last_shot_time = 0.0
         self.shoot_interval = (
-            random.uniform(1.5, 2.5)
+            self.rng.uniform(1.5, 2.5)
             if enemy_type == "basic"
             else (
-                random.uniform(1.0, 1.8)
+                self.rng.uniform(1.0, 1.8)
                 if enemy_type == "fast"
-                else random.uniform(2.0, 3.0)
+                else self.rng.uniform(2.0, 3.0)
             )
         )
+        # 生成後可以立即射擊
+        self.last_shot_time = self.clock.time - self.shoot_interval
+
+        # 遠處敵人由 AI 排程器安排外推移動（見 plan_coast）
+        self.coast_ticks = 0
 
         # 載入坦克圖像
-        self.image = self._load_tank_image()
-        if self.image is None:
-            # 如果圖片載入失敗，回退到程序生成
-            self.image = pygame.Surface(
-                (self.TANK_SIZE, self.TANK_SIZE), pygame.SRCALPHA
-            )
-            self._draw_tank_image()
+        self.image = self._get_tank_image()
 
         self.rect = self.image.get_rect(center=(int(self.x), int(self.y)))
 
+    @classmethod
+    def preload_images(cls) -> None:
+        """
+        預先載入四個方向的坦克圖像到共用快取
+
+        在遊戲開始時呼叫，確保遊戲進行中轉向不會觸發讀檔。
+        """
+        for filename in cls.IMAGE_FILES.values():
+            SpriteCache.load(filename, (cls.TANK_SIZE, cls.TANK_SIZE))
+
+    def _get_tank_image(self) -> pygame.Surface:
+        """
+        取得當前方向的敵人坦克圖像
+
+        優先使用 PNG 圖像，載入失敗時回退到程序生成的圖像。
+
+        返回：
+            pygame.Surface - 共用快取中的坦克圖像
+        """
+        loaded = self._load_tank_image()
+        if loaded is not None:
+            return loaded
+        return self._draw_tank_image()
+
     def _load_tank_image(self) -> Optional[pygame.Surface]:
         """
         載入敵人坦克圖像
 
-        根據當前方向載入對應的 PNG 圖像。
+        根據當前方向從共用快取取得對應的 PNG 圖像（每個方向只讀檔一次）。
         如果載入失敗，返回 None 並觸發回退到程序生成。
 
         返回：
             pygame.Surface - 載入的圖像（成功時），None（失敗時）
         """
-        try:
-            # 建立圖像檔案名稱（使用小寫）
-            direction_file = {
-                "up": "tank_enemy_up.png",
-                "down": "tank_enemy_down.png",
-                "left": "tank_enemy_left.png",
-                "right": "tank_enemy_right.png",
-            }[self.direction]
-
-            # 載入圖像
-            image_path = self.ASSETS_DIR / direction_file
-            loaded_image = pygame.image.load(str(image_path))
-
-            # 調整圖像大小以符合坦克尺寸（保持寬高比）
-            return pygame.transform.scale(
-                loaded_image, (self.TANK_SIZE, self.TANK_SIZE)
-            )
-        except (FileNotFoundError, pygame.error):
-            # 載入失敗，返回 None
-            return None
+        # 調整圖像大小以符合坦克尺寸
+        return SpriteCache.load(
+            self.IMAGE_FILES[self.direction], (self.TANK_SIZE, self.TANK_SIZE)
+        )
 
-    def _draw_tank_image(self) -> None:
+    def _draw_tank_image(self) -> pygame.Surface:
         """
         程序生成敵人坦克圖像
 
-        清空當前圖像並繪製新坦克圖像。圖像為簡單的正方形，顏色取決於敵人類型。
+        圖像為簡單的正方形，顏色取決於敵人類型。每種顏色只繪製一次，之後從共用快取取得。
+
+        返回：
+            pygame.Surface - 程序生成的坦克圖像
         """
-        self.image.fill((0, 0, 0, 0))
-
-        pygame.draw.rect(
-            self.image,
-            self.color,
-            (
-                0,
-                0,
-                self.TANK_SIZE,
-                self.TANK_SIZE,
-            ),
-        )
+        color = self.color
+
+        def render() -> pygame.Surface:
+            image = pygame.Surface((self.TANK_SIZE, self.TANK_SIZE), pygame.SRCALPHA)
+            pygame.draw.rect(
+                image,
+                color,
+                (
+                    0,
+                    0,
+                    self.TANK_SIZE,
+                    self.TANK_SIZE,
+                ),
+            )
+            return image
+
+        return SpriteCache.get_or_create(("tank_enemy", color), render)
 
     def draw(self, surface: pygame.Surface) -> None:
         """
@@ -203,84 +243,83 @@ class EnemyTank(pygame.sprite.Sprite):
         offset_x, offset_y = direction_offsets[self.direction]
         return (self.x + offset_x, self.y + offset_y)
 
-    def try_shoot(self) -> Optional[Bullet]:
+    def try_shoot(
+        self,
+        bullets: BulletSystem,
+        sight: Optional["LineOfSight"] = None,
+        target: Optional[pygame.Rect] = None,
+    ) -> bool:
         """
         嘗試發射子彈
 
-        檢查是否足夠時間已經過去，若滿足冷卻時間則創建並返回子彈。
-        否則返回 None。
+        檢查是否足夠時間已經過去，若滿足冷卻時間則在子彈系統中發射子彈。
+        提供視線服務時，只有目標位於砲管方向且未被遮擋，
+        或砲管方向第一個阻擋物是磚塊時才射擊（冷卻保持就緒，目標出現時立即射擊）。
+
+        參數：
+            bullets: BulletSystem - 接收新子彈的子彈系統
+            sight: 視線服務，None 表示不檢查視線
+            target: 射擊目標（通常是玩家）的矩形，與 sight 一起使用
 
         返回：
-            Optional[Bullet] - 如果發射成功則返回 Bullet 實例，否則返回 None
+            bool - True 表示發射成功
         """
-        # 獲取當前時間（秒）
-        current_time = time.time()
+        # 獲取當前模擬時間（秒）
+        current_time = self.clock.time
 
         # 檢查冷卻時間是否已經過
         if current_time - self.last_shot_time < self.shoot_interval:
-            return None
-
-        # 更新射擊時間戳
-        self.last_shot_time = current_time
+            return False
 
         # 將方向字符串轉換為方向向量
-        direction_vectors = {
-            "up": (0, -1),
-            "down": (0, 1),
-            "left": (-1, 0),
-            "right": (1, 0),
-        }
-        direction_vector = direction_vectors[self.direction]
-
-        # 獲取砲管位置
-        cannon_x, cannon_y = self.get_cannon_position()
-
-        # 創建子彈
-        bullet = Bullet(cannon_x, cannon_y, direction_vector, owner="enemy")
-
-        return bullet
-
-    def can_move(self, new_rect: pygame.Rect, obstacles: list[pygame.Rect]) -> bool:
-        """
-        檢查是否可以移動到新位置
+        direction_vector = self.DIRECTION_VECTORS[self.direction]
 
-        檢查邊界碰撞和障礙物碰撞。
-
-        參數：
-                new_rect: pygame.Rect - 新位置的矩形
-                obstacles: list[pygame.Rect] - 障礙物列表
-
-        回傳：
-                bool - True 可以移動，False 發生碰撞
-        """
+        # 砲管方向沒有值得射擊的目標時不浪費子彈
         if (
-            new_rect.left < 0
-            or new_rect.right > self.WINDOW_WIDTH
-            or new_rect.top < 0
-            or new_rect.bottom > self.WINDOW_HEIGHT
+            sight is not None
+            and target is not None
+            and not sight.has_target(self.x, self.y, direction_vector, target)
         ):
             return False
 
-        for obstacle in obstacles:
-            if new_rect.colliderect(obstacle):
-                return False
+        # 更新射擊時間戳
+        self.last_shot_time = current_time
+
+        # 獲取砲管位置
+        cannon_x, cannon_y = self.get_cannon_position()
+
+        # 發射子彈
+        bullets.spawn(cannon_x, cannon_y, direction_vector, owner="enemy")
 
         return True
 
-    def update(self, obstacles: list[pygame.Rect]) -> None:
+    def update(
+        self, game_map: "Map", flow_field: Optional["FlowField"] = None
+    ) -> None:
         """
         更新敵人坦克的位置和方向
 
-        根據計時器定期改變方向，嘗試按當前方向移動。
-        如果碰撞則嘗試找到一個可移動的方向。
+        所在格子有流場方向時，坦克中心接近格子中心就轉向流場指示的方向；
+        否則根據計時器定期隨機改變方向。嘗試按當前方向移動，
+        如果碰撞則嘗試找到一個可移動的方向（循流場被磚塊擋住時停下等待射穿）。
 
         參數：
-                obstacles: list[pygame.Rect] - 障礙物列表
+                game_map: Map - 提供障礙物空間索引的地圖
+                flow_field: 朝向玩家的共用流場，None 表示隨機遊走
         """
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.time_ms
+
+        flow_direction = (
+            self._follow_flow_field(flow_field, game_map.GRID_SIZE)
+            if flow_field is not None
+            else None
+        )
 
-        # 定期改變方向
-        if current_time - self.last_direction_change >= self.move_interval:
+        # 沒有流場可循時，定期改變方向
+        if (
+            flow_direction is None
+            and current_time - self.last_direction_change >= self.move_interval
+        ):
             self._choose_random_direction()
             self.last_direction_change = current_time
 
@@ -295,72 +334,175 @@ class EnemyTank(pygame.sprite.Sprite):
         elif self.direction == "right":
             new_x += self.speed
 
-        new_rect = self.image.get_rect(center=(int(new_x), int(new_y)))
-
-        if self.can_move(new_rect, obstacles):
+        # 目前位置不與障礙物重疊，只需查詢前方格子的通行方向
+        if game_map.can_shift(
+            self.rect, int(new_x) - self.rect.centerx, int(new_y) - self.rect.centery
+        ):
             # 可以移動，更新位置
             self.x = new_x
             self.y = new_y
             self.rect.center = (int(self.x), int(self.y))
+        elif self.direction == flow_direction and self._in_lane(game_map.GRID_SIZE):
+            # 流場經過正前方的磚塊：保持朝向，等待射穿
+            pass
         else:
             # 碰撞，嘗試找到一個可移動的方向
-            if not self._try_find_valid_direction(obstacles):
+            if not self._try_find_valid_direction(game_map):
                 # 如果沒有可移動的方向，隨機選擇一個方向（避免死鎖）
                 self._choose_random_direction()
             self.last_direction_change = current_time
 
+    def _follow_flow_field(
+        self, flow_field: "FlowField", grid_size: int
+    ) -> Optional[str]:
+        """
+        依流場調整方向
+
+        只在坦克中心與格子中心的距離小於一步時轉向，並對齊到格子中心，
+        轉向後的車身剛好位於格子通道內，不會卡在轉角。
+
+        參數：
+                flow_field: FlowField - 朝向玩家的共用流場
+                grid_size: 格子大小（像素）
+
+        返回：
+                str - 所在格子的流場方向，沒有流場方向時返回 None（改為隨機遊走）
+        """
+        grid_x = int(self.x) // grid_size
+        grid_y = int(self.y) // grid_size
+        direction = flow_field.direction_at(grid_x, grid_y)
+        if direction is None:
+            return None
+        if direction != self.direction:
+            center_x = grid_x * grid_size + grid_size / 2
+            center_y = grid_y * grid_size + grid_size / 2
+            if (
+                abs(self.x - center_x) < self.speed
+                and abs(self.y - center_y) < self.speed
+            ):
+                self.x = center_x
+                self.y = center_y
+                self.rect.center = (int(self.x), int(self.y))
+                self.direction = direction
+                self.image = self._get_tank_image()
+        return direction
+
+    def _in_lane(self, grid_size: int) -> bool:
+        """
+        檢查車身是否對齊移動方向的格子通道（垂直於移動方向的座標位於格子中心）
+
+        參數：
+                grid_size: 格子大小（像素）
+
+        返回：
+                bool - True 表示擋住坦克的是正前方的格子
+        """
+        half = grid_size / 2
+        if self.direction in ("up", "down"):
+            return self.x % grid_size == half
+        return self.y % grid_size == half
+
+    def plan_coast(self, game_map: "Map", steps: int) -> int:
+        """
+        確認接下來的 steps 步沿目前方向前進不會碰撞
+
+        以基礎速度（速度上限）計算 steps 步後的位置，只查表一次：
+        位移小於坦克大小時，起點與終點矩形即涵蓋整段路徑；
+        磚塊只會被摧毀而不會新增，因此確認過的路徑在外推期間保持暢通。
+
+        參數：
+                game_map: Map - 提供障礙物空間索引的地圖
+                steps: 希望外推的步數
+
+        返回：
+                int - 可以外推的步數（路徑受阻時為 0）
+        """
+        distance = steps * self.base_speed
+        if steps <= 0 or distance >= self.TANK_SIZE:
+            return 0
+        dx, dy = self.DIRECTION_VECTORS[self.direction]
+        if not game_map.can_shift(self.rect, dx * distance, dy * distance):
+            return 0
+        return steps
+
+    def coast(self) -> None:
+        """沿目前方向前進一步，不做 AI 決策與碰撞檢查（路徑已由 plan_coast 確認）"""
+        dx, dy = self.DIRECTION_VECTORS[self.direction]
+        self.x += dx * self.speed
+        self.y += dy * self.speed
+        self.rect.center = (int(self.x), int(self.y))
+
     def _choose_random_direction(self) -> None:
         """隨機選擇一個方向並更新坦克圖像"""
-        self.direction = random.choice(["up", "down", "left", "right"])
-        loaded = self._load_tank_image()
-        if loaded is not None:
-            self.image = loaded
-        else:
-            self._draw_tank_image()
+        self.direction = self.rng.choice(["up", "down", "left", "right"])
+        self.image = self._get_tank_image()
 
-    def _try_find_valid_direction(self, obstacles: list[pygame.Rect]) -> bool:
+    def _try_find_valid_direction(self, game_map: "Map") -> bool:
         """
         嘗試找到一個可以移動的方向
 
-        遍歷所有方向，找到第一個可以移動的方向。
-        如果找不到任何可移動的方向，返回 False。
+        依上、下、左、右的順序查詢地圖的通行方向表，找到第一個可以移動的方向，
+        成本與附近的障礙物數量無關。如果找不到任何可移動的方向，返回 False。
 
         參數：
-                obstacles: list[pygame.Rect] - 障礙物列表
+                game_map: Map - 提供障礙物空間索引的地圖
 
         返回：
                 bool - True 找到可移動的方向，False 沒有找到
         """
-        # 保存原始方向
-        original_direction = self.direction
-
-        # 遍歷所有方向
-        for direction in ["up", "down", "left", "right"]:
-            self.direction = direction
-
-            # 計算新位置
-            new_x, new_y = self.x, self.y
-            if direction == "up":
-                new_y -= self.speed
-            elif direction == "down":
-                new_y += self.speed
-            elif direction == "left":
-                new_x -= self.speed
-            elif direction == "right":
-                new_x += self.speed
-
-            new_rect = self.image.get_rect(center=(int(new_x), int(new_y)))
-
-            # 檢查是否可以移動
-            if self.can_move(new_rect, obstacles):
-                # 找到可移動的方向，更新圖像並返回 True
-                loaded = self._load_tank_image()
-                if loaded is not None:
-                    self.image = loaded
-                else:
-                    self._draw_tank_image()
+        center_x, center_y = self.rect.center
+        for direction, (dx, dy) in self.DIRECTION_VECTORS.items():
+            shift_x = int(self.x + dx * self.speed) - center_x
+            shift_y = int(self.y + dy * self.speed) - center_y
+            if game_map.can_shift(self.rect, shift_x, shift_y):
+                # 找到可移動的方向，方向改變時才更新圖像
+                if direction != self.direction:
+                    self.direction = direction
+                    self.image = self._get_tank_image()
                 return True
-
-        # 如果找不到可移動的方向，恢復原始方向
-        self.direction = original_direction
         return False
+
+    def get_state(self) -> tuple:
+        """
+        取得還原敵人所需的完整狀態（類型決定的屬性除外）
+
+        返回：
+            tuple - (x, y, 類型, 方向, 速度, 生命數, 轉向間隔, 上次轉向時間,
+            射擊間隔, 上次射擊時間, 剩餘外推步數)
+        """
+        return (
+            self.x,
+            self.y,
+            self.enemy_type,
+            self.direction,
+            self.speed,
+            self.lives,
+            self.move_interval,
+            self.last_direction_change,
+            self.shoot_interval,
+            self.last_shot_time,
+            self.coast_ticks,
+        )
+
+    def set_state(self, state: tuple) -> None:
+        """
+        還原 get_state 取得的狀態
+
+        參數：
+            state: tuple - get_state 的返回值（類型必須與此敵人相同）
+        """
+        (
+            self.x,
+            self.y,
+            _,
+            self.direction,
+            self.speed,
+            self.lives,
+            self.move_interval,
+            self.last_direction_change,
+            self.shoot_interval,
+            self.last_shot_time,
+            self.coast_ticks,
+        ) = state
+        self.rect.center = (int(self.x), int(self.y))
+        self.image = self._get_tank_image()
@@ -0,0 +1,173 @@
+"""
+爆炸效果模組
+
+爆炸效果是短暫顯示的精靈。激烈交火時每幀都可能產生爆炸，
+因此以物件池預先建立並重複使用 Explosion 物件：爆炸結束後回收至池中，
+下一次爆炸只重設位置與計時器，不再建構新的精靈。
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import pygame
+
+
+class Explosion(pygame.sprite.Sprite):
+    """
+    爆炸效果精靈類別
+
+    短暫顯示爆炸動畫，持續時間後自動消失。
+    """
+
+    DURATION = 15  # 爆炸持續幀數（15 幀約 0.25 秒）
+
+    def __init__(self, x: int, y: int, image: pygame.Surface) -> None:
+        super().__init__()
+        self.image = image
+        self.rect = self.image.get_rect(center=(x, y))
+        self.timer = self.DURATION
+
+    def reset(self, x: int, y: int) -> None:
+        """
+        重設爆炸位置與計時器（從物件池取出時使用）
+
+        參數：
+            x: 爆炸中心 X 座標
+            y: 爆炸中心 Y 座標
+        """
+        self.rect.center = (x, y)
+        self.timer = self.DURATION
+
+    def update(self) -> None:
+        """更新爆炸計時器"""
+        self.timer -= 1
+        if self.timer <= 0:
+            self.kill()
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """繪製爆炸效果"""
+        surface.blit(self.image, self.rect)
+
+
+class ExplosionPool:
+    """
+    爆炸效果物件池
+
+    取出的爆炸會加入指定的精靈組；計時結束後離開精靈組並回收至池中。
+    池中的物件不足時才建構新的 Explosion，之後同樣會被回收重複使用。
+
+    屬性：
+        image: pygame.Surface - 所有爆炸共用的圖像
+        groups: Sequence[pygame.sprite.AbstractGroup] - 取出的爆炸要加入的精靈組
+        active: List[Explosion] - 顯示中的爆炸
+        high_water: int - 同時顯示的爆炸數量最高紀錄
+        created: int - 實際建構的 Explosion 物件數（等於池的總容量）
+    """
+
+    INITIAL_CAPACITY = 8  # 預先建立的爆炸數量
+
+    def __init__(
+        self,
+        image: Optional[pygame.Surface],
+        groups: Sequence[pygame.sprite.AbstractGroup] = (),
+        capacity: int = INITIAL_CAPACITY,
+    ) -> None:
+        """
+        初始化物件池並預先建立爆炸物件
+
+        參數：
+            image: 爆炸圖像，None 表示圖片載入失敗（此時不預先建立物件）
+            groups: 取出的爆炸要加入的精靈組
+            capacity: 預先建立的爆炸數量
+        """
+        self.image = image
+        self.groups = groups
+        self.active: List[Explosion] = []
+        self.high_water = 0
+        self.created = 0
+        self._free: List[Explosion] = []
+        if image is not None:
+            for _ in range(capacity):
+                self._free.append(self._create())
+
+    def _create(self) -> Explosion:
+        """
+        建構新的爆炸物件（只在池中沒有可用物件時呼叫）
+
+        返回：
+            Explosion - 尚未加入任何精靈組的爆炸
+        """
+        self.created += 1
+        return Explosion(0, 0, self.image)
+
+    @property
+    def capacity(self) -> int:
+        """池的總容量（顯示中與閒置的爆炸總數）"""
+        return len(self.active) + len(self._free)
+
+    @property
+    def available(self) -> int:
+        """閒置、可直接取出的爆炸數量"""
+        return len(self._free)
+
+    def acquire(self, x: int, y: int) -> Explosion:
+        """
+        從池中取出一個爆炸並放置到指定位置
+
+        參數：
+            x: 爆炸中心 X 座標
+            y: 爆炸中心 Y 座標
+
+        返回：
+            Explosion - 已加入精靈組、計時器重設的爆炸
+        """
+        explosion = self._free.pop() if self._free else self._create()
+        explosion.reset(x, y)
+        explosion.add(*self.groups)
+        self.active.append(explosion)
+        if len(self.active) > self.high_water:
+            self.high_water = len(self.active)
+        return explosion
+
+    def update(self) -> None:
+        """更新所有顯示中的爆炸，並回收計時結束的爆炸"""
+        active = self.active
+        # 由後往前掃描，回收時以最後一個爆炸填補空位
+        for index in range(len(active) - 1, -1, -1):
+            explosion = active[index]
+            explosion.update()
+            if explosion.timer <= 0:
+                active[index] = active[-1]
+                active.pop()
+                self._free.append(explosion)
+
+    def get_state(self) -> List[Tuple[int, int, int]]:
+        """
+        取得所有顯示中的爆炸
+
+        返回：
+            List[Tuple[int, int, int]] - 每個爆炸的中心座標與剩餘幀數
+        """
+        return [
+            (explosion.rect.centerx, explosion.rect.centery, explosion.timer)
+            for explosion in self.active
+        ]
+
+    def set_state(self, state: Sequence[Tuple[int, int, int]]) -> None:
+        """
+        以 get_state 取得的資料取代所有顯示中的爆炸
+
+        參數：
+            state: get_state 的返回值
+        """
+        self.clear()
+        if self.image is None:
+            return
+        for x, y, timer in state:
+            self.acquire(x, y).timer = timer
+
+    def clear(self) -> None:
+        """回收所有顯示中的爆炸（例如重新開始遊戲時）"""
+        for explosion in self.active:
+            explosion.kill()
+        self._free.extend(self.active)
+        self.active.clear()
@@ -0,0 +1,206 @@
+"""
+流場尋路模組
+
+以玩家所在的格子為目標，在地圖格子上執行 Dijkstra 演算法，
+為每個格子記錄「往目標前進的下一步方向」。所有敵人共用同一份流場，
+每個敵人只需查表即可決定方向，AI 成本不隨敵人數量增加。
+
+鋼塊與地圖外不可通行；磚塊可以射穿，因此以較高的成本通行。
+玩家換格子或地形改變（Map.revision）時流場只標記為過期，
+第一次查詢方向時才重新計算；沒有敵人循流場時（例如整張地圖都在畫面內）完全不計算。
+流場只涵蓋以玩家為中心的固定範圍，大型地圖不需要為此載入整張地圖。
+只有畫面外的敵人循流場前進（見 AIScheduler），進入畫面後不再循流場撞向玩家。
+"""
+
+import heapq
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from src.map import Map
+
+
+class FlowField:
+    """
+    朝向目標格子的共用流場
+
+    屬性：
+        game_map: Map - 遊戲地圖
+        radius: int - 流場涵蓋範圍（目標格子周圍的格子數）
+        target: Tuple[int, int] - 目前的目標格子（尚未計算時為 None）
+        bounds: Tuple[int, int, int, int] - 上次計算的流場範圍（左、上、寬、高，格子數）
+        computations: int - 實際重新計算的次數
+    """
+
+    RADIUS = 16  # 預設涵蓋範圍（格子數，33x33 的範圍大於一個視窗）
+    DIRECTIONS = ("up", "down", "left", "right")  # 方向代碼即索引
+    NO_DIRECTION = 255  # 無法到達目標或位於目標格子
+
+    # 進入各種格子的成本（0 表示不可通行）
+    STEP_COST = 1
+    SLOW_COST = 2  # 減速地帶移動速度減半
+    BRICK_COST = 8  # 需要停下來射穿磚塊
+
+    def __init__(self, game_map: "Map", radius: int = RADIUS) -> None:
+        """
+        初始化流場（設定目標後第一次查詢方向時才計算）
+
+        參數：
+            game_map: Map - 遊戲地圖
+            radius: 流場涵蓋範圍（目標格子周圍的格子數）
+        """
+        self.game_map = game_map
+        self.radius = radius
+        self.target: Optional[Tuple[int, int]] = None
+        self.bounds = (0, 0, 0, 0)
+        self.computations = 0
+        self._revision = -1
+        self._stale = False
+        self._directions = bytearray()
+        self._cost_table = self._build_cost_table(game_map)
+
+    @classmethod
+    def _build_cost_table(cls, game_map: "Map") -> bytes:
+        """
+        建立地形代碼對應進入成本的轉換表（供 bytes.translate 使用）
+
+        參數：
+            game_map: Map - 提供 TILE_* 旗標的地圖
+
+        返回：
+            bytes - 256 個地形代碼各自的成本
+        """
+        table = bytearray(256)
+        for code in range(256):
+            if code & game_map.TILE_STEEL:
+                table[code] = 0
+            elif code & game_map.TILE_BRICK:
+                table[code] = cls.BRICK_COST
+            elif code & game_map.TILE_SLOW:
+                table[code] = cls.SLOW_COST
+            else:
+                table[code] = cls.STEP_COST
+        return bytes(table)
+
+    def update(self, grid_x: int, grid_y: int) -> bool:
+        """
+        將目標設為指定格子，目標或地形改變時將流場標記為過期
+
+        過期的流場在下一次 direction_at 時才重新計算。目標與地形在那之前都沒有再改變
+        （否則會再次標記），因此延後計算的結果與立即計算相同，回放保持確定性。
+
+        參數：
+            grid_x: 目標格子X座標
+            grid_y: 目標格子Y座標
+
+        返回：
+            bool - True 表示流場已過期
+        """
+        revision = self.game_map.revision
+        if (grid_x, grid_y) == self.target and self._revision == revision:
+            return False
+        self.target = (grid_x, grid_y)
+        self._revision = revision
+        self._stale = True
+        return True
+
+    def _refresh(self) -> None:
+        """重新計算過期的流場"""
+        self._stale = False
+        target_x, target_y = self.target
+        if self.game_map.in_bounds(target_x, target_y):
+            self._compute(target_x, target_y)
+        else:
+            self.bounds = (0, 0, 0, 0)
+            self._directions = bytearray()
+        self.computations += 1
+
+    def _compute(self, target_x: int, target_y: int) -> None:
+        """
+        從目標格子往外執行 Dijkstra，記錄每個格子往目標的下一步方向
+
+        參數：
+            target_x: 目標格子X座標
+            target_y: 目標格子Y座標
+        """
+        game_map = self.game_map
+        radius = self.radius
+        left = max(target_x - radius, 0)
+        top = max(target_y - radius, 0)
+        right = min(target_x + radius + 1, game_map.width)
+        bottom = min(target_y + radius + 1, game_map.height)
+        width = right - left
+        height = bottom - top
+        self.bounds = (left, top, width, height)
+
+        # 逐列讀取地形並轉換為進入成本
+        costs = bytearray()
+        for grid_y in range(top, bottom):
+            costs += game_map.tile_row(grid_y, left, right).translate(
+                self._cost_table
+            )
+
+        size = width * height
+        directions = bytearray([self.NO_DIRECTION]) * size
+        distances: List[float] = [float("inf")] * size
+        start = (target_y - top) * width + target_x - left
+        distances[start] = 0
+        heap = [(0, start)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        last_row = size - width
+        while heap:
+            distance, index = heappop(heap)
+            if distance > distances[index]:
+                continue
+            # 鄰居進入此格子的成本；鄰居的下一步即朝向此格子
+            step = distance + costs[index]
+            column = index % width
+            if index >= width:
+                neighbor = index - width
+                if costs[neighbor] and step < distances[neighbor]:
+                    distances[neighbor] = step
+                    directions[neighbor] = 1  # down
+                    heappush(heap, (step, neighbor))
+            if index < last_row:
+                neighbor = index + width
+                if costs[neighbor] and step < distances[neighbor]:
+                    distances[neighbor] = step
+                    directions[neighbor] = 0  # up
+                    heappush(heap, (step, neighbor))
+            if column > 0:
+                neighbor = index - 1
+                if costs[neighbor] and step < distances[neighbor]:
+                    distances[neighbor] = step
+                    directions[neighbor] = 3  # right
+                    heappush(heap, (step, neighbor))
+            if column < width - 1:
+                neighbor = index + 1
+                if costs[neighbor] and step < distances[neighbor]:
+                    distances[neighbor] = step
+                    directions[neighbor] = 2  # left
+                    heappush(heap, (step, neighbor))
+        self._directions = directions
+
+    def direction_at(self, grid_x: int, grid_y: int) -> Optional[str]:
+        """
+        查詢格子往目標前進的下一步方向
+
+        參數：
+            grid_x: 格子X座標
+            grid_y: 格子Y座標
+
+        返回：
+            str - 'up'、'down'、'left' 或 'right'；
+            位於目標格子、流場範圍外或無法到達時返回 None
+        """
+        if self._stale:
+            self._refresh()
+        left, top, width, height = self.bounds
+        x = grid_x - left
+        y = grid_y - top
+        if not (0 <= x < width and 0 <= y < height):
+            return None
+        code = self._directions[y * width + x]
+        if code == self.NO_DIRECTION:
+            return None
+        return self.DIRECTIONS[code]
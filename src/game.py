@@ -6,38 +6,25 @@
 import pygame
 import random
 from pathlib import Path
-from typing import List, Optional, Literal
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple, Union
 
 from src.tank import PlayerTank
 from src.enemy import EnemyTank
-from src.bullet import Bullet
+from src.bullet import BulletSystem
+from src.camera import Camera
+from src.clock import SimulationClock
+from src.explosion import ExplosionPool
+from src.flowfield import FlowField
+from src.hud import HUD
 from src.map import Map
+from src.scheduler import AIScheduler
+from src.sight import LineOfSight
+from src.spatial import SpatialHash
+from src.spawn import SpawnIndex
+from src.waves import Wave, WaveScheduler
 
-
-class Explosion(pygame.sprite.Sprite):
-    """
-    爆炸效果精靈類別
-
-    短暫顯示爆炸動畫，持續時間後自動消失。
-    """
-
-    DURATION = 15  # 爆炸持續幀數（15 幀約 0.25 秒）
-
-    def __init__(self, x: int, y: int, image: pygame.Surface) -> None:
-        super().__init__()
-        self.image = image
-        self.rect = self.image.get_rect(center=(x, y))
-        self.timer = self.DURATION
-
-    def update(self) -> None:
-        """更新爆炸計時器"""
-        self.timer -= 1
-        if self.timer <= 0:
-            self.kill()
-
-    def draw(self, surface: pygame.Surface) -> None:
-        """繪製爆炸效果"""
-        surface.blit(self.image, self.rect)
+# 碰撞配對的對象：坦克精靈或障礙物的格子座標
+CollisionTarget = Union[pygame.sprite.Sprite, Tuple[int, int]]
 
 
 class Game:
@@ -47,9 +34,44 @@ class Game:
     ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
     MUSIC_DIR = ASSETS_DIR / "music"
 
-    def __init__(self):
-        """初始化遊戲"""
-        # 載入音效
+    # 敵人優先出生的格子列（頂部區域）
+    ENEMY_SPAWN_ROWS = range(1, 4)
+
+    # 可視範圍（視窗）大小
+    VIEWPORT_WIDTH = 800
+    VIEWPORT_HEIGHT = 600
+
+    def __init__(
+        self,
+        map_width: int = Map.MAP_WIDTH,
+        map_height: int = Map.MAP_HEIGHT,
+        viewport_size: Tuple[int, int] = (VIEWPORT_WIDTH, VIEWPORT_HEIGHT),
+        headless: bool = False,
+        seed: Optional[int] = None,
+        waves: Sequence[Wave] = (),
+    ):
+        """
+        初始化遊戲
+
+        參數：
+            map_width: 地圖寬度（格子數），預設與視窗同大
+            map_height: 地圖高度（格子數），預設與視窗同大
+            viewport_size: 可視範圍（視窗）大小（像素）
+            headless: 無頭模式（只模擬、不播放音效也不繪製），供大量模擬使用
+            seed: 對局的亂數種子，相同種子與相同輸入得到相同結果；None 表示隨機選擇
+            waves: 敵人波次表，預設為空（只有開局的敵人，全部擊毀即獲勝）
+        """
+        self.map_width = map_width
+        self.map_height = map_height
+        self.viewport_size = viewport_size
+        self.headless = headless
+
+        # 對局專用的亂數產生器（地圖、出生與敵人 AI 都由此取得亂數，
+        # 不使用全域的 random 模組，同一行程中的多場對局互不干擾）
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+
+        # 載入音效（無頭模式不載入，所有音效皆為 None）
         self.game_start_sound = self._load_sound("game_start.wav")
         self.shoot_sound = self._load_sound("shoot.mp3")
         self.game_win_sound = self._load_sound("game_win.mp3")
@@ -59,25 +81,59 @@ class Game:
         # 載入爆炸圖片
         self.explode_image = self._load_image("explode.png")
 
-        # 創建地圖
-        self.map = Map()
+        # 預先載入坦克圖像（之後轉向與重生都不再讀檔）
+        PlayerTank.preload_images()
+        EnemyTank.preload_images()
+
+        # 建立 HUD（字型與愛心圖示只建立一次）
+        self.hud = HUD()
+
+        # 模擬時鐘（所有實體共用，每次 update 前進一個固定步長）
+        self.clock = SimulationClock()
+
+        # 創建地圖、朝向玩家的共用流場（敵人尋路）與視線服務（敵人射擊判斷）
+        self.map = self._create_map()
+        self.flow_field = FlowField(self.map)
+        self.line_of_sight = LineOfSight(self.map)
+
+        # 敵人 AI 排程器（遠處的敵人降低思考頻率）
+        self.ai_scheduler = AIScheduler()
+
+        # 敵人波次排程器（對局中陸續派出敵人，每一步的生成數量有上限）
+        self.wave_scheduler = WaveScheduler(waves)
 
         # 創建玩家坦克（底部中央）
-        self.player = PlayerTank(400, 550)
+        self.player = PlayerTank(*self._player_start(), clock=self.clock)
+
+        # 攝影機跟隨玩家坦克
+        self.camera = self._create_camera()
 
         # 創建精靈組
         self.enemies = pygame.sprite.Group()
-        self.bullets = pygame.sprite.Group()
+        self.bullets = BulletSystem(self.map.pixel_width, self.map.pixel_height)
         self.explosions = pygame.sprite.Group()  # 爆炸效果精靈組
         self.all_sprites = pygame.sprite.Group()
 
+        # 爆炸效果物件池（擊毀時重複使用爆炸精靈，不再每次建構）
+        self.explosion_pool = ExplosionPool(
+            self.explode_image, (self.explosions, self.all_sprites)
+        )
+
+        # 碰撞檢測用的敵人空間雜湊（每幀重建）
+        self._enemy_hash: SpatialHash[EnemyTank] = SpatialHash(Map.GRID_SIZE)
+
         # 添加玩家到精靈組
         self.all_sprites.add(self.player)
 
+        # 敵人出生點索引（追蹤坦克覆蓋的格子）
+        self.spawn_index = self._create_spawn_index()
+        self.spawn_index.update_tank(self.player)
+
         # 初始化遊戲狀態
         self.score = 0
         self.game_over = False
         self.game_won = False
+        self.kills = self._empty_kills()  # 各類型敵人的擊毀數
 
         # 生成初始敵人（3-5個）
         self._spawn_initial_enemies()
@@ -86,9 +142,69 @@ class Game:
         if self.game_start_sound:
             self.game_start_sound.play()
 
+    def _create_map(self) -> Map:
+        """
+        以對局的亂數產生器決定地圖種子並建立地圖
+
+        返回：
+            Map - 新的地圖
+        """
+        return Map(
+            seed=self.rng.randrange(2**32),
+            width=self.map_width,
+            height=self.map_height,
+        )
+
+    def _player_start(self) -> Tuple[int, int]:
+        """
+        計算玩家起始位置（世界底部中央）
+
+        預設尺寸的地圖對應 PlayerTank.STARTING_X/STARTING_Y。
+
+        返回：
+            Tuple[int, int] - 起始位置的像素座標
+        """
+        default_width = Map.MAP_WIDTH * Map.GRID_SIZE
+        default_height = Map.MAP_HEIGHT * Map.GRID_SIZE
+        return (
+            PlayerTank.STARTING_X + (self.map.pixel_width - default_width) // 2,
+            PlayerTank.STARTING_Y + (self.map.pixel_height - default_height),
+        )
+
+    def _create_camera(self) -> Camera:
+        """
+        建立跟隨玩家坦克的攝影機
+
+        返回：
+            Camera - 可視範圍已置中於玩家的攝影機
+        """
+        camera = Camera(
+            *self.viewport_size, self.map.pixel_width, self.map.pixel_height
+        )
+        camera.follow(self.player.rect)
+        return camera
+
+    def _create_spawn_index(self, scan: bool = True) -> SpawnIndex:
+        """
+        建立敵人出生點索引
+
+        出生區域為地圖頂部一個預設地圖高度的範圍（預設尺寸的地圖即整張地圖），
+        大型地圖不需要為此載入所有區塊。
+
+        參數：
+            scan: False 表示不掃描地圖（還原狀態時直接套用保存的出生格子）
+
+        返回：
+            SpawnIndex - 新的出生點索引
+        """
+        rows = range(min(self.map.height, Map.MAP_HEIGHT))
+        return SpawnIndex(
+            self.map, self.ENEMY_SPAWN_ROWS, rows, rng=self.rng, scan=scan
+        )
+
     def _spawn_initial_enemies(self):
         """生成初始敵人"""
-        enemy_count = random.randint(3, 5)
+        enemy_count = self.rng.randint(3, 5)
         for _ in range(enemy_count):
             self.spawn_enemy()
 
@@ -101,115 +217,86 @@ class Game:
             y: 爆炸中心 Y 座標
         """
         if self.explode_image is not None:
-            explosion = Explosion(x, y, self.explode_image)
-            self.explosions.add(explosion)
-            self.all_sprites.add(explosion)
+            self.explosion_pool.acquire(x, y)
             # 播放爆炸音效
             if self.explode_sound:
                 self.explode_sound.play()
 
-    def _is_spawn_position_clear(self, rect: pygame.Rect) -> bool:
+    def spawn_enemy(
+        self, enemy_type: Optional[Literal["basic", "fast", "heavy"]] = None
+    ) -> Optional[EnemyTank]:
         """
-        檢查出生位置是否可以放置敵人
+        生成一個敵人
 
         參數：
-            rect: pygame.Rect - 敵人坦克的矩形區域
+            enemy_type: 敵人類型，None 表示隨機選擇
 
         返回：
-            bool - True 表示可放置，False 表示與物件重疊
+            EnemyTank - 新的敵人，沒有空的出生格子時返回 None
         """
-        if self.player.rect is None:
-            return False
-        if rect.colliderect(self.player.rect):
-            return False
-
-        for obstacle in self.map.obstacles:
-            if obstacle.rect is None:
-                continue
-            if rect.colliderect(obstacle.rect):
-                return False
-
-        for enemy in self.enemies:
-            if enemy.rect is None:
-                continue
-            if rect.colliderect(enemy.rect):
-                return False
+        if enemy_type is None:
+            # 隨機敵人類型
+            enemy_types: list[Literal["basic", "fast", "heavy"]] = [
+                "basic",
+                "fast",
+                "heavy",
+            ]
+            weights = [0.5, 0.3, 0.2]  # basic 更多，heavy 更少
+            enemy_type = self.rng.choices(enemy_types, weights=weights, k=1)[0]
+
+        # 從出生點索引抽樣（優先頂部區域，沒有空位時改用整張地圖）
+        position = self.spawn_index.choose()
+        if position is None:
+            return None
+        x, y = position
 
-        return True
+        enemy = EnemyTank(x, y, enemy_type, clock=self.clock, rng=self.rng)
+        self._add_enemy(enemy)
+        return enemy
 
-    def _collect_spawn_positions(self, grid_y_range: range) -> list[tuple[int, int]]:
+    def _add_enemy(self, enemy: EnemyTank) -> None:
         """
-        收集可用的敵人出生位置
+        將敵人加入精靈組與出生點索引
 
         參數：
-            grid_y_range: range - y 方向的格子範圍
-
-        返回：
-            list[tuple[int, int]] - 可用的 (x, y) 位置列表
+            enemy: EnemyTank - 新的敵人
         """
-        positions: list[tuple[int, int]] = []
-        grid_size = self.map.GRID_SIZE
-        for grid_y in grid_y_range:
-            if grid_y < 0 or grid_y >= self.map.MAP_HEIGHT:
-                continue
-            for grid_x in range(self.map.MAP_WIDTH):
-                x = grid_x * grid_size + grid_size // 2
-                y = grid_y * grid_size + grid_size // 2
-                rect = pygame.Rect(0, 0, EnemyTank.TANK_SIZE, EnemyTank.TANK_SIZE)
-                rect.center = (x, y)
-                if self._is_spawn_position_clear(rect):
-                    positions.append((x, y))
-        return positions
-
-    def spawn_enemy(self):
-        """生成一個敵人"""
-        # 隨機敵人類型
-        enemy_types: list[Literal["basic", "fast", "heavy"]] = [
-            "basic",
-            "fast",
-            "heavy",
-        ]
-        weights = [0.5, 0.3, 0.2]  # basic 更多，heavy 更少
-        enemy_type = random.choices(enemy_types, weights=weights, k=1)[0]
-
-        # 優先在頂部區域尋找可用位置
-        top_positions = self._collect_spawn_positions(range(1, 4))
-        if top_positions:
-            x, y = random.choice(top_positions)
-        else:
-            # 如果頂部區域沒有位置，改用整張地圖
-            all_positions = self._collect_spawn_positions(range(self.map.MAP_HEIGHT))
-            if not all_positions:
-                return
-            x, y = random.choice(all_positions)
-
-        enemy = EnemyTank(x, y, enemy_type)
         self.enemies.add(enemy)
         self.all_sprites.add(enemy)
+        self.spawn_index.update_tank(enemy)
 
     def update(self, keys):
-        """更新遊戲狀態"""
-        obstacle_rects = self.map.get_obstacles_rects()
+        """
+        更新遊戲狀態一個模擬步長
+
+        模擬時鐘在更新開始時前進一步，實體讀取的都是這一步的模擬時間。
+        """
+        self.clock.advance()
 
-        # 更新玩家
+        # 更新玩家（碰撞檢查透過地圖的空間索引）
         self.player.handle_input(keys)
-        self.player.move(obstacle_rects)
+        self.player.move(self.map)
         self.player.update()
-
-        # 更新敵人
-        for enemy in self.enemies:
-            enemy.update(obstacle_rects)
-            # 敵人嘗試射擊
-            bullet = enemy.try_shoot()
-            if bullet:
-                self.bullets.add(bullet)
-                self.all_sprites.add(bullet)
+        self.spawn_index.update_tank(self.player)
+
+        # 派出到了時間的波次（每一步生成的敵人數有上限）
+        self.wave_scheduler.update(self)
+
+        # 更新敵人（共用朝向玩家的流場，玩家換格子或地形改變時標記過期，
+        # 有畫面外的敵人查詢時才重新計算；
+        # 排程器讓遠處的敵人隔數步才思考與射擊，其間外推移動）
+        grid_size = Map.GRID_SIZE
+        self.flow_field.update(
+            self.player.rect.centerx // grid_size,
+            self.player.rect.centery // grid_size,
+        )
+        self.ai_scheduler.update(self)
 
         # 更新子彈
         self.bullets.update()
 
-        # 更新爆炸效果
-        self.explosions.update()
+        # 更新爆炸效果（計時結束的爆炸回收至物件池）
+        self.explosion_pool.update()
 
         # 套用減速地帶效果
         self._apply_slow_zone_effects()
@@ -220,55 +307,127 @@ class Game:
         # 檢查遊戲結束條件
         self._check_game_over()
 
+        # 攝影機跟隨玩家
+        self.camera.follow(self.player.rect)
+
+    def _collect_collision_pairs(
+        self, bullet_rects: List[pygame.Rect]
+    ) -> List[Tuple[int, str, CollisionTarget]]:
+        """
+        廣域碰撞檢測：單次掃描所有子彈，找出所有碰撞配對
+
+        敵人每幀依位置放入空間雜湊，障礙物透過地圖的格子索引查詢，
+        因此每顆子彈只檢查所在格子內的物件。
+
+        參數：
+            bullet_rects: List[pygame.Rect] - 依索引排列的子彈矩形
+
+        返回：
+            List[Tuple[int, str, 對象]] - (子彈索引, 類型, 對象)，
+            類型為 'enemy'、'player' 或 'obstacle'（對象為格子座標），
+            同一顆子彈的配對相鄰排列
+        """
+        enemy_hash = self._enemy_hash
+        enemy_hash.clear()
+        for enemy in self.enemies:
+            enemy_hash.insert(enemy, enemy.rect)
+
+        owners = self.bullets.owner
+        player = self.player
+        pairs: List[Tuple[int, str, CollisionTarget]] = []
+        for index, bullet_rect in enumerate(bullet_rects):
+            if owners[index] == "player":
+                for enemy in enemy_hash.query(bullet_rect):
+                    pairs.append((index, "enemy", enemy))
+            elif bullet_rect.colliderect(player.rect):
+                pairs.append((index, "player", player))
+            for obstacle in self.map.get_obstacles_near(bullet_rect):
+                pairs.append((index, "obstacle", obstacle))
+        return pairs
+
     def _check_collisions(self):
         """檢查所有碰撞"""
-        # 玩家子彈擊中敵人
-        for bullet in self.bullets:
-            if bullet.owner == "player":
-                hit_enemies = pygame.sprite.spritecollide(bullet, self.enemies, False)
-                if hit_enemies:
-                    bullet.kill()
-                    for enemy in hit_enemies:
-                        enemy.lives -= 1
-                        if enemy.lives <= 0:
-                            enemy.kill()
-                            self.score += 100
-                            # 敵人死亡時播放爆炸效果
-                            self._create_explosion(
-                                bullet.rect.centerx, bullet.rect.centery
-                            )
-
-        # 敵人子彈擊中玩家（不播放爆炸音效）
-        for bullet in self.bullets:
-            if bullet.owner == "enemy":
-                if bullet.rect.colliderect(self.player.rect):
-                    if not self.player.invincible:
-                        bullet.kill()
-                        self.player.hit()
+        bullet_rects = self.bullets.get_rects()
+        owners = self.bullets.owner
+        removed: set[int] = set()  # 需要移除的子彈
+        consumed: set[int] = set()  # 已擊中坦克、不再檢查障礙物的子彈
+
+        for index, kind, target in self._collect_collision_pairs(bullet_rects):
+            bullet_rect = bullet_rects[index]
+            if kind == "enemy":
+                # 玩家子彈擊中敵人（同一幀已被擊毀的敵人不再計算）
+                if not target.alive():
+                    continue
+                removed.add(index)
+                consumed.add(index)
+                target.lives -= 1
+                if target.lives <= 0:
+                    self._remove_enemy(target)
+                    self.score += 100
+                    # 敵人死亡時播放爆炸效果
+                    self._create_explosion(bullet_rect.centerx, bullet_rect.centery)
+            elif kind == "player":
+                # 敵人子彈擊中玩家（不播放爆炸音效）
+                if not self.player.invincible:
+                    removed.add(index)
+                    consumed.add(index)
+                    self.player.hit()
+            elif index not in consumed:
+                # 子彈擊中地圖障礙物（同一幀已被摧毀的磚塊不再計算）
+                tile = self.map.tile_code(*target)
+                if not tile & Map.TILE_SOLID:
+                    continue
+                removed.add(index)
+                if tile & Map.TILE_BRICK:
+                    self._destroy_brick(*target)
+                    # 只有玩家子彈擊中 brick 時才播放爆炸效果
+                    if owners[index] == "player":
+                        self._create_explosion(
+                            bullet_rect.centerx, bullet_rect.centery
+                        )
+
+        self.bullets.remove(sorted(removed))
 
         # 玩家與敵人坦克碰撞
-        hit_enemies = pygame.sprite.spritecollide(self.player, self.enemies, False)
-        if hit_enemies and not self.player.invincible:
-            for enemy in hit_enemies:
-                enemy.kill()
-                self.player.hit()
-                self.score += 50
-
-        # 子彈擊中地圖障礙物
-        for bullet in self.bullets:
-            hit_obstacles = pygame.sprite.spritecollide(
-                bullet, self.map.obstacles, False
-            )
-            if hit_obstacles:
-                bullet.kill()
-                for obstacle in hit_obstacles:
-                    if obstacle in self.map.bricks:
-                        self.map.destroy_brick(obstacle)
-                        # 只有玩家子彈擊中 brick 時才播放爆炸效果
-                        if bullet.owner == "player":
-                            self._create_explosion(
-                                bullet.rect.centerx, bullet.rect.centery
-                            )
+        if not self.player.invincible:
+            for enemy in self._enemy_hash.query(self.player.rect):
+                if enemy.alive():
+                    self._remove_enemy(enemy)
+                    self.player.hit()
+                    self.score += 50
+
+    @staticmethod
+    def _empty_kills() -> Dict[str, int]:
+        """
+        建立歸零的擊毀數統計
+
+        返回：
+            Dict[str, int] - 每種敵人類型（EnemyTank.ENEMY_CONFIGS）的擊毀數
+        """
+        return dict.fromkeys(EnemyTank.ENEMY_CONFIGS, 0)
+
+    def _remove_enemy(self, enemy: EnemyTank) -> None:
+        """
+        移除被擊毀的敵人、計入擊毀數並釋放其佔據的出生格子
+
+        參數：
+            enemy: EnemyTank - 被擊毀的敵人
+        """
+        enemy.kill()
+        self.kills[enemy.enemy_type] += 1
+        self.spawn_index.remove_tank(enemy)
+
+    def _destroy_brick(self, grid_x: int, grid_y: int) -> None:
+        """
+        摧毀磚塊並更新依賴地形的索引
+
+        參數：
+            grid_x: 被擊中磚塊的格子X座標
+            grid_y: 被擊中磚塊的格子Y座標
+        """
+        if self.map.destroy_brick(grid_x, grid_y):
+            self.spawn_index.refresh_tile(grid_x, grid_y)
+            self.line_of_sight.invalidate(grid_x, grid_y)
 
     def _apply_slow_zone_effects(self) -> None:
         """
@@ -277,31 +436,33 @@ class Game:
         進入 SlowZone：速度 = base_speed * 0.5
         離開 SlowZone：速度 = base_speed
         """
-        slow_zone_rects = self.map.get_slow_zone_rects()
-
-        # 玩家坦克速度調整
-        player_in_slow = any(
-            self.player.rect.colliderect(sz_rect) for sz_rect in slow_zone_rects
-        )
+        # 玩家坦克速度調整（透過地形格子查詢，只檢查坦克覆蓋的格子）
+        player_in_slow = self.map.overlaps_slow_zone(self.player.rect)
         self.player.speed = (
             PlayerTank.TANK_SPEED * 0.5 if player_in_slow else PlayerTank.TANK_SPEED
         )
 
-        # 敵人坦克速度調整
+        # 敵人坦克速度調整（外推中的遠處敵人維持思考時的速度，
+        # 外推路徑已以基礎速度確認，不必每一步查詢地形）
         for enemy in self.enemies:
-            enemy_in_slow = any(
-                enemy.rect.colliderect(sz_rect) for sz_rect in slow_zone_rects
-            )
+            if enemy.coast_ticks:
+                continue
+            enemy_in_slow = self.map.overlaps_slow_zone(enemy.rect)
             enemy.speed = enemy.base_speed * 0.5 if enemy_in_slow else enemy.base_speed
 
     def _check_game_over(self):
-        """檢查遊戲結束條件"""
+        """
+        檢查遊戲結束條件
+
+        玩家沒有生命時失敗；場上沒有敵人、且波次表中的敵人都已派出時勝利
+        （沒有波次表時即為擊毀所有開局的敵人）。
+        """
         if self.player.lives <= 0:
             self.game_over = True
             # 播放遊戲失敗音效
             if self.game_over_sound:
                 self.game_over_sound.play()
-        elif len(self.enemies) == 0:
+        elif len(self.enemies) == 0 and self.wave_scheduler.finished:
             self.game_won = True
             # 播放遊戲勝利音效
             if self.game_win_sound:
@@ -309,10 +470,7 @@ class Game:
 
     def player_shoot(self):
         """玩家射擊"""
-        bullet = self.player.shoot()
-        if bullet:
-            self.bullets.add(bullet)
-            self.all_sprites.add(bullet)
+        if self.player.shoot(self.bullets):
             # 播放射擊音效
             if self.shoot_sound:
                 self.shoot_sound.play()
@@ -342,8 +500,10 @@ class Game:
             filename: 音效檔案名稱
 
         返回：
-            pygame.mixer.Sound - 載入的音效（成功時），None（失敗時）
+            pygame.mixer.Sound - 載入的音效（成功時），None（失敗或無頭模式時）
         """
+        if self.headless:
+            return None
         try:
             sound_path = self.MUSIC_DIR / filename
             sound = pygame.mixer.Sound(str(sound_path))
@@ -351,7 +511,7 @@ class Game:
         except (FileNotFoundError, pygame.error):
             return None
 
-    def reset(self):
+    def reset(self, seed: Optional[int] = None):
         """
         重置遊戲狀態
 
@@ -361,78 +521,177 @@ class Game:
         - 重置玩家位置和生命值
         - 清除並重新生成敵人（位置和類型隨機）
         - 清除所有子彈
+
+        參數：
+            seed: 新對局的亂數種子，None 表示延續目前的亂數序列
         """
+        if seed is not None:
+            self.seed = seed
+            self.rng.seed(seed)
+
         # 重置遊戲狀態
         self.score = 0
         self.game_over = False
         self.game_won = False
+        self.kills = self._empty_kills()
+        self.clock.reset()
 
         # 清除所有精靈
         self.enemies.empty()
-        self.bullets.empty()
-        self.explosions.empty()
+        self.bullets.clear()
+        self.explosion_pool.clear()
         self.all_sprites.empty()
 
         # 重新生成地圖（新的障礙物和草叢位置）
-        self.map = Map()
+        self.map = self._create_map()
+        self.flow_field = FlowField(self.map)
+        self.line_of_sight = LineOfSight(self.map)
 
         # 重置玩家坦克（位置和生命值）
-        self.player = PlayerTank(400, 550)
+        self.player = PlayerTank(*self._player_start(), clock=self.clock)
         self.all_sprites.add(self.player)
+        self.camera = self._create_camera()
+
+        # 重建出生點索引
+        self.spawn_index = self._create_spawn_index()
+        self.spawn_index.update_tank(self.player)
 
-        # 生成新的敵人（位置和類型隨機）
+        # 生成新的敵人（位置和類型隨機），波次從第一波重新開始
         self._spawn_initial_enemies()
+        self.wave_scheduler.reset()
 
         # 播放遊戲開始音效
         if self.game_start_sound:
             self.game_start_sound.play()
 
-    def _load_heart_image(self) -> Optional[pygame.Surface]:
+    def get_state(self) -> Dict[str, Any]:
         """
-        載入愛心圖像
+        取得還原對局所需的完整狀態
+
+        狀態只由數值、字串、bytes 以及它們組成的 tuple/list/dict 構成。
+        地圖只保存種子與被修改過的區塊，其餘地形可由種子重新生成。
 
         返回：
-            pygame.Surface - 載入的圖像（成功時），None（失敗時）
+            Dict[str, Any] - 可傳給 set_state 的狀態
         """
-        try:
-            image_path = self.ASSETS_DIR / "life-heart.png"
-            image = pygame.image.load(str(image_path))
-            return image
-        except (FileNotFoundError, pygame.error):
-            return None
+        return {
+            "seed": self.seed,
+            "ticks": self.clock.ticks,
+            "rng": self.rng.getstate(),
+            "score": self.score,
+            "game_over": self.game_over,
+            "game_won": self.game_won,
+            "kills": dict(self.kills),
+            "map": (
+                self.map.seed,
+                self.map.width,
+                self.map.height,
+                self.map.get_edits(),
+            ),
+            "player": self.player.get_state(),
+            "enemies": [enemy.get_state() for enemy in self.enemies],
+            "spawn": self.spawn_index.get_state(),
+            "waves": self.wave_scheduler.get_state(),
+            "bullets": self.bullets.get_state(),
+            "explosions": self.explosion_pool.get_state(),
+        }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """
+        還原 get_state 取得的狀態，之後以相同輸入更新會得到相同結果
+
+        參數：
+            state: Dict[str, Any] - get_state 的返回值（tuple 可以是 list）
+        """
+        self.seed = state["seed"]
+        self.clock.ticks = state["ticks"]
+        self.score = state["score"]
+        self.game_over = state["game_over"]
+        self.game_won = state["game_won"]
+        self.kills = dict(state["kills"])
+
+        # 清除所有精靈
+        self.enemies.empty()
+        self.bullets.clear()
+        self.explosion_pool.clear()
+        self.all_sprites.empty()
+
+        # 套用被修改過的區塊；種子或尺寸不同時才由種子重建地圖
+        map_seed, self.map_width, self.map_height, edits = state["map"]
+        current = (self.map.seed, self.map.width, self.map.height)
+        if current != (map_seed, self.map_width, self.map_height):
+            self.map = Map(seed=map_seed, width=self.map_width, height=self.map_height)
+        self.map.restore_edits(edits)
+        self.flow_field = FlowField(self.map)
+        self.line_of_sight = LineOfSight(self.map)
+        self.bullets.world_width = self.map.pixel_width
+        self.bullets.world_height = self.map.pixel_height
+
+        self.player = PlayerTank(clock=self.clock)
+        self.player.set_state(state["player"])
+        self.all_sprites.add(self.player)
+        self.camera = self._create_camera()
+
+        # 出生格子集合直接套用保存的內容，不必重新掃描出生區域
+        self.spawn_index = self._create_spawn_index(scan=False)
+        self.spawn_index.update_tank(self.player)
+        for enemy_state in state["enemies"]:
+            x, y, enemy_type = enemy_state[:3]
+            enemy = EnemyTank(x, y, enemy_type, clock=self.clock, rng=self.rng)
+            enemy.set_state(enemy_state)
+            self._add_enemy(enemy)
+        self.spawn_index.set_state(state["spawn"])
+        self.wave_scheduler.set_state(state["waves"])
+
+        self.bullets.set_state(state["bullets"])
+        self.explosion_pool.set_state(state["explosions"])
+
+        # 最後才還原亂數狀態（建立敵人時會消耗亂數）
+        version, internal, gauss = state["rng"]
+        self.rng.setstate((version, tuple(internal), gauss))
 
     def draw(self, screen):
-        """繪製所有遊戲元素"""
-        # 繪製地圖障礙物（磚塊和鋼塊）
-        self.map.draw(screen)
+        """
+        繪製可視範圍內的所有遊戲元素
 
-        # 繪製所有精靈（坦克、子彈等）
-        for sprite in self.all_sprites:
-            sprite.draw(screen)
+        只繪製與攝影機可視範圍重疊的地形區塊、格子與精靈，
+        每幀成本取決於視窗大小而非地圖大小。
+        """
+        view = self.camera.rect
+        offset = self.camera.offset
 
-        # 繪製爆炸效果（在草叢下方）
-        self.explosions.draw(screen)
+        # 繪製地形層（減速地帶、磚塊和鋼塊，只 blit 可視範圍）
+        # 整個畫面都會重繪，因此直接丟棄地形層的變動區域
+        self.map.pop_dirty_rects()
+        self.map.draw(screen, view, offset)
+
+        # 繪製坦克、子彈與爆炸效果
+        self.draw_entities(screen)
 
         # 繪製草叢（在最上層，遮擋坦克）
-        self.map.bushes.draw(screen)
-
-        # 繪製分數
-        font = pygame.font.Font(None, 36)
-        score_text = font.render(f"Score: {self.score}", True, (255, 255, 255))
-        screen.blit(score_text, (10, 10))
-
-        # 繪製生命值（使用愛心圖示）
-        heart_image = self._load_heart_image()
-        if heart_image:
-            # 縮小愛心圖示
-            heart_size = 30
-            heart_image = pygame.transform.scale(heart_image, (heart_size, heart_size))
-            # 根據生命值數量繪製愛心
-            for i in range(self.player.lives):
-                screen.blit(heart_image, (10 + i * 35, 50))
-        else:
-            # 回退到文字顯示
-            lives_text = font.render(
-                f"Lives: {self.player.lives}", True, (255, 255, 255)
-            )
-            screen.blit(lives_text, (10, 50))
+        self.map.draw_bushes(screen, [view], offset)
+
+        # 繪製分數與生命值
+        self.hud.draw(screen, self.score, self.player.lives)
+
+    def draw_entities(self, screen: pygame.Surface) -> None:
+        """
+        繪製可視範圍內的坦克、子彈與爆炸效果（地形層與草叢之間的圖層）
+
+        參數：
+            screen: pygame.Surface - 遊戲螢幕
+        """
+        camera = self.camera
+
+        # 繪製所有精靈（坦克等）
+        for sprite in self.all_sprites:
+            if camera.is_visible(sprite.rect):
+                screen.blit(sprite.image, camera.apply(sprite.rect))
+
+        # 繪製子彈（共用圖像，單次批次繪製）
+        self.bullets.draw(screen, camera)
+
+        # 繪製爆炸效果（在草叢下方）
+        for explosion in self.explosions:
+            if camera.is_visible(explosion.rect):
+                screen.blit(explosion.image, camera.apply(explosion.rect))
@@ -0,0 +1,157 @@
+"""
+無頭模擬模組
+
+不開啟視窗、不播放音效、不限制幀率，只反覆呼叫 Game.update，
+供長時間穩定性測試與平衡調整的大量模擬使用。
+pygame 使用 SDL 的虛擬（dummy）影像與音效驅動程式，玩家由腳本操作。
+
+執行方式：
+    python main.py --headless --frames 100000 --seed 1
+"""
+
+import os
+import random
+import time
+from typing import Optional
+
+import pygame
+
+from src.game import Game
+from src.map import Map
+from src.waves import WaveScheduler
+
+
+class ScriptedPlayer:
+    """
+    腳本化的玩家輸入
+
+    取代鍵盤：每隔固定步數隨機換一個方向鍵，並在每一步嘗試射擊（受射擊冷卻限制）。
+    本身可當作 pygame.key.get_pressed() 的結果傳給 Game.update。
+
+    屬性：
+        pressed: int - 目前按下的方向鍵（pygame 按鍵代碼）
+    """
+
+    TURN_INTERVAL = 45  # 換方向的間隔（模擬步數）
+    DIRECTION_KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT)
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        """
+        初始化腳本
+
+        參數：
+            seed: 腳本的亂數種子，相同種子產生相同的操作順序
+        """
+        self.rng = random.Random(seed)
+        self.pressed = pygame.K_UP
+        self._steps = 0
+
+    def __getitem__(self, key: int) -> bool:
+        """
+        查詢按鍵是否按下（與 pygame.key.get_pressed() 的介面相同）
+
+        參數：
+            key: pygame 按鍵代碼
+
+        返回：
+            bool - True 表示按下
+        """
+        return key == self.pressed
+
+    def step(self, game: Game) -> None:
+        """
+        推進腳本一步：必要時換方向，並嘗試射擊
+
+        參數：
+            game: Game - 被操作的遊戲
+        """
+        if self._steps % self.TURN_INTERVAL == 0:
+            self.pressed = self.rng.choice(self.DIRECTION_KEYS)
+        self._steps += 1
+        game.player_shoot()
+
+
+def init_headless() -> None:
+    """以 SDL 的虛擬驅動程式初始化 pygame（不開啟視窗、不輸出聲音）"""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pygame.init()
+
+
+def simulate(game: Game, player: ScriptedPlayer, frames: int) -> int:
+    """
+    模擬最多 frames 步，遊戲分出勝負時提早停止
+
+    參數：
+        game: Game - 要模擬的遊戲
+        player: ScriptedPlayer - 操作玩家的腳本
+        frames: 最多模擬的步數
+
+    返回：
+        int - 實際模擬的步數
+    """
+    for frame in range(frames):
+        if game.game_over or game.game_won:
+            return frame
+        player.step(game)
+        game.update(player)
+    return frames
+
+
+def run(
+    frames: int,
+    seed: Optional[int] = None,
+    map_width: Optional[int] = None,
+    map_height: Optional[int] = None,
+    waves: bool = False,
+) -> None:
+    """
+    無頭模擬指定步數並回報模擬速度
+
+    一局分出勝負後立即重新開始，直到模擬滿 frames 步。
+
+    參數：
+        frames: 總模擬步數
+        seed: 亂數種子，None 表示隨機
+        map_width: 地圖寬度（格子數），None 表示預設大小
+        map_height: 地圖高度（格子數），None 表示預設大小
+        waves: 是否啟用預設的敵人波次表（WaveScheduler.WAVES）
+    """
+    init_headless()
+    game = Game(
+        map_width=map_width or Map.MAP_WIDTH,
+        map_height=map_height or Map.MAP_HEIGHT,
+        headless=True,
+        seed=seed,
+        waves=WaveScheduler.default_waves() if waves else (),
+    )
+    player = ScriptedPlayer(seed)
+
+    wins = losses = 0
+    remaining = frames
+    start = time.perf_counter()
+    while remaining > 0:
+        remaining -= simulate(game, player, remaining)
+        if game.game_over or game.game_won:
+            wins += game.game_won
+            losses += game.game_over
+            game.reset()
+    elapsed = time.perf_counter() - start
+
+    print(f"frames:        {frames}")
+    print(f"elapsed:       {elapsed:.2f} s")
+    print(f"simulated FPS: {frames / elapsed:.0f}")
+    print(f"matches:       {wins + losses} (wins {wins}, losses {losses})")
+    print(f"score:         {game.score}")
+    fired = game.bullets.fired
+    print(
+        f"bullets fired: {fired['player'] + fired['enemy']} "
+        f"(player {fired['player']}, enemy {fired['enemy']}, "
+        f"{fired['enemy'] / frames * 60:.2f} enemy/s)"
+    )
+    for line in game.ai_scheduler.report():
+        print(f"ai {line}")
+    if game.wave_scheduler.waves:
+        for line in game.wave_scheduler.report():
+            print(f"spawn {line}")
+    pygame.quit()
@@ -0,0 +1,105 @@
+"""
+抬頭顯示（HUD）模組
+
+繪製分數與生命值。字型與愛心圖示只建立一次，
+分數與生命值的圖像只在數值改變時重新產生。
+"""
+
+from typing import List, Optional
+
+import pygame
+
+from src.sprite_cache import SpriteCache
+
+
+class HUD:
+    """
+    抬頭顯示類別
+
+    快取分數文字與生命值圖像，數值未改變時直接重用上一幀的 Surface。
+
+    屬性：
+        font: pygame.font.Font - 分數與生命值文字字型
+        heart_image: pygame.Surface - 已縮放的愛心圖示（載入失敗時為 None）
+        rects: List[pygame.Rect] - 上次繪製覆蓋的區域
+    """
+
+    FONT_SIZE = 36
+    TEXT_COLOR = (255, 255, 255)  # 白色 (RGB)
+    HEART_SIZE = 30  # 愛心圖示大小（像素）
+    HEART_SPACING = 35  # 愛心圖示間距（像素）
+    SCORE_POS = (10, 10)
+    LIVES_POS = (10, 50)
+
+    def __init__(self) -> None:
+        """初始化 HUD，建立字型並載入縮放後的愛心圖示"""
+        self.font = pygame.font.Font(None, self.FONT_SIZE)
+        self.heart_image = SpriteCache.load(
+            "life-heart.png", (self.HEART_SIZE, self.HEART_SIZE)
+        )
+
+        self.rects: List[pygame.Rect] = []
+
+        self._score: Optional[int] = None
+        self._score_surface: Optional[pygame.Surface] = None
+        self._lives: Optional[int] = None
+        self._lives_surface: Optional[pygame.Surface] = None
+
+    def _render_score(self, score: int) -> pygame.Surface:
+        """
+        取得分數文字圖像，分數改變時才重新繪製
+
+        參數：
+            score: 目前分數
+
+        返回：
+            pygame.Surface - 分數文字圖像
+        """
+        if self._score_surface is None or score != self._score:
+            self._score = score
+            self._score_surface = self.font.render(
+                f"Score: {score}", True, self.TEXT_COLOR
+            )
+        return self._score_surface
+
+    def _render_lives(self, lives: int) -> pygame.Surface:
+        """
+        取得生命值圖像，生命值改變時才重新繪製
+
+        有愛心圖示時將所有愛心合成到一張圖像，否則回退到文字顯示。
+
+        參數：
+            lives: 剩餘生命數
+
+        返回：
+            pygame.Surface - 生命值圖像
+        """
+        if self._lives_surface is None or lives != self._lives:
+            self._lives = lives
+            if self.heart_image is not None:
+                count = max(lives, 0)
+                width = self.HEART_SPACING * max(count - 1, 0) + self.HEART_SIZE
+                surface = pygame.Surface((width, self.HEART_SIZE), pygame.SRCALPHA)
+                # 根據生命值數量繪製愛心
+                for i in range(count):
+                    surface.blit(self.heart_image, (i * self.HEART_SPACING, 0))
+                self._lives_surface = surface
+            else:
+                self._lives_surface = self.font.render(
+                    f"Lives: {lives}", True, self.TEXT_COLOR
+                )
+        return self._lives_surface
+
+    def draw(self, surface: pygame.Surface, score: int, lives: int) -> None:
+        """
+        繪製分數與生命值，並記錄繪製覆蓋的區域
+
+        參數：
+            surface: pygame.Surface - 目標繪製表面
+            score: 目前分數
+            lives: 剩餘生命數
+        """
+        self.rects = [
+            surface.blit(self._render_score(score), self.SCORE_POS),
+            surface.blit(self._render_lives(lives), self.LIVES_POS),
+        ]
@@ -3,441 +3,615 @@
 
 地圖系統管理遊戲場景，包含磚塊和鋼塊障礙物。
 磚塊可被破壞，鋼塊不可破壞。遊戲開始時隨機生成 30-50 個障礙物。
+
+地圖切分為固定大小的區塊（Chunk），每個區塊只在第一次被存取時
+（攝影機繪製或坦克、子彈查詢）依區塊種子生成；超過記憶體預算時
+依最近最少使用（LRU）順序卸載，被摧毀的磚塊在卸載後仍會保留。
 """
 
 import random
-from pathlib import Path
-from typing import List, Optional
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
 import pygame
 
+from src.sprite_cache import SpriteCache
+
 
-class Brick(pygame.sprite.Sprite):
+class Chunk:
     """
-    磚塊精靈類別
+    地圖區塊類別
 
-    可破壞的障礙物，棕色，玩家子彈可以摧毀。
+    保存區塊內每個格子的地形代碼，以及繪製時才建立的地形層與草叢矩形快取。
 
     屬性：
-        rect: pygame.Rect - 磚塊的矩形碰撞區域
-        image: pygame.Surface - 磚塊的可視化圖像
+        chunk_x: int - 區塊X座標
+        chunk_y: int - 區塊Y座標
+        grid_x: int - 區塊左上角的格子X座標
+        grid_y: int - 區塊左上角的格子Y座標
+        width: int - 區塊寬度（格子數，地圖邊緣的區塊可能較小）
+        height: int - 區塊高度（格子數）
+        tiles: bytearray - 區塊內的地形代碼（TILE_* 旗標組合），依列優先排列
+        surface: pygame.Surface - 預先繪製的地形層（尚未繪製時為 None）
+        bush_rects: List[pygame.Rect] - 草叢的世界座標矩形（尚未繪製時為 None）
+        exits: bytearray - 每格可通行方向的位元遮罩 Map.EXIT_*（尚未查詢時為 None）
+        modified: bool - 地形是否在生成後被修改（例如磚塊被摧毀）
     """
 
-    # 磚塊常數設定
-    SIZE = 40  # 格子大小（像素）
-    COLOR = (139, 69, 19)  # 棕色 (RGB)
-
-    def __init__(self, grid_x: int, grid_y: int) -> None:
+    def __init__(
+        self,
+        chunk_x: int,
+        chunk_y: int,
+        grid_x: int,
+        grid_y: int,
+        width: int,
+        height: int,
+    ) -> None:
         """
-        初始化磚塊
+        初始化空白區塊
 
         參數：
-            grid_x: 格子X座標（0-19）
-            grid_y: 格子Y座標（0-14）
+            chunk_x: 區塊X座標
+            chunk_y: 區塊Y座標
+            grid_x: 區塊左上角的格子X座標
+            grid_y: 區塊左上角的格子Y座標
+            width: 區塊寬度（格子數）
+            height: 區塊高度（格子數）
         """
-        super().__init__()
-
-        # 計算像素座標
-        self.x = grid_x * self.SIZE
-        self.y = grid_y * self.SIZE
-
-        # 使用預載入的圖像資源
-        if Map.brick_image is not None:
-            # 調整圖像大小
-            self.image = pygame.transform.scale(Map.brick_image, (self.SIZE, self.SIZE))
-        else:
-            # 回退到程序生成
-            self.image = pygame.Surface((self.SIZE, self.SIZE))
-            self.image.fill(self.COLOR)
-
-        # 設定碰撞矩形位置
-        self.rect = self.image.get_rect(topleft=(self.x, self.y))
-
-    def destroy(self) -> None:
-        """
-        摧毀磚塊，將其從遊戲中移除
-        """
-        self.kill()
-
-    def draw(self, surface: pygame.Surface) -> None:
+        self.chunk_x = chunk_x
+        self.chunk_y = chunk_y
+        self.grid_x = grid_x
+        self.grid_y = grid_y
+        self.width = width
+        self.height = height
+        self.tiles = bytearray(width * height)
+        self.surface: Optional[pygame.Surface] = None
+        self.bush_rects: Optional[List[pygame.Rect]] = None
+        self.exits: Optional[bytearray] = None
+        self.modified = False
+
+    def nbytes(self) -> int:
         """
-        繪製磚塊到指定的表面
+        估計區塊佔用的記憶體
 
-        參數：
-            surface: pygame.Surface - 目標繪製表面（通常是遊戲螢幕）
+        返回：
+            int - 地形代碼、通行方向表與地形層像素的位元組數
         """
-        surface.blit(self.image, self.rect)
+        size = len(self.tiles)
+        if self.exits is not None:
+            size += len(self.exits)
+        if self.surface is not None:
+            size += (
+                self.surface.get_width()
+                * self.surface.get_height()
+                * self.surface.get_bytesize()
+            )
+        return size
 
 
-class Steel(pygame.sprite.Sprite):
+class Map:
     """
-    鋼塊精靈類別
+    遊戲地圖類別
 
-    不可破壞的障礙物，灰色，玩家子彈無法摧毀。
+    管理遊戲場景中的所有障礙物（磚塊和鋼塊）和裝飾元素（草叢、減速地帶）。
+    地形以格子代碼儲存在區塊中，區塊依需要生成並在超過記憶體預算時卸載。
+    草叢是最上層元素，用於遮擋坦克。
 
     屬性：
-        rect: pygame.Rect - 鋼塊的矩形碰撞區域
-        image: pygame.Surface - 鋼塊的可視化圖像
+        GRID_SIZE: int - 格子大小（40 像素）
+        MAP_WIDTH: int - 預設地圖寬度（20 格 = 800 像素）
+        MAP_HEIGHT: int - 預設地圖高度（15 格 = 600 像素）
+        CHUNK_SIZE: int - 區塊大小（格子數）
+        MEMORY_BUDGET: int - 預設的區塊記憶體預算（位元組）
+        OBSTACLE_MIN: int - 最小障礙物數量
+        OBSTACLE_MAX: int - 最大障礙物數量
+        BRICK_RATIO: float - 障礙物為磚塊（其餘為鋼塊）的機率
+        width: int - 地圖寬度（格子數）
+        height: int - 地圖高度（格子數）
+        seed: int - 地圖亂數種子（相同種子產生相同地圖）
+        memory_budget: int - 已載入區塊的記憶體預算（位元組）
+        memory_usage: int - 已載入區塊目前佔用的記憶體（位元組）
+        chunk_loads: int - 區塊載入（生成或還原）次數
+        chunk_evictions: int - 區塊卸載次數
+        revision: int - 地形版本（磚塊被摧毀或還原修改時遞增），衍生資料據此判斷是否過期
+        pixel_width: int - 世界寬度（像素）
+        pixel_height: int - 世界高度（像素）
+        brick_image: pygame.Surface - 磚塊圖像（靜態）
+        steel_image: pygame.Surface - 鋼塊圖像（靜態）
+        bush_image: pygame.Surface - 草叢圖像（靜態）
+        slow_zone_image: pygame.Surface - 減速地帶圖像（靜態）
+        dirty_rects: List[pygame.Rect] - 上次繪製後地形層有變動的區域
     """
 
-    # 鋼塊常數設定
-    SIZE = 40  # 格子大小（像素）
-    COLOR = (128, 128, 128)  # 灰色 (RGB)
+    # 地圖常數設定
+    GRID_SIZE = 40  # 格子大小（像素）
+    MAP_WIDTH = 20  # 地圖寬度（格子數）
+    MAP_HEIGHT = 15  # 地圖高度（格子數）
+    PLAYER_SPAWN_X_MIN = 360  # 玩家起始區域X最小（像素）
+    PLAYER_SPAWN_X_MAX = 440  # 玩家起始區域X最大（像素）
+    PLAYER_SPAWN_Y_MIN = 520  # 玩家起始區域Y最小（像素）
+    PLAYER_SPAWN_Y_MAX = 600  # 玩家起始區域Y最大（像素）
+    OBSTACLE_MIN = 20  # 最小障礙物數量
+    OBSTACLE_MAX = 35  # 最大障礙物數量
+    OBSTACLE_CLEARANCE = 2  # 障礙物最小間距（格）
+    BRICK_RATIO = 0.6  # 障礙物為磚塊的機率（其餘為鋼塊）
+    BACKGROUND_COLOR = (0, 0, 0)  # 地形層底色（黑色）
+    CHUNK_SIZE = 32  # 區塊大小（格子數）
+    MEMORY_BUDGET = 64 * 1024 * 1024  # 預設的區塊記憶體預算（64 MB）
+
+    # 圖像載入失敗時的回退顏色 (RGB)
+    BRICK_COLOR = (139, 69, 19)  # 棕色
+    STEEL_COLOR = (128, 128, 128)  # 灰色
+    BUSH_COLOR = (34, 139, 34)  # 森林綠
+    SLOW_ZONE_COLOR = (0, 0, 200)  # 藍色
+
+    # 地形代碼（位元旗標，草叢與減速地帶可能位於同一格）
+    TILE_EMPTY = 0
+    TILE_BRICK = 1
+    TILE_STEEL = 2
+    TILE_BUSH = 4
+    TILE_SLOW = 8
+    TILE_SOLID = TILE_BRICK | TILE_STEEL
+
+    # 通行方向表的位元：坦克大小的車身從此格往該方向的相鄰格子可以通行
+    EXIT_UP = 1
+    EXIT_DOWN = 2
+    EXIT_LEFT = 4
+    EXIT_RIGHT = 8
 
-    def __init__(self, grid_x: int, grid_y: int) -> None:
-        """
-        初始化鋼塊
+    # 靜態圖像資源
+    brick_image: Optional[pygame.Surface] = None
+    steel_image: Optional[pygame.Surface] = None
+    bush_image: Optional[pygame.Surface] = None
+    slow_zone_image: Optional[pygame.Surface] = None
 
-        參數：
-            grid_x: 格子X座標（0-19）
-            grid_y: 格子Y座標（0-14）
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        width: int = MAP_WIDTH,
+        height: int = MAP_HEIGHT,
+        memory_budget: int = MEMORY_BUDGET,
+    ) -> None:
         """
-        super().__init__()
-
-        # 計算像素座標
-        self.x = grid_x * self.SIZE
-        self.y = grid_y * self.SIZE
-
-        # 使用預載入的圖像資源
-        if Map.steel_image is not None:
-            # 調整圖像大小
-            self.image = pygame.transform.scale(Map.steel_image, (self.SIZE, self.SIZE))
-        else:
-            # 回退到程序生成
-            self.image = pygame.Surface((self.SIZE, self.SIZE))
-            self.image.fill(self.COLOR)
-
-        # 設定碰撞矩形位置
-        self.rect = self.image.get_rect(topleft=(self.x, self.y))
+        初始化遊戲地圖
 
-    def draw(self, surface: pygame.Surface) -> None:
-        """
-        繪製鋼塊到指定的表面
+        區塊在第一次被存取時才生成，因此建立地圖的成本與地圖大小無關。
 
         參數：
-            surface: pygame.Surface - 目標繪製表面（通常是遊戲螢幕）
+            seed: 地圖亂數種子，相同種子產生相同地圖；None 表示隨機選擇
+            width: 地圖寬度（格子數），預設 MAP_WIDTH
+            height: 地圖高度（格子數），預設 MAP_HEIGHT
+            memory_budget: 已載入區塊的記憶體預算（位元組），預設 MEMORY_BUDGET
         """
-        surface.blit(self.image, self.rect)
+        # 載入圖像資源
+        Map.brick_image = self._load_image("brick.png")
+        Map.steel_image = self._load_image("wall.png")
+        Map.bush_image = self._load_image("bush.png")
+        Map.slow_zone_image = self._load_image("slow-speed.png")
 
+        # 各種地形的格子圖像（載入失敗時使用純色圖像）
+        self._tile_images: Dict[int, pygame.Surface] = {
+            self.TILE_BRICK: Map.brick_image or self._fallback_tile(self.BRICK_COLOR),
+            self.TILE_STEEL: Map.steel_image or self._fallback_tile(self.STEEL_COLOR),
+            self.TILE_BUSH: Map.bush_image or self._fallback_tile(self.BUSH_COLOR),
+            self.TILE_SLOW: Map.slow_zone_image
+            or self._fallback_tile(self.SLOW_ZONE_COLOR),
+        }
 
-class Bush(pygame.sprite.Sprite):
-    """
-    草叢精靈類別
+        # 地圖尺寸與亂數種子
+        self.width = width
+        self.height = height
+        self.seed = seed if seed is not None else random.randrange(2**32)
 
-    裝飾性地圖元素，綠色草叢圖片，坦克可以通過。
-    草叢會遮擋坦克，需要在地圖繪製層級上最上層渲染。
+        # 已載入的區塊（依最近使用順序排列，最舊的在最前面）
+        self._chunks: "OrderedDict[Tuple[int, int], Chunk]" = OrderedDict()
+        # 卸載時保存的已修改區塊地形，重新載入時取代生成結果
+        self._saved_tiles: Dict[Tuple[int, int], bytes] = {}
+        self.memory_budget = memory_budget
+        self.memory_usage = 0
+        self.chunk_loads = 0
+        self.chunk_evictions = 0
+        self.revision = 0
 
-    屬性：
-        rect: pygame.Rect - 草叢的矩形碰撞區域
-        image: pygame.Surface - 草叢的可視化圖像
-    """
+        self.dirty_rects: List[pygame.Rect] = []
 
-    # 草叢常數設定
-    SIZE = 40  # 格子大小（像素）
-    COLOR = (34, 139, 34)  # 森林綠 (RGB)
+    # ------------------------------------------------------------------
+    # 區塊管理
+    # ------------------------------------------------------------------
 
-    def __init__(self, grid_x: int, grid_y: int) -> None:
+    def _chunk(self, chunk_x: int, chunk_y: int) -> Chunk:
         """
-        初始化草叢
+        取得區塊，尚未載入時生成或還原，並標記為最近使用
 
         參數：
-            grid_x: 格子X座標（0-19）
-            grid_y: 格子Y座標（0-14）
-        """
-        super().__init__()
-
-        # 計算像素座標
-        self.x = grid_x * self.SIZE
-        self.y = grid_y * self.SIZE
+            chunk_x: 區塊X座標
+            chunk_y: 區塊Y座標
 
-        # 使用預載入的圖像資源
-        if Map.bush_image is not None:
-            # 調整圖像大小
-            self.image = pygame.transform.scale(Map.bush_image, (self.SIZE, self.SIZE))
+        返回：
+            Chunk - 已載入的區塊
+        """
+        key = (chunk_x, chunk_y)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+
+        grid_x = chunk_x * self.CHUNK_SIZE
+        grid_y = chunk_y * self.CHUNK_SIZE
+        chunk = Chunk(
+            chunk_x,
+            chunk_y,
+            grid_x,
+            grid_y,
+            min(self.CHUNK_SIZE, self.width - grid_x),
+            min(self.CHUNK_SIZE, self.height - grid_y),
+        )
+        saved = self._saved_tiles.get(key)
+        if saved is not None:
+            # 還原卸載前的地形（保留被摧毀的磚塊）
+            chunk.tiles[:] = saved
+            chunk.modified = True
         else:
-            # 回退到程序生成
-            self.image = pygame.Surface((self.SIZE, self.SIZE))
-            self.image.fill(self.COLOR)
+            self._generate_chunk(chunk)
 
-        # 設定碰撞矩形位置
-        self.rect = self.image.get_rect(topleft=(self.x, self.y))
+        self._chunks[key] = chunk
+        self.chunk_loads += 1
+        self.memory_usage += chunk.nbytes()
+        self._enforce_budget()
+        return chunk
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def _enforce_budget(self) -> None:
         """
-        繪製草叢到指定的表面
+        卸載最近最少使用的區塊，直到記憶體用量不超過預算
 
-        參數：
-            surface: pygame.Surface - 目標繪製表面（通常是遊戲螢幕）
+        最近使用的區塊（正在存取的區塊）永遠保留。
         """
-        surface.blit(self.image, self.rect)
-
-
-class SlowZone(pygame.sprite.Sprite):
-    """
-    減速地帶精靈類別
+        while self.memory_usage > self.memory_budget and len(self._chunks) > 1:
+            key, chunk = self._chunks.popitem(last=False)
+            if chunk.modified:
+                self._saved_tiles[key] = bytes(chunk.tiles)
+            self.memory_usage -= chunk.nbytes()
+            self.chunk_evictions += 1
+
+    @property
+    def loaded_chunks(self) -> int:
+        """目前已載入的區塊數量"""
+        return len(self._chunks)
+
+    def get_edits(self) -> Dict[Tuple[int, int], bytes]:
+        """
+        取得所有在生成後被修改過的區塊地形（包含已卸載的區塊）
 
-    坦克可穿越的地圖元素，進入後速度減半，離開後恢復。
-    繪製在障礙物後、草叢前。
+        地圖的完整狀態即種子加上這些區塊，其餘區塊都能由種子重新生成。
 
-    屬性：
-        rect: pygame.Rect - 碰撞區域
-        image: pygame.Surface - 顯示圖像
-    """
-
-    SIZE = 40
-    COLOR = (0, 0, 200)  # 回退顏色（藍色）
+        返回：
+            Dict[Tuple[int, int], bytes] - 區塊座標對應該區塊的格子代碼
+        """
+        edits = dict(self._saved_tiles)
+        for key, chunk in self._chunks.items():
+            if chunk.modified:
+                edits[key] = bytes(chunk.tiles)
+        return edits
 
-    def __init__(self, grid_x: int, grid_y: int) -> None:
-        super().__init__()
-        self.x = grid_x * self.SIZE
-        self.y = grid_y * self.SIZE
+    def restore_edits(self, edits: Dict[Tuple[int, int], bytes]) -> None:
+        """
+        還原 get_edits 取得的區塊地形
 
-        if Map.slow_zone_image is not None:
-            self.image = pygame.transform.scale(Map.slow_zone_image, (self.SIZE, self.SIZE))
-        else:
-            self.image = pygame.Surface((self.SIZE, self.SIZE))
-            self.image.fill(self.COLOR)
+        已載入且地形與還原結果相同的區塊連同繪製快取一起保留；
+        地形不同的區塊才卸載，下次存取時依還原的地形重新載入或生成，
+        並將該區塊的範圍加入 dirty_rects。還原到相近的狀態時幾乎不需要重新生成。
 
-        self.rect = self.image.get_rect(topleft=(self.x, self.y))
+        參數：
+            edits: Dict[Tuple[int, int], bytes] - get_edits 的返回值
+        """
+        self._saved_tiles = dict(edits)
+        self.revision += 1
+        grid_size = self.GRID_SIZE
+        dropped = []
+        for key, chunk in list(self._chunks.items()):
+            saved = edits.get(key)
+            if saved is None:
+                # 未修改的區塊與重新生成的結果相同
+                if not chunk.modified:
+                    continue
+            elif chunk.tiles == saved:
+                chunk.modified = True
+                continue
+            del self._chunks[key]
+            dropped.append(key)
+            self.memory_usage -= chunk.nbytes()
+            self.dirty_rects.append(
+                pygame.Rect(
+                    chunk.grid_x * grid_size,
+                    chunk.grid_y * grid_size,
+                    chunk.width * grid_size,
+                    chunk.height * grid_size,
+                )
+            )
+
+        # 相鄰區塊邊緣格子的通行方向參考了被卸載區塊的地形，下次查詢時重新計算
+        for chunk_x, chunk_y in dropped:
+            for key in (
+                (chunk_x, chunk_y - 1),
+                (chunk_x, chunk_y + 1),
+                (chunk_x - 1, chunk_y),
+                (chunk_x + 1, chunk_y),
+            ):
+                chunk = self._chunks.get(key)
+                if chunk is not None and chunk.exits is not None:
+                    self.memory_usage -= len(chunk.exits)
+                    chunk.exits = None
+
+    # ------------------------------------------------------------------
+    # 地圖生成
+    # ------------------------------------------------------------------
+
+    def _chunk_rng(self, chunk_x: int, chunk_y: int) -> random.Random:
+        """
+        建立區塊專用的亂數產生器
 
-    def draw(self, surface: pygame.Surface) -> None:
-        surface.blit(self.image, self.rect)
+        區塊種子由地圖種子與區塊座標決定，與區塊生成順序無關。
+        只有一個區塊的地圖直接使用地圖種子，與切分區塊前生成的地圖相同。
 
+        參數：
+            chunk_x: 區塊X座標
+            chunk_y: 區塊Y座標
 
-class Map:
-    """
-    遊戲地圖類別
+        返回：
+            random.Random - 區塊的亂數產生器
+        """
+        if self.width <= self.CHUNK_SIZE and self.height <= self.CHUNK_SIZE:
+            return random.Random(self.seed)
+        return random.Random(f"{self.seed}:{chunk_x}:{chunk_y}")
 
-    管理遊戲場景中的所有障礙物（磚塊和鋼塊）和裝飾元素（草叢）。
-    支持隨機生成地圖，繪製障礙物，以及管理磚塊的破壞。
-    草叢是最上層元素，用於遮擋坦克。
+    def _generate_chunk(self, chunk: Chunk) -> None:
+        """
+        依區塊種子生成區塊內的障礙物、草叢與減速地帶
 
-    屬性：
-        GRID_SIZE: int - 格子大小（40 像素）
-        MAP_WIDTH: int - 地圖寬度（20 格 = 800 像素）
-        MAP_HEIGHT: int - 地圖高度（15 格 = 600 像素）
-        PLAYER_SPAWN_SAFE_ZONE: tuple - 玩家起始安全區域
-        OBSTACLE_MIN: int - 最小障礙物數量
-        OBSTACLE_MAX: int - 最大障礙物數量
-        obstacles: pygame.sprite.Group - 所有障礙物精靈組
-        bricks: pygame.sprite.Group - 所有磚塊精靈組
-        steels: pygame.sprite.Group - 所有鋼塊精靈組
-        bushes: pygame.sprite.Group - 所有草叢精靈組
-        brick_image: pygame.Surface - 磚塊圖像（靜態）
-        steel_image: pygame.Surface - 鋼塊圖像（靜態）
-        bush_image: pygame.Surface - 草叢圖像（靜態）
-        slow_zones: pygame.sprite.Group - 所有減速地帶精靈組
-        slow_zone_image: pygame.Surface - 減速地帶圖像（靜態）
-    """
+        參數：
+            chunk: Chunk - 要生成的空白區塊
+        """
+        rng = self._chunk_rng(chunk.chunk_x, chunk.chunk_y)
+        self._generate_random_obstacles(chunk, rng)
+        free_positions = self._collect_free_positions(chunk)
+        self._generate_random_bushes(chunk, rng, free_positions)
+        self._generate_slow_zones(chunk, rng, free_positions)
+
+    def _scaled_count(
+        self, chunk: Chunk, rng: random.Random, minimum: int, maximum: int
+    ) -> int:
+        """
+        依區塊面積等比例放大數量範圍後隨機選擇數量
 
-    # 地圖常數設定
-    GRID_SIZE = 40  # 格子大小（像素）
-    MAP_WIDTH = 20  # 地圖寬度（格子數）
-    MAP_HEIGHT = 15  # 地圖高度（格子數）
-    PLAYER_SPAWN_X_MIN = 360  # 玩家起始區域X最小（像素）
-    PLAYER_SPAWN_X_MAX = 440  # 玩家起始區域X最大（像素）
-    PLAYER_SPAWN_Y_MIN = 520  # 玩家起始區域Y最小（像素）
-    PLAYER_SPAWN_Y_MAX = 600  # 玩家起始區域Y最大（像素）
-    OBSTACLE_MIN = 20  # 最小障礙物數量
-    OBSTACLE_MAX = 35  # 最大障礙物數量
-    OBSTACLE_CLEARANCE = 2  # 障礙物最小間距（格）
-    ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+        面積等於預設尺寸（20x15）的區塊維持原本的範圍。
 
-    # 靜態圖像資源
-    brick_image: Optional[pygame.Surface] = None
-    steel_image: Optional[pygame.Surface] = None
-    bush_image: Optional[pygame.Surface] = None
-    slow_zone_image: Optional[pygame.Surface] = None
+        參數：
+            chunk: Chunk - 要生成的區塊
+            rng: random.Random - 區塊的亂數產生器
+            minimum: 預設尺寸地圖的最小數量
+            maximum: 預設尺寸地圖的最大數量
 
-    def __init__(self) -> None:
-        """
-        初始化遊戲地圖，隨機生成障礙物和草叢
+        返回：
+            int - 隨機選擇的數量
         """
-        # 載入圖像資源
-        Map.brick_image = self._load_image("brick.png")
-        Map.steel_image = self._load_image("wall.png")
-        Map.bush_image = self._load_image("bush.png")
-        Map.slow_zone_image = self._load_image("slow-speed.png")
+        ratio = (chunk.width * chunk.height) / (self.MAP_WIDTH * self.MAP_HEIGHT)
+        return rng.randint(round(minimum * ratio), round(maximum * ratio))
 
-        # 初始化精靈組
-        self.obstacles = pygame.sprite.Group()
-        self.bricks = pygame.sprite.Group()
-        self.steels = pygame.sprite.Group()
-        self.bushes = pygame.sprite.Group()
-        self.slow_zones = pygame.sprite.Group()
+    def _safe_zone_bounds(self) -> Tuple[int, int, int, int]:
+        """
+        計算玩家安全區域的格子範圍
 
-        # 隨機生成障礙物、草叢與減速地帶
-        self._generate_random_obstacles()
-        self._generate_random_bushes()
-        self._generate_slow_zones()
+        安全區域固定位於地圖底部中央，預設尺寸的地圖對應 PLAYER_SPAWN_* 常數。
 
-    def _generate_random_obstacles(self) -> None:
+        返回：
+            Tuple[int, int, int, int] - (x_min, x_max, y_min, y_max) 格子座標（含端點）
+        """
+        offset_x = (self.width - self.MAP_WIDTH) * self.GRID_SIZE // 2
+        offset_y = (self.height - self.MAP_HEIGHT) * self.GRID_SIZE
+        return (
+            (self.PLAYER_SPAWN_X_MIN + offset_x) // self.GRID_SIZE,
+            (self.PLAYER_SPAWN_X_MAX + offset_x) // self.GRID_SIZE + 1,
+            (self.PLAYER_SPAWN_Y_MIN + offset_y) // self.GRID_SIZE,
+            (self.PLAYER_SPAWN_Y_MAX + offset_y) // self.GRID_SIZE + 1,
+        )
+
+    def _generate_random_obstacles(self, chunk: Chunk, rng: random.Random) -> None:
         """
-        隨機生成地圖上的障礙物
+        隨機生成區塊內的障礙物
 
-        - 隨機選擇 OBSTACLE_MIN 到 OBSTACLE_MAX 個格子
+        - 隨機選擇 OBSTACLE_MIN 到 OBSTACLE_MAX 個格子（依區塊面積等比例放大）
         - 避免在玩家起始區域放置障礙物
         - 創建主要的水平和垂直通道，確保坦克可以通行
         - 隨機決定每個障礙物是磚塊還是鋼塊
-        """
-        # 計算玩家安全區域的格子範圍
-        safe_zone_grid_x_min = self.PLAYER_SPAWN_X_MIN // self.GRID_SIZE
-        safe_zone_grid_x_max = (self.PLAYER_SPAWN_X_MAX // self.GRID_SIZE) + 1
-        safe_zone_grid_y_min = self.PLAYER_SPAWN_Y_MIN // self.GRID_SIZE
-        safe_zone_grid_y_max = (self.PLAYER_SPAWN_Y_MAX // self.GRID_SIZE) + 1
 
-        # 創建一個 2D 數組標記哪些位置已經被佔用
-        occupied = [
-            [False for _ in range(self.MAP_WIDTH)] for _ in range(self.MAP_HEIGHT)
-        ]
+        以背景格子（Poisson-disk 方式）維持障礙物間距：每放置一個障礙物，
+        就把周圍 OBSTACLE_CLEARANCE 格標記為不可放置，每個候選位置只需 O(1) 檢查。
+        區塊之間相鄰的邊保留一格，兩側的障礙物因此仍維持相同的間距。
 
-        # 標記玩家安全區域為已佔用（不放置障礙物）
-        for grid_y in range(safe_zone_grid_y_min, safe_zone_grid_y_max + 1):
-            for grid_x in range(safe_zone_grid_x_min, safe_zone_grid_x_max + 1):
-                if 0 <= grid_y < self.MAP_HEIGHT and 0 <= grid_x < self.MAP_WIDTH:
-                    occupied[grid_y][grid_x] = True
+        參數：
+            chunk: Chunk - 要生成的區塊
+            rng: random.Random - 區塊的亂數產生器
+        """
+        width = chunk.width
+        height = chunk.height
+        grid_x0 = chunk.grid_x
+        grid_y0 = chunk.grid_y
+
+        # 背景格子：標記哪些位置不可放置障礙物（區塊內座標）
+        blocked = bytearray(width * height)
+
+        # 標記玩家安全區域為不可放置
+        x_min, x_max, y_min, y_max = self._safe_zone_bounds()
+        for grid_y in range(
+            max(y_min, grid_y0), min(y_max, grid_y0 + height - 1) + 1
+        ):
+            for grid_x in range(
+                max(x_min, grid_x0), min(x_max, grid_x0 + width - 1) + 1
+            ):
+                blocked[(grid_y - grid_y0) * width + grid_x - grid_x0] = 1
 
         # 創建主要通道（確保坦克可以通行）
         # 水平通道
-        for grid_x in range(self.MAP_WIDTH):
-            occupied[7][grid_x] = True  # 中間水平通道
+        channel_y = self.height // 2 - grid_y0
+        if 0 <= channel_y < height:
+            for local_x in range(width):
+                blocked[channel_y * width + local_x] = 1
 
         # 垂直通道
-        for grid_y in range(self.MAP_HEIGHT):
-            occupied[grid_y][10] = True  # 左側垂直通道
+        channel_x = self.width // 2 - grid_x0
+        if 0 <= channel_x < width:
+            for local_y in range(height):
+                blocked[local_y * width + channel_x] = 1
+
+        # 與相鄰區塊交界的邊保留一格
+        if grid_x0 > 0:
+            for local_y in range(height):
+                blocked[local_y * width] = 1
+        if grid_x0 + width < self.width:
+            for local_y in range(height):
+                blocked[local_y * width + width - 1] = 1
+        if grid_y0 > 0:
+            for local_x in range(width):
+                blocked[local_x] = 1
+        if grid_y0 + height < self.height:
+            for local_x in range(width):
+                blocked[(height - 1) * width + local_x] = 1
 
         # 生成有效位置列表
-        available_positions = []
-        for grid_y in range(self.MAP_HEIGHT):
-            for grid_x in range(self.MAP_WIDTH):
-                if not occupied[grid_y][grid_x]:
-                    available_positions.append((grid_x, grid_y))
+        available_positions = [
+            (local_x, local_y)
+            for local_y in range(height)
+            for local_x in range(width)
+            if not blocked[local_y * width + local_x]
+        ]
 
         # 隨機選擇障礙物數量
-        num_obstacles = random.randint(self.OBSTACLE_MIN, self.OBSTACLE_MAX)
+        num_obstacles = self._scaled_count(
+            chunk, rng, self.OBSTACLE_MIN, self.OBSTACLE_MAX
+        )
 
         # 從可用位置中篩選，確保障礙物間距足夠（避免通道過窄）
-        random.shuffle(available_positions)
+        rng.shuffle(available_positions)
         selected_positions: list[tuple[int, int]] = []
-
-        for grid_x, grid_y in available_positions:
-            can_place = True
-            for selected_x, selected_y in selected_positions:
-                if (
-                    abs(grid_x - selected_x) <= self.OBSTACLE_CLEARANCE
-                    and abs(grid_y - selected_y) <= self.OBSTACLE_CLEARANCE
+        clearance = self.OBSTACLE_CLEARANCE
+
+        for local_x, local_y in available_positions:
+            if len(selected_positions) >= num_obstacles:
+                break
+            if blocked[local_y * width + local_x]:
+                continue
+
+            selected_positions.append((local_x, local_y))
+            # 標記間距範圍內的格子為不可放置
+            for near_y in range(
+                max(local_y - clearance, 0), min(local_y + clearance, height - 1) + 1
+            ):
+                row = near_y * width
+                for near_x in range(
+                    max(local_x - clearance, 0), min(local_x + clearance, width - 1) + 1
                 ):
-                    can_place = False
-                    break
-
-            if can_place:
-                selected_positions.append((grid_x, grid_y))
-                if len(selected_positions) >= num_obstacles:
-                    break
-
-        # 建立障礙物，並標記為已佔用
-        for grid_x, grid_y in selected_positions:
-            # 隨機決定是磚塊還是鋼塊（60% 磚塊，40% 鋼塊）
-            if random.random() < 0.6:
-                obstacle = Brick(grid_x, grid_y)
-                self.bricks.add(obstacle)
-            else:
-                obstacle = Steel(grid_x, grid_y)
-                self.steels.add(obstacle)
+                    blocked[row + near_x] = 1
 
-            self.obstacles.add(obstacle)
-            occupied[grid_y][grid_x] = True
+        # 建立障礙物
+        for local_x, local_y in selected_positions:
+            # 隨機決定是磚塊還是鋼塊（預設 60% 磚塊，40% 鋼塊）
+            if rng.random() < self.BRICK_RATIO:
+                tile = self.TILE_BRICK
+            else:
+                tile = self.TILE_STEEL
+            chunk.tiles[local_y * width + local_x] |= tile
 
-    def _generate_random_bushes(self) -> None:
+    def _collect_free_positions(self, chunk: Chunk) -> List[Tuple[int, int]]:
         """
-        隨機生成地圖上的草叢
+        收集草叢與減速地帶可放置的位置（排除玩家安全區域和障礙物位置）
 
-        - 隨機選擇 10-20 個格子放置草叢
-        - 避免在玩家起始區域和已有障礙物的位置放置草叢
-        - 草叢不會阻擋坦克，但會遮擋坦克
+        參數：
+            chunk: Chunk - 要生成的區塊
+
+        返回：
+            List[Tuple[int, int]] - 依列優先排列的區塊內 (local_x, local_y) 位置列表
         """
-        # 計算玩家安全區域的格子範圍
-        safe_zone_grid_x_min = self.PLAYER_SPAWN_X_MIN // self.GRID_SIZE
-        safe_zone_grid_x_max = (self.PLAYER_SPAWN_X_MAX // self.GRID_SIZE) + 1
-        safe_zone_grid_y_min = self.PLAYER_SPAWN_Y_MIN // self.GRID_SIZE
-        safe_zone_grid_y_max = (self.PLAYER_SPAWN_Y_MAX // self.GRID_SIZE) + 1
+        x_min, x_max, y_min, y_max = self._safe_zone_bounds()
+        width = chunk.width
+        tiles = chunk.tiles
+        return [
+            (local_x, local_y)
+            for local_y in range(chunk.height)
+            for local_x in range(width)
+            if not (
+                x_min <= chunk.grid_x + local_x <= x_max
+                and y_min <= chunk.grid_y + local_y <= y_max
+            )
+            and not tiles[local_y * width + local_x] & self.TILE_SOLID
+        ]
 
-        # 取得已有障礙物的位置
-        obstacle_positions = {
-            (obstacle.x // self.GRID_SIZE, obstacle.y // self.GRID_SIZE)
-            for obstacle in self.obstacles
-        }
+    def _generate_random_bushes(
+        self,
+        chunk: Chunk,
+        rng: random.Random,
+        available_positions: List[Tuple[int, int]],
+    ) -> None:
+        """
+        隨機生成區塊內的草叢
 
-        # 生成有效位置列表（排除玩家安全區域和障礙物位置）
-        available_positions = []
-        for grid_y in range(self.MAP_HEIGHT):
-            for grid_x in range(self.MAP_WIDTH):
-                # 檢查是否在玩家安全區域內
-                if not (
-                    safe_zone_grid_x_min <= grid_x <= safe_zone_grid_x_max
-                    and safe_zone_grid_y_min <= grid_y <= safe_zone_grid_y_max
-                ):
-                    # 檢查是否已有障礙物
-                    if (grid_x, grid_y) not in obstacle_positions:
-                        available_positions.append((grid_x, grid_y))
+        - 隨機選擇 10-20 個格子放置草叢（依區塊面積等比例放大）
+        - 避免在玩家起始區域和已有障礙物的位置放置草叢
+        - 草叢不會阻擋坦克，但會遮擋坦克
 
+        參數：
+            chunk: Chunk - 要生成的區塊
+            rng: random.Random - 區塊的亂數產生器
+            available_positions: 可放置的位置列表
+        """
         # 隨機選擇草叢數量（10-20 個）
-        num_bushes = random.randint(10, 20)
+        num_bushes = self._scaled_count(chunk, rng, 10, 20)
 
         # 從可用位置中隨機選擇
         if len(available_positions) >= num_bushes:
-            selected_positions = random.sample(available_positions, num_bushes)
+            selected_positions = rng.sample(available_positions, num_bushes)
         else:
             # 如果可用位置不足，使用全部可用位置
             selected_positions = available_positions
 
-        # 建立草叢
-        for grid_x, grid_y in selected_positions:
-            bush = Bush(grid_x, grid_y)
-            self.bushes.add(bush)
+        for local_x, local_y in selected_positions:
+            chunk.tiles[local_y * chunk.width + local_x] |= self.TILE_BUSH
 
-    def _generate_slow_zones(self) -> None:
+    def _generate_slow_zones(
+        self,
+        chunk: Chunk,
+        rng: random.Random,
+        available_positions: List[Tuple[int, int]],
+    ) -> None:
         """
-        隨機生成地圖上的減速地帶
+        隨機生成區塊內的減速地帶
 
-        - 隨機選擇 2-3 個格子放置 SlowZone
+        - 隨機選擇 2-3 個格子放置 SlowZone（依區塊面積等比例放大）
         - 避免在玩家起始區域和已有障礙物的位置放置
         - SlowZone 不阻擋坦克，但進入後減速
-        """
-        safe_zone_grid_x_min = self.PLAYER_SPAWN_X_MIN // self.GRID_SIZE
-        safe_zone_grid_x_max = (self.PLAYER_SPAWN_X_MAX // self.GRID_SIZE) + 1
-        safe_zone_grid_y_min = self.PLAYER_SPAWN_Y_MIN // self.GRID_SIZE
-        safe_zone_grid_y_max = (self.PLAYER_SPAWN_Y_MAX // self.GRID_SIZE) + 1
 
-        obstacle_positions = {
-            (obstacle.x // self.GRID_SIZE, obstacle.y // self.GRID_SIZE)
-            for obstacle in self.obstacles
-        }
-
-        available_positions = []
-        for grid_y in range(self.MAP_HEIGHT):
-            for grid_x in range(self.MAP_WIDTH):
-                if not (
-                    safe_zone_grid_x_min <= grid_x <= safe_zone_grid_x_max
-                    and safe_zone_grid_y_min <= grid_y <= safe_zone_grid_y_max
-                ):
-                    if (grid_x, grid_y) not in obstacle_positions:
-                        available_positions.append((grid_x, grid_y))
-
-        num_slow_zones = random.randint(2, 3)
+        參數：
+            chunk: Chunk - 要生成的區塊
+            rng: random.Random - 區塊的亂數產生器
+            available_positions: 可放置的位置列表
+        """
+        num_slow_zones = self._scaled_count(chunk, rng, 2, 3)
         if len(available_positions) >= num_slow_zones:
-            selected = random.sample(available_positions, num_slow_zones)
+            selected = rng.sample(available_positions, num_slow_zones)
         else:
             selected = available_positions
 
-        for grid_x, grid_y in selected:
-            slow_zone = SlowZone(grid_x, grid_y)
-            self.slow_zones.add(slow_zone)
+        for local_x, local_y in selected:
+            chunk.tiles[local_y * chunk.width + local_x] |= self.TILE_SLOW
+
+    # ------------------------------------------------------------------
+    # 繪製
+    # ------------------------------------------------------------------
 
-    @staticmethod
-    def _load_image(filename: str) -> Optional[pygame.Surface]:
+    def _load_image(self, filename: str) -> Optional[pygame.Surface]:
         """
-        載入圖像檔案
+        載入並縮放為格子大小的圖像檔案
+
+        圖像透過共用快取載入，重新建立地圖時不會再次讀檔。
 
         參數：
             filename: 圖像檔案名稱
@@ -445,49 +619,650 @@ class Map:
         返回：
             pygame.Surface - 載入的圖像（成功時），None（失敗時）
         """
-        try:
-            image_path = Map.ASSETS_DIR / filename
-            image = pygame.image.load(str(image_path))
+        return SpriteCache.load(filename, (self.GRID_SIZE, self.GRID_SIZE))
+
+    @property
+    def pixel_width(self) -> int:
+        """世界寬度（像素）"""
+        return self.width * self.GRID_SIZE
+
+    @property
+    def pixel_height(self) -> int:
+        """世界高度（像素）"""
+        return self.height * self.GRID_SIZE
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """
+        世界範圍
+
+        返回：
+            pygame.Rect - 以 (0, 0) 為左上角、地圖像素大小的矩形
+        """
+        return pygame.Rect(0, 0, self.pixel_width, self.pixel_height)
+
+    def _fallback_tile(self, color: Tuple[int, int, int]) -> pygame.Surface:
+        """
+        取得圖像載入失敗時使用的純色格子圖像
+
+        參數：
+            color: 格子顏色 (RGB)
+
+        返回：
+            pygame.Surface - 共用快取中的格子大小純色圖像
+        """
+
+        def render() -> pygame.Surface:
+            image = pygame.Surface((self.GRID_SIZE, self.GRID_SIZE))
+            image.fill(color)
             return image
-        except (FileNotFoundError, pygame.error):
-            return None
 
-    def draw(self, surface: pygame.Surface) -> None:
+        return SpriteCache.get_or_create(("tile", color), render)
+
+    def _chunk_surface(self, chunk: Chunk) -> pygame.Surface:
+        """
+        取得區塊的地形層，第一次存取時才繪製
+
+        參數：
+            chunk: Chunk - 已載入的區塊
+
+        返回：
+            pygame.Surface - 該區塊的地形層（地圖邊緣的區塊可能較小）
+        """
+        if chunk.surface is None:
+            before = chunk.nbytes()
+            chunk.surface = self._build_chunk_surface(chunk)
+            self.memory_usage += chunk.nbytes() - before
+            self._enforce_budget()
+        return chunk.surface
+
+    def _build_chunk_surface(self, chunk: Chunk) -> pygame.Surface:
+        """
+        依地形格子將區塊內的減速地帶與障礙物預先繪製到單一 Surface
+
+        參數：
+            chunk: Chunk - 已載入的區塊
+
+        返回：
+            pygame.Surface - 該區塊的地形層
+        """
+        grid_size = self.GRID_SIZE
+        surface = pygame.Surface((chunk.width * grid_size, chunk.height * grid_size))
+        try:
+            # 轉換為螢幕像素格式以加速繪製（需要已建立顯示視窗）
+            surface = surface.convert()
+        except pygame.error:
+            pass
+
+        surface.fill(self.BACKGROUND_COLOR)
+        blits = []
+        for local_y in range(chunk.height):
+            for local_x in range(chunk.width):
+                tile = chunk.tiles[local_y * chunk.width + local_x]
+                position = (local_x * grid_size, local_y * grid_size)
+                blits.extend((image, position) for image in self._tile_layers(tile))
+        surface.blits(blits, doreturn=False)
+        return surface
+
+    def _tile_layers(self, tile: int) -> List[pygame.Surface]:
+        """
+        取得格子在地形層中由下而上的圖像（減速地帶在下，障礙物在上）
+
+        參數：
+            tile: 格子的地形代碼
+
+        返回：
+            List[pygame.Surface] - 要依序繪製的圖像，空格子為空列表
+        """
+        layers = []
+        if tile & self.TILE_SLOW:
+            layers.append(self._tile_images[self.TILE_SLOW])
+        if tile & self.TILE_BRICK:
+            layers.append(self._tile_images[self.TILE_BRICK])
+        elif tile & self.TILE_STEEL:
+            layers.append(self._tile_images[self.TILE_STEEL])
+        return layers
+
+    def _redraw_tile(self, chunk: Chunk, grid_x: int, grid_y: int) -> None:
+        """
+        重新繪製地形層中的單一格子
+
+        參數：
+            chunk: Chunk - 格子所在的區塊
+            grid_x: 格子X座標
+            grid_y: 格子Y座標
+        """
+        if chunk.surface is None:
+            # 地形層尚未建立，建立時就會反映最新狀態
+            return
+        local_x = grid_x - chunk.grid_x
+        local_y = grid_y - chunk.grid_y
+        local = pygame.Rect(
+            local_x * self.GRID_SIZE,
+            local_y * self.GRID_SIZE,
+            self.GRID_SIZE,
+            self.GRID_SIZE,
+        )
+        chunk.surface.fill(self.BACKGROUND_COLOR, local)
+        for image in self._tile_layers(chunk.tiles[local_y * chunk.width + local_x]):
+            chunk.surface.blit(image, local)
+
+    def _chunks_overlapping(self, area: pygame.Rect) -> Iterator[Chunk]:
+        """
+        列出與世界範圍重疊的區塊（必要時載入）
+
+        參數：
+            area: pygame.Rect - 世界座標的範圍（已限制在地圖內）
+
+        返回：
+            Iterator[Chunk] - 重疊的區塊
+        """
+        chunk_pixels = self.CHUNK_SIZE * self.GRID_SIZE
+        for chunk_y in range(
+            area.top // chunk_pixels, (area.bottom - 1) // chunk_pixels + 1
+        ):
+            for chunk_x in range(
+                area.left // chunk_pixels, (area.right - 1) // chunk_pixels + 1
+            ):
+                yield self._chunk(chunk_x, chunk_y)
+
+    def _chunk_bushes(self, chunk: Chunk) -> List[pygame.Rect]:
+        """
+        取得區塊內所有草叢的矩形，第一次存取時從地形格子收集
+
+        參數：
+            chunk: Chunk - 已載入的區塊
+
+        返回：
+            List[pygame.Rect] - 草叢格子的世界座標矩形
+        """
+        if chunk.bush_rects is None:
+            grid_size = self.GRID_SIZE
+            width = chunk.width
+            tiles = chunk.tiles
+            chunk.bush_rects = [
+                pygame.Rect(
+                    (chunk.grid_x + local_x) * grid_size,
+                    (chunk.grid_y + local_y) * grid_size,
+                    grid_size,
+                    grid_size,
+                )
+                for local_y in range(chunk.height)
+                for local_x in range(width)
+                if tiles[local_y * width + local_x] & self.TILE_BUSH
+            ]
+        return chunk.bush_rects
+
+    def draw(
+        self,
+        surface: pygame.Surface,
+        area: Optional[pygame.Rect] = None,
+        offset: Tuple[int, int] = (0, 0),
+    ) -> None:
         """
-        繪製地圖上的所有障礙物
+        繪製地形層（減速地帶、磚塊和鋼塊）
+
+        地形層以區塊預先繪製，只 blit 與繪製範圍重疊的區塊，
+        因此繪製成本取決於可視範圍大小而非地圖大小。
 
         參數：
             surface: pygame.Surface - 目標繪製表面（通常是遊戲螢幕）
+            area: 要繪製的世界範圍，None 表示整張地圖
+            offset: 世界座標轉換為螢幕座標時要減去的位移（攝影機位置）
+        """
+        world = self.rect
+        if area is None:
+            area = world
+        offset_x, offset_y = offset
+        if not world.contains(area):
+            # 地圖外的區域以底色填滿
+            surface.fill(self.BACKGROUND_COLOR, area.move(-offset_x, -offset_y))
+
+        visible = area.clip(world)
+        if not visible:
+            return
+        grid_size = self.GRID_SIZE
+        for chunk in self._chunks_overlapping(visible):
+            chunk_surface = self._chunk_surface(chunk)
+            chunk_rect = chunk_surface.get_rect(
+                topleft=(chunk.grid_x * grid_size, chunk.grid_y * grid_size)
+            )
+            clip = visible.clip(chunk_rect)
+            surface.blit(
+                chunk_surface,
+                (clip.x - offset_x, clip.y - offset_y),
+                clip.move(-chunk_rect.x, -chunk_rect.y),
+            )
+
+    def draw_bushes(
+        self,
+        surface: pygame.Surface,
+        areas: Sequence[pygame.Rect],
+        offset: Tuple[int, int] = (0, 0),
+    ) -> None:
+        """
+        繪製與指定範圍重疊的草叢（在最上層，遮擋坦克）
+
+        只檢查範圍所在區塊內的草叢，每個草叢最多繪製一次。
+
+        參數：
+            surface: pygame.Surface - 目標繪製表面
+            areas: 要繪製的世界範圍（例如可視範圍或變動區域）
+            offset: 世界座標轉換為螢幕座標時要減去的位移（攝影機位置）
+        """
+        image = self._tile_images[self.TILE_BUSH]
+        offset_x, offset_y = offset
+        world = self.rect
+        drawn = set()
+        blits = []
+        for area in areas:
+            visible = area.clip(world)
+            if not visible:
+                continue
+            for chunk in self._chunks_overlapping(visible):
+                rects = self._chunk_bushes(chunk)
+                for index in visible.collidelistall(rects):
+                    position = (rects[index].x - offset_x, rects[index].y - offset_y)
+                    if position not in drawn:
+                        drawn.add(position)
+                        blits.append((image, position))
+        surface.fblits(blits)
+
+    def pop_dirty_rects(self) -> List[pygame.Rect]:
+        """
+        取出並清空地形層的變動區域
+
+        返回：
+            List[pygame.Rect] - 上次取出後地形層有變動的區域
+        """
+        rects = self.dirty_rects
+        self.dirty_rects = []
+        return rects
+
+    # ------------------------------------------------------------------
+    # 地形查詢
+    # ------------------------------------------------------------------
+
+    def in_bounds(self, grid_x: int, grid_y: int) -> bool:
+        """
+        檢查格子座標是否在地圖內
+
+        參數：
+            grid_x: 格子X座標
+            grid_y: 格子Y座標
+
+        返回：
+            bool - True 表示在地圖內
+        """
+        return 0 <= grid_x < self.width and 0 <= grid_y < self.height
+
+    def tile_code(self, grid_x: int, grid_y: int) -> int:
+        """
+        取得格子的地形代碼（必要時載入所在區塊）
+
+        參數：
+            grid_x: 格子X座標
+            grid_y: 格子Y座標
+
+        返回：
+            int - TILE_* 旗標組合，地圖外視為 TILE_STEEL
+        """
+        if not (0 <= grid_x < self.width and 0 <= grid_y < self.height):
+            return self.TILE_STEEL
+        size = self.CHUNK_SIZE
+        chunk = self._chunk(grid_x // size, grid_y // size)
+        return chunk.tiles[
+            (grid_y - chunk.grid_y) * chunk.width + grid_x - chunk.grid_x
+        ]
+
+    def tile_row(self, grid_y: int, start: int, end: int) -> bytearray:
+        """
+        取得一列中連續格子的地形代碼（逐區塊複製，不逐格查詢）
+
+        參數：
+            grid_y: 格子Y座標（必須在地圖內）
+            start: 起始格子X座標（包含，必須在地圖內）
+            end: 結束格子X座標（不包含，不可超過地圖寬度）
+
+        返回：
+            bytearray - 依X座標排列的 TILE_* 旗標組合
+        """
+        size = self.CHUNK_SIZE
+        chunk_y = grid_y // size
+        row = bytearray()
+        grid_x = start
+        while grid_x < end:
+            chunk = self._chunk(grid_x // size, chunk_y)
+            offset = (grid_y - chunk.grid_y) * chunk.width - chunk.grid_x
+            stop = min(end, chunk.grid_x + chunk.width)
+            row += chunk.tiles[offset + grid_x : offset + stop]
+            grid_x = stop
+        return row
+
+    def tile_column(self, grid_x: int, start: int, end: int) -> bytearray:
+        """
+        取得一欄中連續格子的地形代碼（逐區塊以步長切片複製）
+
+        參數：
+            grid_x: 格子X座標（必須在地圖內）
+            start: 起始格子Y座標（包含，必須在地圖內）
+            end: 結束格子Y座標（不包含，不可超過地圖高度）
+
+        返回：
+            bytearray - 依Y座標排列的 TILE_* 旗標組合
+        """
+        size = self.CHUNK_SIZE
+        chunk_x = grid_x // size
+        column = bytearray()
+        grid_y = start
+        while grid_y < end:
+            chunk = self._chunk(chunk_x, grid_y // size)
+            stop = min(end, chunk.grid_y + chunk.height)
+            first = (grid_y - chunk.grid_y) * chunk.width + grid_x - chunk.grid_x
+            last = first + (stop - grid_y - 1) * chunk.width
+            column += chunk.tiles[first : last + 1 : chunk.width]
+            grid_y = stop
+        return column
+
+    def tile_at(self, px: float, py: float) -> int:
+        """
+        取得像素座標所在格子的地形代碼
+
+        參數：
+            px: 像素X座標
+            py: 像素Y座標
+
+        返回：
+            int - TILE_* 旗標組合，地圖外視為 TILE_STEEL
+        """
+        return self.tile_code(int(px) // self.GRID_SIZE, int(py) // self.GRID_SIZE)
+
+    def is_solid(self, grid_x: int, grid_y: int) -> bool:
+        """
+        檢查格子是否阻擋坦克（磚塊、鋼塊或地圖外）
+
+        參數：
+            grid_x: 格子X座標
+            grid_y: 格子Y座標
+
+        返回：
+            bool - True 表示不可通行
+        """
+        return bool(self.tile_code(grid_x, grid_y) & self.TILE_SOLID)
+
+    def tiles_overlapping(self, rect: pygame.Rect) -> Iterator[Tuple[int, int]]:
+        """
+        列出與矩形重疊、且位於地圖內的所有格子座標
+
+        參數：
+            rect: pygame.Rect - 查詢的矩形
+
+        返回：
+            Iterator[Tuple[int, int]] - (grid_x, grid_y) 格子座標
+        """
+        grid_size = self.GRID_SIZE
+        grid_x_min = max(rect.left // grid_size, 0)
+        grid_x_max = min((rect.right - 1) // grid_size, self.width - 1)
+        grid_y_min = max(rect.top // grid_size, 0)
+        grid_y_max = min((rect.bottom - 1) // grid_size, self.height - 1)
+        for grid_y in range(grid_y_min, grid_y_max + 1):
+            for grid_x in range(grid_x_min, grid_x_max + 1):
+                yield grid_x, grid_y
+
+    def _overlaps_tile(self, rect: pygame.Rect, mask: int) -> bool:
+        """
+        檢查矩形覆蓋的格子中是否有符合旗標的格子
+
+        參數：
+            rect: pygame.Rect - 查詢的矩形
+            mask: int - TILE_* 旗標
+
+        返回：
+            bool - True 表示至少一格符合
+        """
+        for grid_x, grid_y in self.tiles_overlapping(rect):
+            if self.tile_code(grid_x, grid_y) & mask:
+                return True
+        return False
+
+    def get_obstacles_near(self, rect: pygame.Rect) -> List[Tuple[int, int]]:
+        """
+        取得與矩形重疊的障礙物格子
+
+        只查詢矩形覆蓋的格子（40 像素坦克最多 4 格），與障礙物總數無關。
+
+        參數：
+            rect: pygame.Rect - 查詢的矩形
+
+        返回：
+            List[Tuple[int, int]] - 與矩形重疊的磚塊或鋼塊格子座標
+        """
+        return [
+            (grid_x, grid_y)
+            for grid_x, grid_y in self.tiles_overlapping(rect)
+            if self.tile_code(grid_x, grid_y) & self.TILE_SOLID
+        ]
+
+    def collides_with_obstacle(self, rect: pygame.Rect) -> bool:
+        """
+        檢查矩形是否與任何障礙物碰撞
+
+        障礙物佔滿整個格子，因此只要覆蓋的格子中有磚塊或鋼塊即為碰撞。
+
+        參數：
+            rect: pygame.Rect - 查詢的矩形
+
+        返回：
+            bool - True 表示發生碰撞
+        """
+        return self._overlaps_tile(rect, self.TILE_SOLID)
+
+    def _tile_exits(self, grid_x: int, grid_y: int) -> int:
+        """
+        計算格子的通行方向（逐一查詢相鄰格子）
+
+        參數：
+            grid_x: 格子X座標
+            grid_y: 格子Y座標
+
+        返回：
+            int - EXIT_* 位元組合，格子本身不可通行時為 0
+        """
+        if self.is_solid(grid_x, grid_y):
+            return 0
+        exits = 0
+        if not self.is_solid(grid_x, grid_y - 1):
+            exits |= self.EXIT_UP
+        if not self.is_solid(grid_x, grid_y + 1):
+            exits |= self.EXIT_DOWN
+        if not self.is_solid(grid_x - 1, grid_y):
+            exits |= self.EXIT_LEFT
+        if not self.is_solid(grid_x + 1, grid_y):
+            exits |= self.EXIT_RIGHT
+        return exits
+
+    def _chunk_exits(self, chunk: Chunk) -> bytearray:
+        """
+        取得區塊的通行方向表，第一次查詢時計算
+
+        參數：
+            chunk: Chunk - 已載入的區塊
+
+        返回：
+            bytearray - 依列優先排列的 EXIT_* 位元組合
         """
-        # 先繪製減速地帶（底層），再繪製障礙物
-        self.slow_zones.draw(surface)
-        self.obstacles.draw(surface)
+        if chunk.exits is None:
+            width = chunk.width
+            height = chunk.height
+            solid = self.TILE_SOLID
+            # 四周多一圈的可通行旗標（邊緣查詢相鄰區塊，地圖外不可通行）
+            passable = bytearray((width + 2) * (height + 2))
+            stride = width + 2
+            for y in range(-1, height + 1):
+                grid_y = chunk.grid_y + y
+                for x in range(-1, width + 1):
+                    if 0 <= x < width and 0 <= y < height:
+                        code = chunk.tiles[y * width + x]
+                    else:
+                        code = self.tile_code(chunk.grid_x + x, grid_y)
+                    passable[(y + 1) * stride + x + 1] = not code & solid
+            exits = bytearray(width * height)
+            for y in range(height):
+                for x in range(width):
+                    center = (y + 1) * stride + x + 1
+                    if not passable[center]:
+                        continue
+                    exits[y * width + x] = (
+                        (self.EXIT_UP if passable[center - stride] else 0)
+                        | (self.EXIT_DOWN if passable[center + stride] else 0)
+                        | (self.EXIT_LEFT if passable[center - 1] else 0)
+                        | (self.EXIT_RIGHT if passable[center + 1] else 0)
+                    )
+            # 讀取相鄰區塊可能使此區塊因超出記憶體預算被卸載，此時不快取
+            if self._chunks.get((chunk.chunk_x, chunk.chunk_y)) is not chunk:
+                return exits
+            chunk.exits = exits
+            self.memory_usage += len(exits)
+        return chunk.exits
+
+    def _refresh_exits(self, grid_x: int, grid_y: int) -> None:
+        """
+        重新計算單一格子的通行方向（只更新已計算通行方向表的已載入區塊）
 
-    def get_obstacles_rects(self) -> List[pygame.Rect]:
+        參數：
+            grid_x: 格子X座標
+            grid_y: 格子Y座標
+        """
+        if not self.in_bounds(grid_x, grid_y):
+            return
+        size = self.CHUNK_SIZE
+        chunk = self._chunks.get((grid_x // size, grid_y // size))
+        if chunk is None or chunk.exits is None:
+            return
+        index = (grid_y - chunk.grid_y) * chunk.width + grid_x - chunk.grid_x
+        chunk.exits[index] = self._tile_exits(grid_x, grid_y)
+
+    def exits(self, grid_x: int, grid_y: int) -> int:
         """
-        取得所有障礙物的碰撞矩形
+        查詢格子的通行方向：坦克大小的車身位於此格時可以往哪些方向的相鄰格子移動
+
+        參數：
+            grid_x: 格子X座標
+            grid_y: 格子Y座標
 
         返回：
-            List[pygame.Rect] - 所有障礙物的矩形列表
+            int - EXIT_* 位元組合，格子不可通行或位於地圖外時為 0
         """
-        return [obstacle.rect for obstacle in self.obstacles]
+        if not (0 <= grid_x < self.width and 0 <= grid_y < self.height):
+            return 0
+        size = self.CHUNK_SIZE
+        chunk = self._chunk(grid_x // size, grid_y // size)
+        return self._chunk_exits(chunk)[
+            (grid_y - chunk.grid_y) * chunk.width + grid_x - chunk.grid_x
+        ]
+
+    def can_shift(self, rect: pygame.Rect, dx: int, dy: int) -> bool:
+        """
+        檢查目前不與障礙物重疊的矩形沿單一軸位移後是否仍可通行
+
+        位移不超過一格時，矩形只可能進入前方新的一列（或一欄）格子，
+        因此只需查詢目前最前方那一列格子的通行方向表，與障礙物數量無關。
+        地圖邊界外的格子不可通行，結果與 collides_with_obstacle 加上邊界檢查相同。
+
+        參數：
+            rect: pygame.Rect - 目前的矩形（不可與障礙物重疊）
+            dx: 水平位移（像素，與 dy 至少一個為 0，絕對值不超過 GRID_SIZE）
+            dy: 垂直位移（像素）
 
-    def get_slow_zone_rects(self) -> List[pygame.Rect]:
+        返回：
+            bool - True 表示位移後不會碰撞
+        """
+        grid_size = self.GRID_SIZE
+        if dy:
+            if dy < 0:
+                edge = rect.top // grid_size
+                if (rect.top + dy) // grid_size == edge:
+                    return True
+                bit = self.EXIT_UP
+            else:
+                edge = (rect.bottom - 1) // grid_size
+                if (rect.bottom - 1 + dy) // grid_size == edge:
+                    return True
+                bit = self.EXIT_DOWN
+            first = rect.left // grid_size
+            last = (rect.right - 1) // grid_size
+            for grid_x in range(first, last + 1):
+                if not self.exits(grid_x, edge) & bit:
+                    return False
+            return True
+        if dx:
+            if dx < 0:
+                edge = rect.left // grid_size
+                if (rect.left + dx) // grid_size == edge:
+                    return True
+                bit = self.EXIT_LEFT
+            else:
+                edge = (rect.right - 1) // grid_size
+                if (rect.right - 1 + dx) // grid_size == edge:
+                    return True
+                bit = self.EXIT_RIGHT
+            first = rect.top // grid_size
+            last = (rect.bottom - 1) // grid_size
+            for grid_y in range(first, last + 1):
+                if not self.exits(edge, grid_y) & bit:
+                    return False
+        return True
+
+    def overlaps_slow_zone(self, rect: pygame.Rect) -> bool:
         """
-        取得所有減速地帶的碰撞矩形
+        檢查矩形是否與任何減速地帶重疊
+
+        參數：
+            rect: pygame.Rect - 查詢的矩形（通常是坦克）
 
         返回：
-            List[pygame.Rect] - 所有 SlowZone 的矩形列表
+            bool - True 表示位於減速地帶內
         """
-        return [sz.rect for sz in self.slow_zones]
+        return self._overlaps_tile(rect, self.TILE_SLOW)
 
-    def destroy_brick(self, brick: Brick) -> None:
+    def destroy_brick(self, grid_x: int, grid_y: int) -> bool:
         """
-        摧毀指定的磚塊
+        摧毀指定格子的磚塊
+
+        修改會標記在區塊上，區塊卸載後重新載入時仍保持摧毀狀態。
 
         參數：
-            brick: Brick - 要摧毀的磚塊物件
+            grid_x: 格子X座標
+            grid_y: 格子Y座標
+
+        返回：
+            bool - True 表示該格有磚塊並已摧毀
         """
-        if brick in self.bricks:
-            brick.destroy()
-            self.obstacles.remove(brick)
+        if not self.tile_code(grid_x, grid_y) & self.TILE_BRICK:
+            return False
+        size = self.CHUNK_SIZE
+        chunk = self._chunk(grid_x // size, grid_y // size)
+        index = (grid_y - chunk.grid_y) * chunk.width + grid_x - chunk.grid_x
+        chunk.tiles[index] &= ~self.TILE_BRICK & 0xFF
+        chunk.modified = True
+        self.revision += 1
+        # 只更新此格與四個相鄰格子的通行方向
+        for x, y in (
+            (grid_x, grid_y),
+            (grid_x, grid_y - 1),
+            (grid_x, grid_y + 1),
+            (grid_x - 1, grid_y),
+            (grid_x + 1, grid_y),
+        ):
+            self._refresh_exits(x, y)
+        # 只重繪被摧毀磚塊所在的格子
+        self._redraw_tile(chunk, grid_x, grid_y)
+        self.dirty_rects.append(
+            pygame.Rect(
+                grid_x * self.GRID_SIZE,
+                grid_y * self.GRID_SIZE,
+                self.GRID_SIZE,
+                self.GRID_SIZE,
+            )
+        )
+        return True
@@ -0,0 +1,168 @@
+"""
+髒矩形渲染模組
+
+只重繪本幀有變動的區域（移動的坦克、子彈、爆炸、被摧毀的磚塊與 HUD），
+並回傳這些區域供 pygame.display.update(rects) 使用，
+以降低低階機台每幀的 CPU 負擔。
+"""
+
+from typing import TYPE_CHECKING, List, Optional
+
+import pygame
+
+if TYPE_CHECKING:
+    from src.game import Game
+    from src.map import Map
+
+
+class DirtyRectRenderer:
+    """
+    髒矩形渲染器類別
+
+    記錄上一幀所有精靈與 HUD 的位置，每幀先用地形層覆蓋舊位置與新位置，
+    再依相同的圖層順序重繪：地形 → 精靈 → 爆炸 → 草叢 → HUD。
+    攝影機移動時以 Surface.scroll 捲動上一幀的畫面，只重繪新露出的邊緣，
+    因此地圖大於視窗時也不需要每幀完整重繪（但整個螢幕仍需更新）。
+
+    屬性：
+        game: Game - 要繪製的遊戲實例
+    """
+
+    def __init__(self, game: "Game") -> None:
+        """
+        初始化渲染器
+
+        參數：
+            game: Game - 要繪製的遊戲實例
+        """
+        self.game = game
+        self._map: Optional["Map"] = None
+        self._view: Optional[pygame.Rect] = None
+        self._previous_rects: List[pygame.Rect] = []
+        self._full_redraw = True
+
+    def invalidate(self) -> None:
+        """要求下一幀重繪整個畫面（例如畫面被其他內容覆蓋後）"""
+        self._full_redraw = True
+
+    def draw(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        """
+        繪製本幀並回傳需要更新到螢幕的區域
+
+        參數：
+            screen: pygame.Surface - 遊戲螢幕
+
+        返回：
+            List[pygame.Rect] - 本幀有變動的區域（螢幕座標）
+        """
+        game = self.game
+        camera = game.camera
+
+        view = camera.rect
+        previous_view = self._view
+        # 重新開始遊戲會換成新地圖、攝影機一次移動超過整個畫面，都需要整個畫面重繪
+        if (
+            self._full_redraw
+            or game.map is not self._map
+            or previous_view is None
+            or not view.colliderect(previous_view)
+        ):
+            game.draw(screen)
+            self._map = game.map
+            self._view = view.copy()
+            self._previous_rects = self._collect_sprite_rects() + self._hud_rects()
+            self._full_redraw = False
+            return [screen.get_rect()]
+
+        # 攝影機移動時捲動上一幀的畫面，新露出的邊緣當作變動區域
+        exposed: List[pygame.Rect] = []
+        scrolled = view != previous_view
+        if scrolled:
+            screen.scroll(previous_view.x - view.x, previous_view.y - view.y)
+            exposed = self._exposed_rects(previous_view, view)
+            self._view = view.copy()
+
+        # 變動區域皆為世界座標（上一幀的畫面已捲動到目前的攝影機位置）
+        offset = camera.offset
+        current_rects = self._collect_sprite_rects()
+        dirty_rects = (
+            self._previous_rects
+            + current_rects
+            + game.map.pop_dirty_rects()
+            + exposed
+        )
+
+        # 用地形層覆蓋所有變動區域（清除舊位置）
+        for rect in dirty_rects:
+            game.map.draw(screen, rect, offset)
+
+        # 重繪可視範圍內的精靈、子彈與爆炸效果（它們的位置都已包含在變動區域內）
+        game.draw_entities(screen)
+
+        # 只重繪與變動區域重疊的草叢（在最上層，遮擋坦克）
+        game.map.draw_bushes(screen, dirty_rects, offset)
+
+        # 繪製分數與生命值
+        game.hud.draw(screen, game.score, game.player.lives)
+
+        self._previous_rects = current_rects + self._hud_rects()
+
+        screen_rect = screen.get_rect()
+        if scrolled:
+            return [screen_rect]
+        updated = [camera.apply(rect).clip(screen_rect) for rect in dirty_rects]
+        updated = [rect for rect in updated if rect]
+        updated.extend(game.hud.rects)
+        return updated
+
+    @staticmethod
+    def _exposed_rects(
+        previous_view: pygame.Rect, view: pygame.Rect
+    ) -> List[pygame.Rect]:
+        """
+        計算攝影機移動後新露出的區域（不在上一幀可視範圍內的部分）
+
+        參數：
+            previous_view: pygame.Rect - 上一幀的可視範圍（世界座標）
+            view: pygame.Rect - 目前的可視範圍（世界座標）
+
+        返回：
+            List[pygame.Rect] - 左右與上下兩條邊緣（世界座標，沒有移動的方向不含）
+        """
+        overlap = view.clip(previous_view)
+        left, top, width, height = view
+        rects = []
+        if left < overlap.left:
+            rects.append(pygame.Rect(left, top, overlap.left - left, height))
+        elif overlap.right < view.right:
+            rects.append(
+                pygame.Rect(overlap.right, top, view.right - overlap.right, height)
+            )
+        if top < overlap.top:
+            rects.append(pygame.Rect(left, top, width, overlap.top - top))
+        elif overlap.bottom < view.bottom:
+            rects.append(
+                pygame.Rect(left, overlap.bottom, width, view.bottom - overlap.bottom)
+            )
+        return rects
+
+    def _hud_rects(self) -> List[pygame.Rect]:
+        """
+        取得 HUD 上次繪製的區域（換算為世界座標，下一幀用地形層覆蓋）
+
+        返回：
+            List[pygame.Rect] - HUD 區域的世界座標矩形
+        """
+        offset_x, offset_y = self.game.camera.offset
+        return [rect.move(offset_x, offset_y) for rect in self.game.hud.rects]
+
+    def _collect_sprite_rects(self) -> List[pygame.Rect]:
+        """
+        收集目前所有會移動或消失的精靈的位置
+
+        返回：
+            List[pygame.Rect] - 坦克與爆炸（皆在 all_sprites 內）以及子彈的矩形副本
+        """
+        rects = [sprite.rect.copy() for sprite in self.game.all_sprites]
+        rects.extend(self.game.bullets.get_rects())
+        return rects
@@ -0,0 +1,440 @@
+"""
+回放模組
+
+把一場對局記錄為種子加上每個模擬步的輸入：方向鍵狀態、射擊與重新開始，
+每一步壓縮成一個位元遮罩，連續相同的遮罩（例如按住方向鍵）以長度編碼儲存。
+錄製時每隔一段模擬時間保存一次完整的遊戲狀態（關鍵幀），
+跳轉到回放中任意時間點只需從最近的關鍵幀開始模擬，不必從第 0 步重跑。
+
+執行方式：
+    python main.py --record match.twr
+    python main.py --replay match.twr --seek 1200
+    python main.py --replay match.twr --headless
+"""
+
+import struct
+import time
+import zlib
+from bisect import bisect_right
+from itertools import accumulate
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+import pygame
+
+from src import headless, snapshot
+from src.game import Game
+from src.waves import Wave
+
+# 輸入遮罩的位元
+INPUT_UP = 1
+INPUT_DOWN = 2
+INPUT_LEFT = 4
+INPUT_RIGHT = 8
+INPUT_SHOOT = 16  # 這一步更新前玩家射擊
+INPUT_RESET = 32  # 這一步更新前重新開始遊戲
+
+# 方向鍵與遮罩位元的對應（PlayerTank.handle_input 讀取的按鍵）
+KEY_BITS = {
+    pygame.K_UP: INPUT_UP,
+    pygame.K_DOWN: INPUT_DOWN,
+    pygame.K_LEFT: INPUT_LEFT,
+    pygame.K_RIGHT: INPUT_RIGHT,
+}
+
+# 檔案格式：標頭、波次表、輸入段落（遮罩與長度）、關鍵幀索引（步數與長度）、關鍵幀資料
+MAGIC = b"TWREPLAY"
+VERSION = 4  # 2：關鍵幀改為二進位快照；3：加入敵人波次；4：記錄波次表
+HEADER = struct.Struct("<8sHQHIIIIII")
+# 波次：數量、間隔（秒），以及依 snapshot.ENEMY_TYPES 排列的類型權重
+WAVE = struct.Struct("<Id" + "d" * len(snapshot.ENEMY_TYPES))
+RUN = struct.Struct("<BH")  # 遮罩、連續步數
+KEYFRAME = struct.Struct("<II")  # 步數、資料長度
+MAX_RUN = 0xFFFF
+
+
+def encode_input(keys, shoot: bool = False, reset: bool = False) -> int:
+    """
+    將按鍵狀態與事件編碼為輸入遮罩
+
+    參數：
+        keys: pygame.key.get_pressed() 返回的按鍵狀態
+        shoot: 這一步更新前是否射擊
+        reset: 這一步更新前是否重新開始遊戲
+
+    返回：
+        int - 輸入遮罩
+    """
+    mask = 0
+    for key, bit in KEY_BITS.items():
+        if keys[key]:
+            mask |= bit
+    if shoot:
+        mask |= INPUT_SHOOT
+    if reset:
+        mask |= INPUT_RESET
+    return mask
+
+
+class ReplayInput:
+    """
+    由輸入遮罩還原的按鍵狀態
+
+    可當作 pygame.key.get_pressed() 的結果傳給 Game.update。
+    """
+
+    def __init__(self, mask: int) -> None:
+        self.mask = mask
+
+    def __getitem__(self, key: int) -> bool:
+        return bool(self.mask & KEY_BITS.get(key, 0))
+
+
+def apply_input(game: Game, mask: int) -> None:
+    """
+    以輸入遮罩推進遊戲一步（依序處理重新開始、射擊與更新）
+
+    參數：
+        game: Game - 要推進的遊戲
+        mask: int - 輸入遮罩
+    """
+    if mask & INPUT_RESET:
+        game.reset()
+    if mask & INPUT_SHOOT:
+        game.player_shoot()
+    game.update(ReplayInput(mask))
+
+
+def _encode_keyframe(game: Game) -> bytes:
+    """
+    將遊戲目前的完整狀態壓縮為關鍵幀資料
+
+    參數：
+        game: Game - 遊戲
+
+    返回：
+        bytes - 壓縮後的快照
+    """
+    return zlib.compress(snapshot.dumps(game))
+
+
+def _restore_keyframe(blob: bytes, game: Game) -> None:
+    """
+    將關鍵幀資料還原到遊戲中
+
+    參數：
+        blob: bytes - _encode_keyframe 的返回值
+        game: Game - 要還原的遊戲
+    """
+    snapshot.loads(zlib.decompress(blob), game)
+
+
+class Replay:
+    """
+    回放資料類別
+
+    屬性：
+        seed: int - 對局種子
+        tick_rate: int - 每秒模擬步數
+        map_width: int - 地圖寬度（格子數）
+        map_height: int - 地圖高度（格子數）
+        waves: List[Wave] - 對局的敵人波次表（空表示不啟用波次）
+        ticks: int - 總步數
+        runs: List[List[int]] - 輸入段落，每段為 [遮罩, 連續步數]
+        keyframes: List[Tuple[int, bytes]] - 關鍵幀（完成該步數後的狀態），依步數排列
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        tick_rate: int,
+        map_width: int,
+        map_height: int,
+        waves: Sequence[Wave] = (),
+    ) -> None:
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.map_width = map_width
+        self.map_height = map_height
+        self.waves = list(waves)
+        self.ticks = 0
+        self.runs: List[List[int]] = []
+        self.keyframes: List[Tuple[int, bytes]] = []
+
+    def append(self, mask: int) -> None:
+        """
+        附加一步輸入（與上一步相同時延長目前的段落）
+
+        參數：
+            mask: int - 輸入遮罩
+        """
+        runs = self.runs
+        if runs and runs[-1][0] == mask and runs[-1][1] < MAX_RUN:
+            runs[-1][1] += 1
+        else:
+            runs.append([mask, 1])
+        self.ticks += 1
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        寫入回放檔案
+
+        參數：
+            path: 檔案路徑
+        """
+        with open(path, "wb") as file:
+            file.write(
+                HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    self.seed,
+                    self.tick_rate,
+                    self.map_width,
+                    self.map_height,
+                    self.ticks,
+                    len(self.runs),
+                    len(self.keyframes),
+                    len(self.waves),
+                )
+            )
+            for wave in self.waves:
+                weights = [wave.mix.get(name, 0.0) for name in snapshot.ENEMY_TYPES]
+                file.write(WAVE.pack(wave.count, wave.interval, *weights))
+            file.write(b"".join(RUN.pack(mask, length) for mask, length in self.runs))
+            for tick, blob in self.keyframes:
+                file.write(KEYFRAME.pack(tick, len(blob)))
+            for _, blob in self.keyframes:
+                file.write(blob)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Replay":
+        """
+        讀取回放檔案
+
+        參數：
+            path: 檔案路徑
+
+        返回：
+            Replay - 回放資料
+
+        異常：
+            ValueError: 檔案不是回放檔或版本不符
+        """
+        data = Path(path).read_bytes()
+        (
+            magic,
+            version,
+            seed,
+            tick_rate,
+            map_width,
+            map_height,
+            ticks,
+            run_count,
+            keyframe_count,
+            wave_count,
+        ) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"無法辨識的回放檔: {path}")
+
+        offset = HEADER.size
+        waves = []
+        for count, interval, *weights in WAVE.iter_unpack(
+            data[offset : offset + wave_count * WAVE.size]
+        ):
+            mix = {
+                name: weight
+                for name, weight in zip(snapshot.ENEMY_TYPES, weights)
+                if weight
+            }
+            waves.append(Wave(count, mix, interval))
+        offset += wave_count * WAVE.size
+
+        replay = cls(seed, tick_rate, map_width, map_height, waves)
+        replay.ticks = ticks
+        size = run_count * RUN.size
+        runs = RUN.iter_unpack(data[offset : offset + size])
+        replay.runs = [list(run) for run in runs]
+        offset += size
+        size = keyframe_count * KEYFRAME.size
+        index = list(KEYFRAME.iter_unpack(data[offset : offset + size]))
+        offset += size
+        for tick, length in index:
+            replay.keyframes.append((tick, data[offset : offset + length]))
+            offset += length
+        return replay
+
+
+class ReplayRecorder:
+    """
+    回放錄製器
+
+    每一步呼叫 record 記錄輸入，每隔 snapshot_interval 步保存一次關鍵幀。
+    開始錄製時立即保存第一個關鍵幀，因此可以從對局中途開始錄製。
+
+    屬性：
+        game: Game - 被錄製的遊戲
+        replay: Replay - 錄製中的回放資料
+        snapshot_interval: int - 關鍵幀間隔（步數）
+    """
+
+    SNAPSHOT_INTERVAL = 60 * 60  # 每一分鐘的模擬時間保存一次關鍵幀
+
+    def __init__(self, game: Game, snapshot_interval: int = SNAPSHOT_INTERVAL) -> None:
+        """
+        開始錄製
+
+        參數：
+            game: Game - 被錄製的遊戲
+            snapshot_interval: 關鍵幀間隔（步數）
+        """
+        self.game = game
+        self.snapshot_interval = snapshot_interval
+        self.replay = Replay(
+            game.seed,
+            game.clock.tick_rate,
+            game.map_width,
+            game.map_height,
+            game.wave_scheduler.waves,
+        )
+        self.replay.keyframes.append((0, _encode_keyframe(game)))
+
+    def record(self, mask: int) -> None:
+        """
+        記錄剛套用到遊戲的一步輸入
+
+        參數：
+            mask: int - 這一步的輸入遮罩
+        """
+        self.replay.append(mask)
+        if self.replay.ticks % self.snapshot_interval == 0:
+            state = _encode_keyframe(self.game)
+            self.replay.keyframes.append((self.replay.ticks, state))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        寫入回放檔案
+
+        參數：
+            path: 檔案路徑
+        """
+        self.replay.save(path)
+
+
+class ReplayPlayer:
+    """
+    回放播放器
+
+    以回放的輸入推進遊戲；跳轉時從目標之前最近的關鍵幀還原，再模擬剩餘的步數。
+
+    屬性：
+        replay: Replay - 播放中的回放資料
+        game: Game - 被驅動的遊戲
+        tick: int - 已播放的步數
+    """
+
+    def __init__(self, replay: Replay, game: Optional[Game] = None) -> None:
+        """
+        初始化播放器並還原到第 0 步
+
+        參數：
+            replay: Replay - 回放資料
+            game: 要驅動的遊戲（必須以回放的種子、地圖大小與波次表建立），
+                None 表示依回放建立無頭遊戲
+        """
+        self.replay = replay
+        self.game = game or Game(
+            map_width=replay.map_width,
+            map_height=replay.map_height,
+            headless=True,
+            seed=replay.seed,
+            waves=replay.waves,
+        )
+        self._keyframe_ticks = [tick for tick, _ in replay.keyframes]
+        # 每個輸入段落的起始步數
+        self._run_starts = [0, *accumulate(length for _, length in replay.runs)]
+        self.tick = 0
+        self._restore(0)
+
+    def _restore(self, index: int) -> None:
+        """
+        還原指定的關鍵幀
+
+        參數：
+            index: 關鍵幀索引
+        """
+        tick, blob = self.replay.keyframes[index]
+        _restore_keyframe(blob, self.game)
+        self.tick = tick
+        # 目前的輸入段落（已在結尾時停在最後一段之後）
+        self._run = bisect_right(self._run_starts, tick) - 1
+        self._run_end = self._run_starts[min(self._run + 1, len(self.replay.runs))]
+
+    def seek(self, tick: int) -> None:
+        """
+        跳轉到指定步數（完成該步數後的狀態）
+
+        目前位置已在目標之前、且比最近的關鍵幀更接近時直接往前模擬。
+
+        參數：
+            tick: 目標步數（超過總步數時停在結尾）
+        """
+        tick = max(0, min(tick, self.replay.ticks))
+        index = bisect_right(self._keyframe_ticks, tick) - 1
+        if not self._keyframe_ticks[index] <= self.tick <= tick:
+            self._restore(index)
+        while self.tick < tick:
+            self.step()
+
+    def step(self) -> bool:
+        """
+        以回放的下一步輸入推進遊戲
+
+        返回：
+            bool - False 表示回放已經結束
+        """
+        if self.tick >= self.replay.ticks:
+            return False
+        if self.tick >= self._run_end:
+            self._run += 1
+            self._run_end = self._run_starts[self._run + 1]
+        apply_input(self.game, self.replay.runs[self._run][0])
+        self.tick += 1
+        return True
+
+
+def play_headless(path: Union[str, Path], seek: float = 0.0) -> None:
+    """
+    無頭播放回放，回報模擬速度與最慢的幾步（用來重現效能尖峰）
+
+    參數：
+        path: 回放檔案路徑
+        seek: 開始播放的時間點（秒）
+    """
+    headless.init_headless()
+    replay = Replay.load(path)
+    player = ReplayPlayer(replay)
+
+    start = time.perf_counter()
+    player.seek(int(seek * replay.tick_rate))
+    seek_time = time.perf_counter() - start
+
+    first = player.tick
+    timings: List[Tuple[float, int]] = []
+    start = time.perf_counter()
+    while True:
+        tick_start = time.perf_counter()
+        if not player.step():
+            break
+        timings.append((time.perf_counter() - tick_start, player.tick))
+    elapsed = time.perf_counter() - start
+
+    played = player.tick - first
+    print(f"ticks:         {replay.ticks} ({len(replay.runs)} input runs)")
+    print(f"seek:          tick {first} in {seek_time * 1e3:.1f} ms")
+    if played:
+        print(f"simulated FPS: {played / elapsed:.0f}")
+        print("slowest ticks:")
+        for duration, tick in sorted(timings, reverse=True)[:5]:
+            print(f"    tick {tick:7d}  {duration * 1e3:7.3f} ms")
+    print(f"score:         {player.game.score}")
+    pygame.quit()
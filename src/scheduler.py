@@ -0,0 +1,186 @@
+"""
+AI 排程模組
+
+依敵人與玩家的距離分級（LOD）安排敵人的 AI 更新：
+近處的敵人每一步都完整思考（轉向、移動、碰撞檢查與射擊），
+遠處的敵人每隔數步才思考一次，其間只沿原方向外推移動。
+外推的路徑在思考時以一次碰撞檢查確認暢通（見 EnemyTank.plan_coast），
+因此外推不會穿牆，所有決策仍只取決於遊戲狀態，回放與快照保持確定性。
+
+同一級距的敵人依在精靈組中的順序錯開思考的步數，每一步的成本保持平均。
+
+只有畫面外的敵人循流場接近玩家；完整進入畫面（攝影機可視範圍）後改回隨機巡邏與射擊，
+不會一路循流場撞上玩家。預設大小的地圖整張都在畫面內，敵人的行為與沒有流場時相同。
+"""
+
+import time
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from src.game import Game
+
+
+class AITier:
+    """
+    AI 距離級距與其統計
+
+    屬性：
+        name: str - 級距名稱
+        radius: Optional[int] - 級距的最大距離（格子數，切比雪夫距離），None 表示無上限
+        interval: int - 思考間隔（步數），1 表示每一步都思考
+        enemies: int - 上一步位於此級距的敵人數
+        thinks: int - 累計完整思考的次數
+        coasted: int - 累計外推移動的次數
+        deferred: int - 累計因超出時間預算而延後思考的次數
+        time: float - 累計花費的時間（秒）
+    """
+
+    def __init__(self, name: str, radius: Optional[int], interval: int) -> None:
+        """
+        初始化級距
+
+        參數：
+            name: 級距名稱
+            radius: 最大距離（格子數），None 表示無上限
+            interval: 思考間隔（步數）
+        """
+        self.name = name
+        self.radius = radius
+        self.interval = interval
+        self.enemies = 0
+        self.thinks = 0
+        self.coasted = 0
+        self.deferred = 0
+        self.time = 0.0
+
+
+class AIScheduler:
+    """
+    依距離分級的敵人 AI 排程器
+
+    屬性：
+        tiers: List[AITier] - 依距離由近到遠排列的級距
+        budget_ms: Optional[float] - 每一步遠處級距可使用的時間預算（毫秒），
+            None 表示不限制；超出時尚未思考的遠處敵人原地等待一步。
+            預算取決於實際執行時間，設定後模擬不再具有確定性（錄製回放時不要使用）
+        updates: int - 已排程的步數
+    """
+
+    # (名稱, 最大距離（格子數）, 思考間隔)；近處範圍與流場範圍相同，
+    # 循流場前進的敵人每一步都能在格子中心轉向
+    TIERS: Sequence[Tuple[str, Optional[int], int]] = (
+        ("near", 16, 1),
+        ("mid", 32, 2),
+        ("far", None, 4),
+    )
+
+    def __init__(self, budget_ms: Optional[float] = None) -> None:
+        """
+        初始化排程器
+
+        時間預算可以壓低大量敵人時最慢的幾步，代價是確定性：
+        遠處敵人是否延後思考取決於實際執行時間，相同種子與輸入不再得到相同結果，
+        因此錄製與播放回放、批次模擬時不要設定（main.py 只在一般遊玩時套用 --ai-budget-ms）。
+        近處的敵人不受預算限制。
+
+        參數：
+            budget_ms: 每一步遠處級距的時間預算（毫秒），None 表示不限制
+        """
+        self.tiers: List[AITier] = [
+            AITier(name, radius, interval) for name, radius, interval in self.TIERS
+        ]
+        self.budget_ms = budget_ms
+        self.updates = 0
+
+    def _tier_of(self, distance: int) -> AITier:
+        """
+        取得距離所屬的級距
+
+        參數：
+            distance: 與玩家的距離（格子數）
+
+        返回：
+            AITier - 第一個涵蓋此距離的級距
+        """
+        for tier in self.tiers:
+            if tier.radius is None or distance <= tier.radius:
+                return tier
+        return self.tiers[-1]
+
+    def update(self, game: "Game") -> None:
+        """
+        更新所有敵人一步：到了思考時間的敵人完整更新，其餘外推移動
+
+        參數：
+            game: Game - 遊戲（提供敵人、地圖、流場、攝影機、視線、子彈與出生點索引）
+        """
+        ticks = game.clock.ticks
+        game_map = game.map
+        flow_field = game.flow_field
+        bullets = game.bullets
+        sight = game.line_of_sight
+        spawn_index = game.spawn_index
+        grid_size = game_map.GRID_SIZE
+        player_rect = game.player.rect
+        player_x, player_y = player_rect.center
+        view = game.camera.rect
+        deadline = (
+            time.perf_counter() + self.budget_ms / 1000
+            if self.budget_ms is not None
+            else None
+        )
+        perf_counter = time.perf_counter
+
+        enemies = game.enemies.sprites()
+        if deadline is not None and enemies:
+            # 有預算時每一步輪替起點，避免固定的敵人一直被延後
+            shift = self.updates % len(enemies)
+            enemies = enemies[shift:] + enemies[:shift]
+
+        for tier in self.tiers:
+            tier.enemies = 0
+        for index, enemy in enumerate(enemies):
+            start = perf_counter()
+            center_x, center_y = enemy.rect.center
+            distance = (
+                max(abs(center_x - player_x), abs(center_y - player_y)) // grid_size
+            )
+            tier = self._tier_of(distance)
+            tier.enemies += 1
+
+            if enemy.coast_ticks:
+                # 路徑已確認暢通：只沿原方向前進
+                enemy.coast_ticks -= 1
+                enemy.coast()
+                spawn_index.update_tank(enemy)
+                tier.coasted += 1
+            elif tier.interval > 1 and deadline is not None and start > deadline:
+                tier.deferred += 1
+            else:
+                enemy.update(
+                    game_map, None if view.contains(enemy.rect) else flow_field
+                )
+                spawn_index.update_tank(enemy)
+                enemy.try_shoot(bullets, sight, player_rect)
+                tier.thinks += 1
+                if tier.interval > 1:
+                    # 依序號錯開下一次思考的步數，外推到那之前
+                    wait = -(ticks + index) % tier.interval or tier.interval
+                    enemy.coast_ticks = enemy.plan_coast(game_map, wait - 1)
+            tier.time += perf_counter() - start
+        self.updates += 1
+
+    def report(self) -> List[str]:
+        """
+        產生各級距的統計摘要
+
+        返回：
+            List[str] - 每個級距一行：敵人數、思考與外推次數、平均每步耗時
+        """
+        updates = max(self.updates, 1)
+        return [
+            f"{tier.name:<4} enemies {tier.enemies:>4}  "
+            f"thinks {tier.thinks:>8}  coasted {tier.coasted:>8}  "
+            f"deferred {tier.deferred:>6}  {tier.time / updates * 1000:.3f} ms/tick"
+            for tier in self.tiers
+        ]
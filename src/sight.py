@@ -0,0 +1,203 @@
+"""
+視線模組
+
+子彈會被磚塊與鋼塊擋下（草叢與減速地帶不會）。本模組以地圖格子為單位，
+快取每一列與每一欄中阻擋子彈的格子位置，供敵人判斷射擊方向上是否有值得射擊的目標：
+玩家位於砲管方向、且中間沒有阻擋，或第一個阻擋物是可以摧毀的磚塊。
+
+快取以「列（或欄）× 區塊」為單位的區段建立，查詢時才讀取需要的區塊，
+大型地圖不會為了視線載入整列地形；磚塊被摧毀時只作廢所在的列區段與欄區段。
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import pygame
+
+if TYPE_CHECKING:
+    from src.map import Map
+
+
+class LineOfSight:
+    """
+    以格子列、欄區段快取的視線服務
+
+    屬性：
+        game_map: Map - 遊戲地圖
+        sight_range: int - 視線距離（格子數），超過此距離的目標與阻擋物都不考慮
+        segment_builds: int - 建立區段快取的次數
+    """
+
+    RANGE = 20  # 預設視線距離（格子數，約一個視窗寬度）
+
+    def __init__(self, game_map: "Map", sight_range: int = RANGE) -> None:
+        """
+        初始化視線服務（區段在第一次查詢時才建立）
+
+        參數：
+            game_map: Map - 遊戲地圖
+            sight_range: 視線距離（格子數）
+        """
+        self.game_map = game_map
+        self.sight_range = sight_range
+        self.segment_builds = 0
+        # (列, 區塊X) 與 (欄, 區塊Y) 對應區段內阻擋子彈的格子座標（遞增排列）
+        self._rows: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+        self._columns: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+
+    def _segment(self, horizontal: bool, line: int, chunk: int) -> Tuple[int, ...]:
+        """
+        取得列或欄在一個區塊內的阻擋格子座標，尚未快取時建立
+
+        參數：
+            horizontal: True 表示列（座標為X），False 表示欄（座標為Y）
+            line: 列的Y座標或欄的X座標
+            chunk: 區塊在該方向的索引
+
+        返回：
+            Tuple[int, ...] - 阻擋格子沿該方向的座標
+        """
+        cache = self._rows if horizontal else self._columns
+        key = (line, chunk)
+        segment = cache.get(key)
+        if segment is None:
+            game_map = self.game_map
+            size = game_map.CHUNK_SIZE
+            start = chunk * size
+            if horizontal:
+                end = min(start + size, game_map.width)
+                codes = game_map.tile_row(line, start, end)
+            else:
+                end = min(start + size, game_map.height)
+                codes = game_map.tile_column(line, start, end)
+            solid = game_map.TILE_SOLID
+            segment = tuple(
+                start + offset for offset, code in enumerate(codes) if code & solid
+            )
+            cache[key] = segment
+            self.segment_builds += 1
+        return segment
+
+    def invalidate(self, grid_x: int, grid_y: int) -> None:
+        """
+        格子的地形改變後（例如磚塊被摧毀），作廢包含它的列區段與欄區段
+
+        參數：
+            grid_x: 格子X座標
+            grid_y: 格子Y座標
+        """
+        size = self.game_map.CHUNK_SIZE
+        self._rows.pop((grid_y, grid_x // size), None)
+        self._columns.pop((grid_x, grid_y // size), None)
+
+    def first_blocker(
+        self, grid_x: int, grid_y: int, direction: Tuple[int, int]
+    ) -> Optional[Tuple[int, int]]:
+        """
+        沿方向找出視線距離內第一個阻擋子彈的格子（不含起點格子）
+
+        參數：
+            grid_x: 起點格子X座標
+            grid_y: 起點格子Y座標
+            direction: 方向向量，例如 (1, 0) 表示向右
+
+        返回：
+            Tuple[int, int] - (距離（格子數，1 表示相鄰）, 地形代碼)，
+            地圖邊界視為鋼塊；視線距離內沒有阻擋時返回 None
+        """
+        game_map = self.game_map
+        dx, dy = direction
+        horizontal = dx != 0
+        step = dx if horizontal else dy
+        origin, line = (grid_x, grid_y) if horizontal else (grid_y, grid_x)
+        extent = game_map.width if horizontal else game_map.height
+        size = game_map.CHUNK_SIZE
+        limit = origin + step * self.sight_range
+
+        position = origin + step
+        if step > 0:
+            stop = min(limit, extent - 1)
+            while position <= stop:
+                chunk = position // size
+                segment = self._segment(horizontal, line, chunk)
+                index = bisect_left(segment, position)
+                if index < len(segment) and segment[index] <= stop:
+                    return self._blocker(horizontal, line, origin, segment[index])
+                position = (chunk + 1) * size
+            if limit >= extent:
+                return (extent - origin, game_map.TILE_STEEL)
+        else:
+            stop = max(limit, 0)
+            while position >= stop:
+                chunk = position // size
+                segment = self._segment(horizontal, line, chunk)
+                index = bisect_right(segment, position) - 1
+                if index >= 0 and segment[index] >= stop:
+                    return self._blocker(horizontal, line, origin, segment[index])
+                position = chunk * size - 1
+            if limit < 0:
+                return (origin + 1, game_map.TILE_STEEL)
+        return None
+
+    def _blocker(
+        self, horizontal: bool, line: int, origin: int, position: int
+    ) -> Tuple[int, int]:
+        """
+        組出 first_blocker 的返回值
+
+        參數：
+            horizontal: True 表示沿列查詢
+            line: 列的Y座標或欄的X座標
+            origin: 起點在查詢方向的座標
+            position: 阻擋格子在查詢方向的座標
+
+        返回：
+            Tuple[int, int] - (距離, 地形代碼)
+        """
+        if horizontal:
+            code = self.game_map.tile_code(position, line)
+        else:
+            code = self.game_map.tile_code(line, position)
+        return (abs(position - origin), code)
+
+    def has_target(
+        self, x: float, y: float, direction: Tuple[int, int], target: pygame.Rect
+    ) -> bool:
+        """
+        判斷從指定位置沿方向射擊是否可能命中有意義的目標
+
+        目標矩形跨過彈道且比第一個阻擋物近時視為可見；
+        否則只有在第一個阻擋物是磚塊時才值得射擊（打通道路）。
+
+        參數：
+            x: 射擊者中心X座標（像素）
+            y: 射擊者中心Y座標（像素）
+            direction: 射擊方向向量
+            target: pygame.Rect - 目標（玩家）的矩形
+
+        返回：
+            bool - True 表示值得射擊
+        """
+        grid_size = self.game_map.GRID_SIZE
+        grid_x = int(x) // grid_size
+        grid_y = int(y) // grid_size
+        dx, dy = direction
+        blocker = self.first_blocker(grid_x, grid_y, direction)
+        reach = blocker[0] if blocker is not None else self.sight_range + 1
+
+        # 目標與彈道相交時，目標最近的格子與射擊者的距離
+        if dx:
+            in_lane = target.top <= y < target.bottom
+            if dx > 0:
+                distance = target.left // grid_size - grid_x
+            else:
+                distance = grid_x - (target.right - 1) // grid_size
+        else:
+            in_lane = target.left <= x < target.right
+            if dy > 0:
+                distance = target.top // grid_size - grid_y
+            else:
+                distance = grid_y - (target.bottom - 1) // grid_size
+        if in_lane and 0 <= distance < reach and distance <= self.sight_range:
+            return True
+        return blocker is not None and bool(blocker[1] & self.game_map.TILE_BRICK)
@@ -0,0 +1,346 @@
+"""
+快照模組
+
+把執行中的 Game 完整狀態（地圖修改、玩家、敵人與計時器、子彈、爆炸、分數、
+亂數狀態）序列化為緊湊、有版本的二進位格式，供回溯（rollback）與存檔點使用。
+
+格式為固定的 struct 佈局（小端序）：標頭記錄所有區段的元素數，
+之後依序是各區段的連續陣列，每個區段都對齊 8 位元組。
+讀取時直接以 memoryview 檢視緩衝區（存檔以 mmap 映射），
+數值陣列不經過中間物件即複製到遊戲狀態中。
+
+使用方式：
+    blob = snapshot.dumps(game)
+    snapshot.loads(blob, game)
+    snapshot.save(game, "checkpoint.tws")
+    snapshot.load("checkpoint.tws", game)
+"""
+
+import mmap
+import random
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+from src.enemy import EnemyTank
+from src.game import Game
+
+MAGIC = b"TWSNAP\0\0"
+VERSION = 3  # 2：敵人加入剩餘外推步數；3：加入敵人波次
+
+# 標頭：魔術字、版本、對局種子、步數、分數、遊戲結束、勝利、
+# 地圖種子、地圖寬高、亂數是否有 gauss 快取、gauss 快取值，
+# 敵人、子彈、爆炸、修改區塊、優先出生格子、出生格子的數量，
+# 以及下一波索引、前一波出發步數與等待生成的敵人數
+HEADER = struct.Struct("<8sHqIi??QII?dIIIIIIIqI")
+PLAYER = struct.Struct("<ddBdi?dd")  # x, y, 方向, 速度, 生命, 無敵, 無敵時間, 射擊時間
+ENEMY = struct.Struct("<ddBBdiidddH")  # x, y, 類型, 方向, 速度, 生命, 轉向間隔, ...
+EXPLOSION = struct.Struct("<iii")  # 中心座標與剩餘幀數
+EDIT = struct.Struct("<iiI")  # 區塊座標與地形資料長度
+
+RNG_WORDS = 625  # random.Random 內部狀態（624 個字與目前位置）
+DIRECTIONS = ("up", "down", "left", "right")
+ENEMY_TYPES = tuple(EnemyTank.ENEMY_CONFIGS)
+OWNERS = ("player", "enemy")
+BULLET_TYPECODES = ("d", "d", "d", "d", "B", "i")  # x, y, vx, vy, 所有者, 傷害
+
+ALIGNMENT = 8
+
+
+def _pad(size: int) -> int:
+    """
+    計算對齊到 ALIGNMENT 所需的填充位元組數
+
+    參數：
+        size: 目前的位元組數
+
+    返回：
+        int - 填充位元組數
+    """
+    return -size % ALIGNMENT
+
+
+def _column_bytes(typecode: str, values: Sequence) -> bytes:
+    """
+    將數值序列編碼為小端序的連續陣列
+
+    參數：
+        typecode: array 型別代碼
+        values: 數值序列
+
+    返回：
+        bytes - 陣列內容
+    """
+    column = array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def _column_view(
+    view: memoryview, offset: int, typecode: str, count: int
+) -> Tuple[Sequence, int]:
+    """
+    讀取連續陣列（小端序的機器直接檢視緩衝區，不複製）
+
+    參數：
+        view: memoryview - 快照緩衝區
+        offset: 陣列起點
+        typecode: array 型別代碼
+        count: 元素數
+
+    返回：
+        Tuple[Sequence, int] - 陣列內容與下一個區段的起點
+    """
+    size = count * struct.calcsize(typecode)
+    data = view[offset : offset + size]
+    if sys.byteorder == "big":
+        column = array(typecode, data.tobytes())
+        column.byteswap()
+    else:
+        column = data.cast(typecode)
+    end = offset + size
+    return column, end + _pad(end)
+
+
+def dumps(game: Game) -> bytes:
+    """
+    將遊戲的完整狀態序列化為快照
+
+    參數：
+        game: Game - 要保存的遊戲
+
+    返回：
+        bytes - 快照內容
+    """
+    state = game.get_state()
+    map_seed, map_width, map_height, edits = state["map"]
+    enemies = state["enemies"]
+    bullets = state["bullets"]
+    explosions = state["explosions"]
+    preferred, spawn_tiles = state["spawn"]
+    _, rng_words, gauss = state["rng"]
+    next_wave, last_wave_tick, pending = state["waves"]
+
+    parts: List[bytes] = []
+    size = 0
+
+    def write(data: bytes) -> None:
+        nonlocal size
+        parts.append(data)
+        size += len(data)
+        padding = _pad(size)
+        if padding:
+            parts.append(bytes(padding))
+            size += padding
+
+    write(
+        HEADER.pack(
+            MAGIC,
+            VERSION,
+            state["seed"],
+            state["ticks"],
+            state["score"],
+            state["game_over"],
+            state["game_won"],
+            map_seed,
+            map_width,
+            map_height,
+            gauss is not None,
+            gauss or 0.0,
+            len(enemies),
+            len(bullets[0]),
+            len(explosions),
+            len(edits),
+            len(preferred),
+            len(spawn_tiles),
+            next_wave,
+            last_wave_tick,
+            len(pending),
+        )
+    )
+    write(_column_bytes("I", rng_words))
+    write(_column_bytes("I", [state["kills"][name] for name in ENEMY_TYPES]))
+
+    x, y, direction, *player = state["player"]
+    write(PLAYER.pack(x, y, DIRECTIONS.index(direction), *player))
+    write(
+        b"".join(
+            ENEMY.pack(
+                x,
+                y,
+                ENEMY_TYPES.index(enemy_type),
+                DIRECTIONS.index(direction),
+                *rest,
+            )
+            for x, y, enemy_type, direction, *rest in enemies
+        )
+    )
+
+    *numbers, owners, damage = bullets
+    for typecode, column in zip(BULLET_TYPECODES[:4], numbers):
+        write(_column_bytes(typecode, column))
+    write(_column_bytes("B", [OWNERS.index(owner) for owner in owners]))
+    write(_column_bytes("i", damage))
+
+    write(b"".join(EXPLOSION.pack(*explosion) for explosion in explosions))
+    write(_column_bytes("I", preferred))
+    write(_column_bytes("I", spawn_tiles))
+    write(_column_bytes("B", [ENEMY_TYPES.index(name) for name, _ in pending]))
+    write(_column_bytes("q", [queued for _, queued in pending]))
+    for (chunk_x, chunk_y), tiles in edits.items():
+        write(EDIT.pack(chunk_x, chunk_y, len(tiles)) + tiles)
+    return b"".join(parts)
+
+
+def _read_state(view: memoryview) -> Dict[str, Any]:
+    """
+    由快照緩衝區組出 Game.set_state 使用的狀態
+
+    參數：
+        view: memoryview - 快照緩衝區
+
+    返回：
+        Dict[str, Any] - Game.set_state 的參數（部分陣列仍引用緩衝區）
+
+    異常：
+        ValueError: 緩衝區不是快照或版本不符
+    """
+    if len(view) < HEADER.size:
+        raise ValueError("無法辨識的快照")
+    (
+        magic,
+        version,
+        seed,
+        ticks,
+        score,
+        game_over,
+        game_won,
+        map_seed,
+        map_width,
+        map_height,
+        has_gauss,
+        gauss,
+        enemy_count,
+        bullet_count,
+        explosion_count,
+        edit_count,
+        preferred_count,
+        spawn_count,
+        next_wave,
+        last_wave_tick,
+        pending_count,
+    ) = HEADER.unpack_from(view)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("無法辨識的快照或版本不符")
+    offset = HEADER.size + _pad(HEADER.size)
+
+    rng_words, offset = _column_view(view, offset, "I", RNG_WORDS)
+    kills, offset = _column_view(view, offset, "I", len(ENEMY_TYPES))
+
+    x, y, direction, *player = PLAYER.unpack_from(view, offset)
+    offset += PLAYER.size + _pad(PLAYER.size)
+
+    enemies = []
+    for x_, y_, enemy_type, enemy_direction, *rest in ENEMY.iter_unpack(
+        view[offset : offset + enemy_count * ENEMY.size]
+    ):
+        enemies.append(
+            (x_, y_, ENEMY_TYPES[enemy_type], DIRECTIONS[enemy_direction], *rest)
+        )
+    offset += enemy_count * ENEMY.size
+    offset += _pad(offset)
+
+    bullets = []
+    for typecode in BULLET_TYPECODES:
+        column, offset = _column_view(view, offset, typecode, bullet_count)
+        bullets.append(column)
+    bullets[4] = [OWNERS[owner] for owner in bullets[4]]
+
+    explosions = list(
+        EXPLOSION.iter_unpack(view[offset : offset + explosion_count * EXPLOSION.size])
+    )
+    offset += explosion_count * EXPLOSION.size
+    offset += _pad(offset)
+
+    preferred, offset = _column_view(view, offset, "I", preferred_count)
+    spawn_tiles, offset = _column_view(view, offset, "I", spawn_count)
+    pending_types, offset = _column_view(view, offset, "B", pending_count)
+    pending_ticks, offset = _column_view(view, offset, "q", pending_count)
+
+    edits = {}
+    for _ in range(edit_count):
+        chunk_x, chunk_y, length = EDIT.unpack_from(view, offset)
+        start = offset + EDIT.size
+        # 地形資料會在地圖中保存到卸載之後，必須複製出緩衝區
+        edits[(chunk_x, chunk_y)] = bytes(view[start : start + length])
+        offset = start + length
+        offset += _pad(offset)
+
+    return {
+        "seed": seed,
+        "ticks": ticks,
+        "rng": (random.Random.VERSION, tuple(rng_words), gauss if has_gauss else None),
+        "score": score,
+        "game_over": game_over,
+        "game_won": game_won,
+        "kills": dict(zip(ENEMY_TYPES, kills)),
+        "map": (map_seed, map_width, map_height, edits),
+        "player": (x, y, DIRECTIONS[direction], *player),
+        "enemies": enemies,
+        "spawn": (preferred, spawn_tiles),
+        "waves": (
+            next_wave,
+            last_wave_tick,
+            [
+                (ENEMY_TYPES[enemy_type], queued)
+                for enemy_type, queued in zip(pending_types, pending_ticks)
+            ],
+        ),
+        "bullets": bullets,
+        "explosions": explosions,
+    }
+
+
+def loads(data: Union[bytes, bytearray, memoryview, mmap.mmap], game: Game) -> None:
+    """
+    將快照還原到遊戲中，之後以相同輸入更新會得到與保存時相同的結果
+
+    參數：
+        data: 快照內容（dumps 的返回值或映射的快照檔）
+        game: Game - 要還原的遊戲（可以是另一個 Game 實例）
+
+    異常：
+        ValueError: 資料不是快照或版本不符
+    """
+    with memoryview(data) as view:
+        game.set_state(_read_state(view))
+
+
+def save(game: Game, path: Union[str, Path]) -> None:
+    """
+    將遊戲的完整狀態寫入快照檔
+
+    參數：
+        game: Game - 要保存的遊戲
+        path: 快照檔路徑
+    """
+    Path(path).write_bytes(dumps(game))
+
+
+def load(path: Union[str, Path], game: Game) -> None:
+    """
+    以記憶體映射讀取快照檔並還原到遊戲中
+
+    參數：
+        path: 快照檔路徑
+        game: Game - 要還原的遊戲
+
+    異常：
+        ValueError: 檔案不是快照或版本不符
+    """
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            loads(mapped, game)
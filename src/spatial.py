@@ -0,0 +1,78 @@
+"""
+空間雜湊模組
+
+以均勻格子分桶物件，讓碰撞查詢只檢查查詢矩形所在格子內的物件，
+查詢成本與場上物件總數無關。
+"""
+
+from typing import Dict, Generic, List, Tuple, TypeVar
+
+import pygame
+
+T = TypeVar("T")
+
+
+class SpatialHash(Generic[T]):
+    """
+    均勻格子空間雜湊類別
+
+    每個物件依其矩形放入所有重疊的格子，適合每幀清空後重建的廣域碰撞檢測。
+
+    屬性：
+        cell_size: int - 格子大小（像素）
+    """
+
+    def __init__(self, cell_size: int) -> None:
+        """
+        初始化空間雜湊
+
+        參數：
+            cell_size: 格子大小（像素）
+        """
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[Tuple[T, pygame.Rect]]] = {}
+
+    def clear(self) -> None:
+        """移除所有物件"""
+        self._cells.clear()
+
+    def insert(self, item: T, rect: pygame.Rect) -> None:
+        """
+        加入物件
+
+        參數：
+            item: 要加入的物件
+            rect: pygame.Rect - 物件的碰撞矩形
+        """
+        size = self.cell_size
+        cells = self._cells
+        for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket is None:
+                    cells[(cell_x, cell_y)] = [(item, rect)]
+                else:
+                    bucket.append((item, rect))
+
+    def query(self, rect: pygame.Rect) -> List[T]:
+        """
+        取得與矩形碰撞的物件（不重複）
+
+        參數：
+            rect: pygame.Rect - 查詢的矩形
+
+        返回：
+            List[T] - 碰撞的物件
+        """
+        size = self.cell_size
+        cells = self._cells
+        found: List[T] = []
+        for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for cell_x in range(rect.left // size, (rect.right - 1) // size + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket is None:
+                    continue
+                for item, item_rect in bucket:
+                    if item not in found and rect.colliderect(item_rect):
+                        found.append(item)
+        return found
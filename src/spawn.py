@@ -0,0 +1,278 @@
+"""
+敵人出生點索引模組
+
+持續維護可出生的空格子集合：坦克移動、出生或死亡，以及磚塊被摧毀時
+只更新受影響的格子，生成敵人時直接從集合中隨機抽樣（O(1)）。
+"""
+
+import random
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import pygame
+
+if TYPE_CHECKING:
+    from src.map import Map
+
+
+class TileSet:
+    """
+    可隨機抽樣的格子集合
+
+    以列表加索引字典實現，加入、移除與隨機抽樣皆為 O(1)。
+    """
+
+    def __init__(self) -> None:
+        self._items: List[int] = []
+        self._positions: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, tile: int) -> bool:
+        return tile in self._positions
+
+    def add(self, tile: int) -> None:
+        """
+        加入格子
+
+        參數：
+            tile: 格子索引
+        """
+        if tile not in self._positions:
+            self._positions[tile] = len(self._items)
+            self._items.append(tile)
+
+    def discard(self, tile: int) -> None:
+        """
+        移除格子（不存在時忽略）
+
+        參數：
+            tile: 格子索引
+        """
+        position = self._positions.pop(tile, None)
+        if position is None:
+            return
+        last = self._items.pop()
+        if position < len(self._items):
+            # 以最後一個元素填補空位
+            self._items[position] = last
+            self._positions[last] = position
+
+    def items(self) -> List[int]:
+        """
+        取得集合內容（依內部順序，抽樣結果取決於此順序）
+
+        返回：
+            List[int] - 格子索引的複本
+        """
+        return list(self._items)
+
+    def assign(self, items: List[int]) -> None:
+        """
+        以指定順序重設集合內容（還原狀態時使用）
+
+        參數：
+            items: 格子索引，通常是 items() 的返回值
+        """
+        self._items = list(items)
+        self._positions = {tile: index for index, tile in enumerate(self._items)}
+
+    def choice(self, rng: random.Random) -> int:
+        """
+        隨機選擇一個格子
+
+        參數：
+            rng: random.Random - 抽樣使用的亂數產生器
+
+        返回：
+            int - 格子索引
+        """
+        return rng.choice(self._items)
+
+
+class SpawnIndex:
+    """
+    敵人出生點索引類別
+
+    追蹤每個格子被多少坦克覆蓋，格子不是障礙物且沒有坦克覆蓋時即可出生。
+    以坦克大小等於格子大小為前提：出生位置即格子本身的矩形。
+    只索引出生區域內的格子列，大型地圖不需要為了出生點載入整張地圖。
+
+    屬性：
+        game_map: Map - 遊戲地圖
+        preferred_rows: range - 優先出生的格子列（頂部區域）
+        rows: range - 出生區域的格子列（優先列都沒有空位時從這裡選擇）
+        rng: random.Random - 抽樣出生位置的亂數產生器
+    """
+
+    def __init__(
+        self,
+        game_map: "Map",
+        preferred_rows: range,
+        rows: Optional[range] = None,
+        rng: Optional[random.Random] = None,
+        scan: bool = True,
+    ) -> None:
+        """
+        初始化出生點索引，將出生區域內的所有空格子加入集合
+
+        參數：
+            game_map: Map - 遊戲地圖
+            preferred_rows: range - 優先出生的格子列
+            rows: range - 出生區域的格子列，None 表示整張地圖
+            rng: 抽樣出生位置的亂數產生器（通常由 Game 提供），None 表示新建一個
+            scan: False 表示不掃描地圖、集合保持空白（之後以 set_state 還原）
+        """
+        self.game_map = game_map
+        self.preferred_rows = preferred_rows
+        self.rng = rng if rng is not None else random.Random()
+        self.rows = rows if rows is not None else range(game_map.height)
+        self._offset = self.rows.start * game_map.width
+        # 出生區域的像素範圍（完全位於範圍外的坦克不必逐格計算）
+        self._top = self.rows.start * game_map.GRID_SIZE
+        self._bottom = self.rows.stop * game_map.GRID_SIZE
+        self._occupancy = [0] * (game_map.width * len(self.rows))
+        self._tank_tiles: Dict[pygame.sprite.Sprite, Tuple[int, ...]] = {}
+        self._preferred = TileSet()
+        self._all = TileSet()
+
+        if not scan:
+            return
+        for grid_y in self.rows:
+            for grid_x in range(game_map.width):
+                self.refresh_tile(grid_x, grid_y)
+
+    def _tiles_of(self, rect: pygame.Rect) -> Tuple[int, ...]:
+        """
+        取得矩形覆蓋、且位於出生區域內的格子索引
+
+        參數：
+            rect: pygame.Rect - 坦克矩形
+
+        返回：
+            Tuple[int, ...] - 格子索引
+        """
+        if rect.bottom <= self._top or rect.top >= self._bottom:
+            return ()
+        width = self.game_map.width
+        rows = self.rows
+        return tuple(
+            grid_y * width + grid_x
+            for grid_x, grid_y in self.game_map.tiles_overlapping(rect)
+            if grid_y in rows
+        )
+
+    def _update_tile(self, tile: int) -> None:
+        """
+        依目前的地形與坦克覆蓋狀態更新格子是否可出生
+
+        參數：
+            tile: 格子索引
+        """
+        grid_y, grid_x = divmod(tile, self.game_map.width)
+        free = self._occupancy[
+            tile - self._offset
+        ] == 0 and not self.game_map.is_solid(grid_x, grid_y)
+        if free:
+            self._all.add(tile)
+            if grid_y in self.preferred_rows:
+                self._preferred.add(tile)
+        else:
+            self._all.discard(tile)
+            self._preferred.discard(tile)
+
+    def refresh_tile(self, grid_x: int, grid_y: int) -> None:
+        """
+        地形改變（例如磚塊被摧毀）後更新單一格子（出生區域外的格子忽略）
+
+        參數：
+            grid_x: 格子X座標
+            grid_y: 格子Y座標
+        """
+        if grid_y in self.rows:
+            self._update_tile(grid_y * self.game_map.width + grid_x)
+
+    def update_tank(self, tank: pygame.sprite.Sprite) -> None:
+        """
+        加入坦克或在坦克移動後更新其覆蓋的格子
+
+        覆蓋的格子沒有改變時不做任何事。
+
+        參數：
+            tank: 坦克精靈（需有 rect）
+        """
+        tiles = self._tiles_of(tank.rect)
+        previous = self._tank_tiles.get(tank)
+        if tiles == previous:
+            return
+        self._tank_tiles[tank] = tiles
+
+        occupancy = self._occupancy
+        offset = self._offset
+        for tile in tiles:
+            occupancy[tile - offset] += 1
+        if previous is not None:
+            for tile in previous:
+                occupancy[tile - offset] -= 1
+            for tile in previous:
+                self._update_tile(tile)
+        for tile in tiles:
+            self._update_tile(tile)
+
+    def remove_tank(self, tank: pygame.sprite.Sprite) -> None:
+        """
+        移除坦克（例如被擊毀後）並釋放其覆蓋的格子
+
+        參數：
+            tank: 坦克精靈
+        """
+        previous = self._tank_tiles.pop(tank, None)
+        if previous is None:
+            return
+        for tile in previous:
+            self._occupancy[tile - self._offset] -= 1
+            self._update_tile(tile)
+
+    def get_state(self) -> Tuple[List[int], List[int]]:
+        """
+        取得兩個出生格子集合的內容與順序
+
+        坦克覆蓋數可以由坦克位置重建，但集合的順序取決於過去的更新歷史，
+        必須保存才能在還原後抽樣出相同的出生位置。
+
+        返回：
+            Tuple[List[int], List[int]] - 優先區域與整個出生區域的格子索引
+        """
+        return (self._preferred.items(), self._all.items())
+
+    def set_state(self, state: Tuple[List[int], List[int]]) -> None:
+        """
+        還原 get_state 取得的集合順序（坦克需先以 update_tank 加入）
+
+        參數：
+            state: get_state 的返回值
+        """
+        preferred, tiles = state
+        self._preferred.assign(preferred)
+        self._all.assign(tiles)
+
+    def choose(self) -> Optional[Tuple[int, int]]:
+        """
+        隨機選擇一個出生位置，優先使用頂部區域
+
+        返回：
+            Tuple[int, int] - 出生位置的像素中心座標，沒有空位時返回 None
+        """
+        if self._preferred:
+            tile = self._preferred.choice(self.rng)
+        elif self._all:
+            tile = self._all.choice(self.rng)
+        else:
+            return None
+
+        grid_size = self.game_map.GRID_SIZE
+        grid_y, grid_x = divmod(tile, self.game_map.width)
+        return (
+            grid_x * grid_size + grid_size // 2,
+            grid_y * grid_size + grid_size // 2,
+        )
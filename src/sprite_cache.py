@@ -0,0 +1,109 @@
+"""
+精靈圖像快取模組
+
+提供整個程序共用的圖像快取，每張圖片只從磁碟載入一次，
+縮放與 convert_alpha() 後的結果由所有精靈共用同一個 Surface。
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import pygame
+
+
+class SpriteCache:
+    """
+    程序共用的圖像快取類別
+
+    以 (檔名, 尺寸) 為鍵快取載入後的圖像，並以任意鍵快取程序生成的圖像。
+    快取中的 Surface 會被多個精靈共用，呼叫端不可直接在上面繪圖。
+
+    屬性：
+        ASSETS_DIR: Path - 圖像資源目錄
+        disk_loads: int - 累計從磁碟載入圖像的次數（用於確認啟動後不再讀檔）
+    """
+
+    ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+
+    disk_loads = 0
+    _images: Dict[Tuple[str, Optional[Tuple[int, int]]], Optional[pygame.Surface]] = {}
+    _generated: Dict[Hashable, pygame.Surface] = {}
+
+    @classmethod
+    def load(
+        cls, filename: str, size: Optional[Tuple[int, int]] = None
+    ) -> Optional[pygame.Surface]:
+        """
+        取得圖像（必要時從磁碟載入並縮放）
+
+        參數：
+            filename: 圖像檔案名稱（相對於 ASSETS_DIR）
+            size: 目標尺寸 (寬, 高)，None 表示保持原尺寸
+
+        返回：
+            pygame.Surface - 快取的圖像（成功時），None（載入失敗時）
+        """
+        key = (filename, size)
+        if key in cls._images:
+            return cls._images[key]
+
+        if size is None:
+            image = cls._load_from_disk(filename)
+        else:
+            original = cls.load(filename)
+            image = (
+                pygame.transform.scale(original, size) if original is not None else None
+            )
+
+        cls._images[key] = image
+        return image
+
+    @classmethod
+    def get_or_create(
+        cls, key: Hashable, factory: Callable[[], pygame.Surface]
+    ) -> pygame.Surface:
+        """
+        取得程序生成的圖像，首次使用時呼叫 factory 建立
+
+        參數：
+            key: 快取鍵（例如 ("tank_main", "up")）
+            factory: 建立圖像的函式
+
+        返回：
+            pygame.Surface - 快取的圖像
+        """
+        image = cls._generated.get(key)
+        if image is None:
+            image = factory()
+            cls._generated[key] = image
+        return image
+
+    @classmethod
+    def clear(cls) -> None:
+        """清空所有快取並重設讀檔計數"""
+        cls._images.clear()
+        cls._generated.clear()
+        cls.disk_loads = 0
+
+    @classmethod
+    def _load_from_disk(cls, filename: str) -> Optional[pygame.Surface]:
+        """
+        從磁碟載入圖像並轉換為顯示格式
+
+        參數：
+            filename: 圖像檔案名稱
+
+        返回：
+            pygame.Surface - 載入的圖像（成功時），None（失敗時）
+        """
+        cls.disk_loads += 1
+        try:
+            image = pygame.image.load(str(cls.ASSETS_DIR / filename))
+        except (FileNotFoundError, pygame.error):
+            return None
+
+        try:
+            # 轉換為與螢幕相同的像素格式以加速繪製（需要已建立顯示視窗）
+            return image.convert_alpha()
+        except pygame.error:
+            return image
@@ -0,0 +1,371 @@
+"""
+壓力測試模組
+
+以參數建立可重現的重度戰鬥場景：每種類型（EnemyTank.ENEMY_CONFIGS）各 N 個敵人、
+M 顆已發射的子彈與密集的磚塊地形，由腳本操作（無敵的）玩家，
+模擬固定步數並回報每幀耗時的百分位數（p50/p95/p99），
+用來重現與比較玩家在大規模戰鬥中遇到的卡頓。
+被擊毀的敵人與消失的子彈在每一幀開始前補回（不計入耗時），整段模擬維持相同的規模；
+每幀的敵人數與子彈數一併回報，可以確認負載。
+
+相同的參數與種子建立相同的場景，每一步的遊戲狀態也相同，只有耗時不同。
+每一幀都會把畫面繪製到離屏的 Surface，耗時包含模擬與繪製。
+
+執行方式：
+    python main.py --stress --stress-enemies 30 --stress-bullets 400 --seed 1
+"""
+
+import math
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pygame
+
+from src.enemy import EnemyTank
+from src.game import Game
+from src.headless import ScriptedPlayer, init_headless
+from src.map import Map
+
+DEFAULT_SEED = 1  # 沒有指定種子時使用固定種子，場景可重現
+DEFAULT_ENEMIES = 10  # 每種類型的敵人數
+DEFAULT_BULLETS = 200  # 維持的子彈數
+DEFAULT_BRICK_DENSITY = 0.2
+PERCENTILES = (50, 95, 99)
+
+
+class BrickFieldMap(Map):
+    """
+    密集磚塊地形的地圖
+
+    障礙物全部是磚塊，間距縮小為一格（坦克仍可從磚塊之間通過），
+    數量依密度決定。地圖仍由種子逐區塊生成。
+
+    屬性：
+        brick_density: float - 預設尺寸地圖中磚塊佔格子數的比例（間距一格時上限約 0.25）
+    """
+
+    OBSTACLE_CLEARANCE = 1
+    BRICK_RATIO = 1.0
+
+    def __init__(self, brick_density: float, **kwargs) -> None:
+        """
+        初始化地圖
+
+        參數：
+            brick_density: 磚塊佔格子數的比例
+            **kwargs: 傳給 Map 的參數（seed、width、height、memory_budget）
+        """
+        self.brick_density = brick_density
+        count = round(brick_density * self.MAP_WIDTH * self.MAP_HEIGHT)
+        self.OBSTACLE_MIN = self.OBSTACLE_MAX = count
+        super().__init__(**kwargs)
+
+
+class StressGame(Game):
+    """
+    使用密集磚塊地形、維持固定戰鬥規模的無頭遊戲
+
+    被擊毀的敵人以相同類型補回、子彈補足到指定數量（見 replenish），
+    整段模擬的負載都維持在場景要求的規模。
+
+    屬性：
+        brick_density: float - 磚塊密度（見 BrickFieldMap）
+        enemy_targets: Dict[str, int] - 各類型要維持的敵人數
+        bullet_target: int - 要維持的子彈數
+        respawned: int - 累計補回的敵人數
+        refilled: int - 累計補足的子彈數
+    """
+
+    def __init__(self, brick_density: float, **kwargs) -> None:
+        """
+        初始化遊戲
+
+        參數：
+            brick_density: 磚塊密度
+            **kwargs: 傳給 Game 的參數（map_width、map_height、seed）
+        """
+        # _create_map 在 Game 初始化期間呼叫，必須先設定密度
+        self.brick_density = brick_density
+        self.enemy_targets: Dict[str, int] = {}
+        self.bullet_target = 0
+        self.respawned = 0
+        self.refilled = 0
+        self._next_bullet = 0
+        super().__init__(headless=True, **kwargs)
+
+    def _create_map(self) -> Map:
+        """
+        以對局的亂數產生器決定地圖種子並建立密集磚塊地圖
+
+        返回：
+            Map - 新的地圖
+        """
+        return BrickFieldMap(
+            self.brick_density,
+            seed=self.rng.randrange(2**32),
+            width=self.map_width,
+            height=self.map_height,
+        )
+
+    def _in_enemy_lane(self, x: int, y: int, direction: Tuple[int, int]) -> bool:
+        """
+        檢查從指定位置沿方向飛行的子彈前方是否有敵人
+
+        參數：
+            x: 子彈水平位置（像素）
+            y: 子彈垂直位置（像素）
+            direction: 子彈方向向量
+
+        返回：
+            bool - True 表示子彈會沿直線飛向某個敵人
+        """
+        dx, dy = direction
+        for enemy in self.enemies:
+            rect = enemy.rect
+            if dx and rect.top <= y < rect.bottom and (rect.centerx - x) * dx > 0:
+                return True
+            if dy and rect.left <= x < rect.right and (rect.centery - y) * dy > 0:
+                return True
+        return False
+
+    def fire_bullets(self, count: int) -> int:
+        """
+        在隨機的空格子上發射子彈（玩家與敵人交替，位置與方向隨機）
+
+        玩家的子彈不放在敵人所在的直線上，避免一開始就把敵人全部擊毀。
+
+        參數：
+            count: 子彈數
+
+        返回：
+            int - 實際發射的子彈數（找不到位置時較少）
+        """
+        game_map = self.map
+        grid_size = game_map.GRID_SIZE
+        directions = list(EnemyTank.DIRECTION_VECTORS.values())
+        rng = self.rng
+        fired = 0
+        for _ in range(count):
+            owner = "player" if self._next_bullet % 2 else "enemy"
+            # 隨機選擇一個不是障礙物的格子與方向（找不到時放棄）
+            for _ in range(100):
+                grid_x = rng.randrange(game_map.width)
+                grid_y = rng.randrange(game_map.height)
+                x = grid_x * grid_size + grid_size // 2
+                y = grid_y * grid_size + grid_size // 2
+                direction = rng.choice(directions)
+                if not game_map.is_solid(grid_x, grid_y) and not (
+                    owner == "player" and self._in_enemy_lane(x, y, direction)
+                ):
+                    break
+            else:
+                break
+            self.bullets.spawn(x, y, direction, owner=owner)
+            self._next_bullet += 1
+            fired += 1
+        return fired
+
+    def replenish(self) -> None:
+        """補回被擊毀的敵人（相同類型）並把子彈補足到 bullet_target"""
+        counts = dict.fromkeys(self.enemy_targets, 0)
+        for enemy in self.enemies:
+            counts[enemy.enemy_type] += 1
+        for enemy_type, target in self.enemy_targets.items():
+            for _ in range(target - counts[enemy_type]):
+                if self.spawn_enemy(enemy_type) is None:
+                    break
+                self.respawned += 1
+        missing = self.bullet_target - self.bullets.count
+        if missing > 0:
+            self.refilled += self.fire_bullets(missing)
+
+
+def build_scenario(
+    enemies: int = DEFAULT_ENEMIES,
+    bullets: int = DEFAULT_BULLETS,
+    brick_density: float = DEFAULT_BRICK_DENSITY,
+    seed: Optional[int] = None,
+    map_width: Optional[int] = None,
+    map_height: Optional[int] = None,
+) -> StressGame:
+    """
+    建立壓力測試場景
+
+    對局開始時的隨機敵人會被移除（不啟用敵人波次），場上的敵人數量完全由參數決定；
+    出生格子不足時，實際的敵人數會少於要求的數量。
+
+    參數：
+        enemies: 每種類型的敵人數
+        bullets: 已發射的子彈數（玩家與敵人交替，位置與方向隨機）
+        brick_density: 磚塊密度（見 BrickFieldMap）
+        seed: 亂數種子，None 表示 DEFAULT_SEED
+        map_width: 地圖寬度（格子數），None 表示預設大小
+        map_height: 地圖高度（格子數），None 表示預設大小
+
+    返回：
+        StressGame - 建立好的遊戲
+    """
+    game = StressGame(
+        brick_density,
+        map_width=map_width or Map.MAP_WIDTH,
+        map_height=map_height or Map.MAP_HEIGHT,
+        seed=DEFAULT_SEED if seed is None else seed,
+    )
+    for enemy in game.enemies.sprites():
+        game.spawn_index.remove_tank(enemy)
+        enemy.kill()
+
+    for enemy_type in EnemyTank.ENEMY_CONFIGS:
+        game.enemy_targets[enemy_type] = 0
+        for _ in range(enemies):
+            if game.spawn_enemy(enemy_type) is None:
+                break
+            game.enemy_targets[enemy_type] += 1
+
+    game.bullet_target = game.fire_bullets(bullets)
+    return game
+
+
+def percentile(samples: Sequence[float], percent: float) -> float:
+    """
+    以最近序位法計算百分位數
+
+    參數：
+        samples: 已排序的樣本
+        percent: 百分位（0-100）
+
+    返回：
+        float - 百分位數，沒有樣本時為 0
+    """
+    if not samples:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(samples)), 1)
+    return samples[rank - 1]
+
+
+def _summary(name: str, durations: List[float]) -> str:
+    """
+    產生耗時的百分位數摘要
+
+    參數：
+        name: 項目名稱
+        durations: 每幀的耗時（秒）
+
+    返回：
+        str - 一行摘要（毫秒）
+    """
+    samples = sorted(durations)
+    columns = "  ".join(
+        f"p{percent} {percentile(samples, percent) * 1e3:7.3f}"
+        for percent in PERCENTILES
+    )
+    maximum = samples[-1] if samples else 0.0
+    return f"{name:<7} {columns}  max {maximum * 1e3:7.3f} ms"
+
+
+def _load_summary(name: str, loads: List[int]) -> str:
+    """
+    產生每幀負載（幀開始時的數量）的摘要
+
+    參數：
+        name: 項目名稱
+        loads: 每幀的數量
+
+    返回：
+        str - 最小值、平均值與最大值
+    """
+    if not loads:
+        return f"{name} -"
+    average = sum(loads) / len(loads)
+    return f"{name} min {min(loads)} avg {average:.1f} max {max(loads)}"
+
+
+def run(
+    frames: int,
+    enemies: int = DEFAULT_ENEMIES,
+    bullets: int = DEFAULT_BULLETS,
+    brick_density: float = DEFAULT_BRICK_DENSITY,
+    seed: Optional[int] = None,
+    map_width: Optional[int] = None,
+    map_height: Optional[int] = None,
+    render: bool = True,
+) -> None:
+    """
+    建立場景、模擬固定步數並回報每幀耗時的百分位數
+
+    玩家在整段模擬中無敵，對局不會提早結束。
+
+    參數：
+        frames: 模擬步數
+        enemies: 每種類型的敵人數
+        bullets: 已發射的子彈數
+        brick_density: 磚塊密度
+        seed: 亂數種子，None 表示 DEFAULT_SEED
+        map_width: 地圖寬度（格子數），None 表示預設大小
+        map_height: 地圖高度（格子數），None 表示預設大小
+        render: 每一幀是否繪製到離屏的 Surface
+    """
+    init_headless()
+    start = time.perf_counter()
+    game = build_scenario(enemies, bullets, brick_density, seed, map_width, map_height)
+    build_time = time.perf_counter() - start
+
+    player = ScriptedPlayer(game.seed)
+    game.player.invincible = True
+    game.player.invincible_time = (frames + 1) * game.clock.step_ms
+    screen = pygame.Surface(game.viewport_size) if render else None
+
+    counts: Dict[str, int] = {enemy_type: 0 for enemy_type in EnemyTank.ENEMY_CONFIGS}
+    for enemy in game.enemies:
+        counts[enemy.enemy_type] += 1
+    initial_bullets = game.bullets.count
+
+    updates: List[float] = []
+    draws: List[float] = []
+    totals: List[float] = []
+    enemy_loads: List[int] = []
+    bullet_loads: List[int] = []
+    perf_counter = time.perf_counter
+    for _ in range(frames):
+        # 補回上一幀被擊毀的敵人與子彈（不計入耗時），每一幀都以相同規模模擬
+        game.replenish()
+        enemy_loads.append(len(game.enemies))
+        bullet_loads.append(game.bullets.count)
+        frame_start = perf_counter()
+        player.step(game)
+        game.update(player)
+        update_end = perf_counter()
+        if screen is not None:
+            game.draw(screen)
+        frame_end = perf_counter()
+        updates.append(update_end - frame_start)
+        draws.append(frame_end - update_end)
+        totals.append(frame_end - frame_start)
+
+    print(
+        f"scenario:      seed {game.seed}, map {game.map.width}x{game.map.height}, "
+        f"brick density {brick_density}"
+    )
+    print(
+        "enemies:       "
+        + ", ".join(f"{name} {count}" for name, count in counts.items())
+        + f" (left {len(game.enemies)})"
+    )
+    print(f"bullets:       {initial_bullets} pre-fired, {game.bullets.count} in flight")
+    print(
+        "load/frame:    "
+        + _load_summary("enemies", enemy_loads)
+        + ", "
+        + _load_summary("bullets", bullet_loads)
+    )
+    print(
+        f"replenished:   {game.respawned} enemies respawned, "
+        f"{game.refilled} bullets refilled"
+    )
+    print(f"build:         {build_time * 1e3:.1f} ms")
+    print(f"frames:        {frames} ({sum(totals):.2f} s)")
+    print(_summary("update", updates))
+    if screen is not None:
+        print(_summary("draw", draws))
+        print(_summary("frame", totals))
+    pygame.quit()
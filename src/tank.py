@@ -5,12 +5,16 @@
 坦克會檢查地圖邊界和障礙物碰撞，受傷後有短暫無敵時間。
 """
 
-from pathlib import Path
-from typing import List, Literal, Optional, Tuple
+from typing import TYPE_CHECKING, Literal, Optional, Tuple
 
 import pygame
 
-from src.bullet import Bullet
+from src.bullet import BulletSystem
+from src.clock import SimulationClock
+from src.sprite_cache import SpriteCache
+
+if TYPE_CHECKING:
+    from src.map import Map
 
 
 class PlayerTank(pygame.sprite.Sprite):
@@ -28,8 +32,9 @@ class PlayerTank(pygame.sprite.Sprite):
         speed: float - 移動速度（像素/幀）
         lives: int - 剩餘生命數
         invincible: bool - 是否處於無敵狀態
-        invincible_time: int - 無敵時間計時器（毫秒）
-        last_shoot_time: int - 上次射擊時間
+        invincible_time: float - 剩餘無敵時間（毫秒）
+        last_shoot_time: float - 上次射擊的模擬時間（毫秒）
+        clock: SimulationClock - 提供模擬時間的時鐘
     """
 
     # 坦克常數設定
@@ -41,22 +46,34 @@ class PlayerTank(pygame.sprite.Sprite):
     SHOOT_COOLDOWN = 400  # 射擊冷卻時間（毫秒）
     INVINCIBILITY_TIME = 2000  # 無敵時間（毫秒）
     CANNON_LENGTH = 20  # 砲管長度（像素）
-    WINDOW_WIDTH = 800
-    WINDOW_HEIGHT = 600
     STARTING_X = 400  # 初始 X 座標（視窗寬度中心）
     STARTING_Y = 550  # 初始 Y 座標（靠近底部）
-    ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
-
-    def __init__(self, x: int = STARTING_X, y: int = STARTING_Y) -> None:
+    IMAGE_FILES = {  # 各方向的圖像檔名
+        "up": "tank_main_up.png",
+        "down": "tank_main_down.png",
+        "left": "tank_main_left.png",
+        "right": "tank_main_right.png",
+    }
+
+    def __init__(
+        self,
+        x: int = STARTING_X,
+        y: int = STARTING_Y,
+        clock: Optional[SimulationClock] = None,
+    ) -> None:
         """
         初始化玩家坦克
 
         參數：
             x: 初始水平位置（像素），預設為視窗中心
             y: 初始垂直位置（像素），預設為靠近底部
+            clock: 模擬時鐘（通常由 Game 提供），None 表示使用獨立的時鐘
         """
         super().__init__()
 
+        # 模擬時鐘（射擊冷卻與無敵時間都以模擬時間計算）
+        self.clock = clock if clock is not None else SimulationClock()
+
         # 位置屬性
         self.x = float(x)
         self.y = float(y)
@@ -68,66 +85,87 @@ class PlayerTank(pygame.sprite.Sprite):
         # 生命和狀態
         self.lives = self.STARTING_LIVES
         self.invincible = False
-        self.invincible_time = 0  # 無敵時間計時器
+        self.invincible_time = 0.0  # 剩餘無敵時間
 
-        # 射擊冷卻
-        self.last_shoot_time = 0
+        # 射擊冷卻（初始值讓第一發可以立即射擊）
+        self.last_shoot_time = -float(self.SHOOT_COOLDOWN)
 
         # 載入坦克圖像
-        self.image = self._load_tank_image()
-        if self.image is None:
-            # 如果圖片載入失敗，回退到程序生成
-            self.image = pygame.Surface(
-                (self.TANK_SIZE, self.TANK_SIZE), pygame.SRCALPHA
-            )
-            self._draw_tank_image()
+        self.image = self._get_tank_image()
 
         # 建立碰撞矩形
         self.rect = self.image.get_rect(center=(int(self.x), int(self.y)))
 
+    @classmethod
+    def preload_images(cls) -> None:
+        """
+        預先載入四個方向的坦克圖像到共用快取
+
+        在遊戲開始時呼叫，確保遊戲進行中轉向不會觸發讀檔。
+        """
+        for filename in cls.IMAGE_FILES.values():
+            SpriteCache.load(filename, (cls.TANK_SIZE, cls.TANK_SIZE))
+
+    def _get_tank_image(self) -> pygame.Surface:
+        """
+        取得當前方向的坦克圖像
+
+        優先使用 PNG 圖像，載入失敗時回退到程序生成的圖像。
+
+        返回：
+            pygame.Surface - 共用快取中的坦克圖像
+        """
+        loaded = self._load_tank_image()
+        if loaded is not None:
+            return loaded
+        return self._draw_tank_image()
+
     def _load_tank_image(self) -> Optional[pygame.Surface]:
         """
         載入玩家坦克圖像
 
-        根據當前方向載入對應的 PNG 圖像。
+        根據當前方向從共用快取取得對應的 PNG 圖像（每個方向只讀檔一次）。
         如果載入失敗，返回 None 並觸發回退到程序生成。
 
         返回：
             pygame.Surface - 載入的圖像（成功時），None（失敗時）
         """
-        try:
-            # 建立圖像檔案名稱（使用小寫）
-            direction_file = {
-                "up": "tank_main_up.png",
-                "down": "tank_main_down.png",
-                "left": "tank_main_left.png",
-                "right": "tank_main_right.png",
-            }[self.direction]
-
-            # 載入圖像
-            image_path = self.ASSETS_DIR / direction_file
-            loaded_image = pygame.image.load(str(image_path))
-
-            # 調整圖像大小以符合坦克尺寸（保持寬高比）
-            return pygame.transform.scale(
-                loaded_image, (self.TANK_SIZE, self.TANK_SIZE)
-            )
-        except (FileNotFoundError, pygame.error):
-            # 載入失敗，返回 None
-            return None
+        # 調整圖像大小以符合坦克尺寸
+        return SpriteCache.load(
+            self.IMAGE_FILES[self.direction], (self.TANK_SIZE, self.TANK_SIZE)
+        )
 
-    def _draw_tank_image(self) -> None:
+    def _draw_tank_image(self) -> pygame.Surface:
         """
         程序生成坦克圖像（黃色車身 + 砲管）
 
-        清空當前圖像並繪製新坦克圖像。
+        每個方向只繪製一次，之後從共用快取取得。
+
+        返回：
+            pygame.Surface - 程序生成的坦克圖像
         """
-        # 清空圖像
-        self.image.fill((0, 0, 0, 0))
+        direction = self.direction
+        return SpriteCache.get_or_create(
+            ("tank_main", direction), lambda: self._render_tank_image(direction)
+        )
+
+    def _render_tank_image(
+        self, direction: Literal["up", "down", "left", "right"]
+    ) -> pygame.Surface:
+        """
+        繪製指定方向的坦克圖像
+
+        參數：
+            direction: 砲管朝向
+
+        返回：
+            pygame.Surface - 新繪製的坦克圖像
+        """
+        image = pygame.Surface((self.TANK_SIZE, self.TANK_SIZE), pygame.SRCALPHA)
 
         # 繪製坦克車身（正方形）
         pygame.draw.rect(
-            self.image,
+            image,
             self.TANK_COLOR,
             (
                 0,
@@ -141,15 +179,15 @@ class PlayerTank(pygame.sprite.Sprite):
         center_x = self.TANK_SIZE // 2
         center_y = self.TANK_SIZE // 2
 
-        if self.direction == "up":
+        if direction == "up":
             # 向上的砲管
             start_pos = (center_x, center_y - self.TANK_SIZE // 4)
             end_pos = (center_x, center_y - self.TANK_SIZE // 4 - self.CANNON_LENGTH)
-        elif self.direction == "down":
+        elif direction == "down":
             # 向下的砲管
             start_pos = (center_x, center_y + self.TANK_SIZE // 4)
             end_pos = (center_x, center_y + self.TANK_SIZE // 4 + self.CANNON_LENGTH)
-        elif self.direction == "left":
+        elif direction == "left":
             # 向左的砲管
             start_pos = (center_x - self.TANK_SIZE // 4, center_y)
             end_pos = (
@@ -166,22 +204,24 @@ class PlayerTank(pygame.sprite.Sprite):
 
         # 繪製砲管（深黃色線條）
         pygame.draw.line(
-            self.image,
+            image,
             self.TURRET_COLOR,
             start_pos,
             end_pos,
             width=4,
         )
 
-    def move(self, obstacles: Optional[List[pygame.Rect]] = None) -> None:
+        return image
+
+    def move(self, game_map: "Map") -> None:
         """
         移動坦克到指定方向
 
-        根據當前方向移動坦克，並檢查邊界和障礙物碰撞。
+        根據當前方向移動坦克，並檢查世界邊界和障礙物碰撞。
         如果無法移動，坦克位置不變。
 
         參數：
-            obstacles: 障礙物矩形列表，若為 None 則不檢查碰撞
+            game_map: Map - 提供世界大小與障礙物空間索引的地圖
         """
         # 計算新位置
         new_x = self.x
@@ -196,26 +236,22 @@ class PlayerTank(pygame.sprite.Sprite):
         elif self.direction == "right":
             new_x += self.speed
 
-        # 檢查邊界
+        # 檢查世界邊界
+        world_width, world_height = game_map.pixel_width, game_map.pixel_height
         if (
             new_x - self.TANK_SIZE // 2 < 0
-            or new_x + self.TANK_SIZE // 2 > self.WINDOW_WIDTH
+            or new_x + self.TANK_SIZE // 2 > world_width
             or new_y - self.TANK_SIZE // 2 < 0
-            or new_y + self.TANK_SIZE // 2 > self.WINDOW_HEIGHT
+            or new_y + self.TANK_SIZE // 2 > world_height
         ):
             # 超出邊界，不移動
             return
 
-        # 檢查障礙物碰撞
-        if obstacles:
-            # 創建新位置的碰撞矩形
-            new_rect = self.image.get_rect(center=(int(new_x), int(new_y)))
-
-            # 檢查與任何障礙物的碰撞
-            for obstacle_rect in obstacles:
-                if new_rect.colliderect(obstacle_rect):
-                    # 碰撞到障礙物，不移動
-                    return
+        # 檢查障礙物碰撞（只檢查新位置覆蓋的格子）
+        new_rect = self.image.get_rect(center=(int(new_x), int(new_y)))
+        if game_map.collides_with_obstacle(new_rect):
+            # 碰撞到障礙物，不移動
+            return
 
         # 更新位置
         self.x = new_x
@@ -223,24 +259,24 @@ class PlayerTank(pygame.sprite.Sprite):
         self.rect.centerx = int(self.x)
         self.rect.centery = int(self.y)
 
-    def shoot(self) -> Optional[Bullet]:
+    def shoot(self, bullets: BulletSystem) -> bool:
         """
         射擊子彈
 
-        檢查射擊冷卻，如果可以射擊則創建子彈。
+        檢查射擊冷卻，如果可以射擊則在子彈系統中發射子彈。
         子彈從坦克砲管位置發射。
 
+        參數：
+            bullets: BulletSystem - 接收新子彈的子彈系統
+
         返回：
-            Bullet 實例（如果發射成功），否則返回 None
+            bool - True 表示發射成功
         """
         # 檢查射擊冷卻
-        current_time = pygame.time.get_ticks()
-        if (
-            self.last_shoot_time > 0
-            and current_time - self.last_shoot_time < self.SHOOT_COOLDOWN
-        ):
+        current_time = self.clock.time_ms
+        if current_time - self.last_shoot_time < self.SHOOT_COOLDOWN:
             # 冷卻時間未到
-            return None
+            return False
 
         # 更新上次射擊時間
         self.last_shoot_time = current_time
@@ -264,8 +300,8 @@ class PlayerTank(pygame.sprite.Sprite):
             bullet_x += offset
             direction_vector = (1, 0)
 
-        # 創建子彈
-        bullet = Bullet(
+        # 發射子彈
+        bullets.spawn(
             x=bullet_x,
             y=bullet_y,
             direction=direction_vector,
@@ -273,7 +309,7 @@ class PlayerTank(pygame.sprite.Sprite):
             damage=1,
         )
 
-        return bullet
+        return True
 
     def hit(self) -> None:
         """
@@ -306,11 +342,7 @@ class PlayerTank(pygame.sprite.Sprite):
 
         # 重置方向
         self.direction = "up"
-        loaded = self._load_tank_image()
-        if loaded is not None:
-            self.image = loaded
-        else:
-            self._draw_tank_image()
+        self.image = self._get_tank_image()
 
         # 進入無敵狀態
         self.invincible = True
@@ -320,16 +352,14 @@ class PlayerTank(pygame.sprite.Sprite):
         """
         更新坦克狀態
 
-        每幀調用一次，用於更新無敵時間計時器和其他時間相關的狀態。
+        每個模擬步長調用一次，用於更新無敵時間計時器和其他時間相關的狀態。
         """
-        # 更新無敵時間
+        # 更新無敵時間（每步減去一個模擬步長）
         if self.invincible:
-            self.invincible_time -= pygame.time.get_ticks()
-            # 注意：這裡需要在外部追蹤時間，所以使用幀時間更新
-            # 正確的實現應由 Game 類控制時間流逝
+            self.invincible_time -= self.clock.step_ms
             if self.invincible_time <= 0:
                 self.invincible = False
-                self.invincible_time = 0
+                self.invincible_time = 0.0
 
     def set_direction(self, direction: Literal["up", "down", "left", "right"]) -> None:
         """
@@ -343,11 +373,7 @@ class PlayerTank(pygame.sprite.Sprite):
         if direction in ("up", "down", "left", "right"):
             if self.direction != direction:
                 self.direction = direction
-                loaded = self._load_tank_image()
-                if loaded is not None:
-                    self.image = loaded
-                else:
-                    self._draw_tank_image()
+                self.image = self._get_tank_image()
 
     def get_position(self) -> Tuple[float, float]:
         """
@@ -367,6 +393,44 @@ class PlayerTank(pygame.sprite.Sprite):
         """
         return self.lives
 
+    def get_state(self) -> tuple:
+        """
+        取得還原坦克所需的完整狀態
+
+        返回：
+            tuple - (x, y, 方向, 速度, 生命數, 是否無敵, 剩餘無敵時間, 上次射擊時間)
+        """
+        return (
+            self.x,
+            self.y,
+            self.direction,
+            self.speed,
+            self.lives,
+            self.invincible,
+            self.invincible_time,
+            self.last_shoot_time,
+        )
+
+    def set_state(self, state: tuple) -> None:
+        """
+        還原 get_state 取得的狀態
+
+        參數：
+            state: tuple - get_state 的返回值
+        """
+        (
+            self.x,
+            self.y,
+            self.direction,
+            self.speed,
+            self.lives,
+            self.invincible,
+            self.invincible_time,
+            self.last_shoot_time,
+        ) = state
+        self.rect.center = (int(self.x), int(self.y))
+        self.image = self._get_tank_image()
+
     def draw(self, surface: pygame.Surface) -> None:
         """
         繪製坦克到指定的表面
@@ -0,0 +1,234 @@
+"""
+敵人波次模組
+
+依波次表（數量、類型組成、間隔）在對局中陸續派出敵人。
+波次預設不啟用（Game 的波次表為空），以 Game(waves=...) 或 --waves 開啟。
+波次到了出發時間（或場上已沒有敵人）時，整波敵人的類型一次抽定並放入佇列，
+之後每一步最多生成固定數量的敵人，大型波次分散到多步完成，不會造成單幀的卡頓。
+
+類型抽樣與每步生成數只取決於遊戲狀態，回放與快照保持確定性；
+另外可設定每步的時間預算（毫秒），超出時剩餘的敵人延到下一步生成。
+"""
+
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Sequence, Tuple
+
+from src.enemy import EnemyTank
+
+if TYPE_CHECKING:
+    from src.game import Game
+
+
+class Wave:
+    """
+    一個敵人波次
+
+    屬性：
+        count: int - 敵人數量
+        mix: Dict[str, float] - 各類型敵人（EnemyTank.ENEMY_CONFIGS 的鍵）的抽樣權重
+        interval: float - 與前一波（第一波為對局開始）相隔的模擬時間（秒）
+    """
+
+    def __init__(self, count: int, mix: Dict[str, float], interval: float) -> None:
+        """
+        初始化波次
+
+        參數：
+            count: 敵人數量
+            mix: 各類型敵人的抽樣權重
+            interval: 與前一波相隔的模擬時間（秒）
+
+        異常：
+            ValueError: 如果類型不在 EnemyTank.ENEMY_CONFIGS 中或沒有正的權重
+        """
+        for enemy_type in mix:
+            if enemy_type not in EnemyTank.ENEMY_CONFIGS:
+                raise ValueError(
+                    f"無效的敵人類型: {enemy_type}。"
+                    f"有效類型: {list(EnemyTank.ENEMY_CONFIGS.keys())}"
+                )
+        if not any(weight > 0 for weight in mix.values()):
+            raise ValueError("波次至少需要一種權重為正的敵人類型")
+        self.count = count
+        self.mix = dict(mix)
+        self.interval = interval
+
+
+class WaveScheduler:
+    """
+    依波次表分步生成敵人的排程器
+
+    屬性：
+        waves: List[Wave] - 波次表
+        per_frame: int - 每一步最多生成的敵人數
+        budget_ms: Optional[float] - 每一步生成敵人的時間預算（毫秒），None 表示不限制；
+            預算取決於實際執行時間，設定後模擬不再具有確定性（錄製回放時不要使用）
+        next_wave: int - 下一個要出發的波次索引
+        last_wave_tick: int - 前一波出發的步數（第一波之前為對局開始的步數）
+        pending: Deque[Tuple[str, int]] - 等待生成的敵人（類型, 加入佇列的步數）
+        spawned: int - 累計生成的敵人數
+        latency_ticks: int - 累計從加入佇列到生成的步數
+        max_latency_ticks: int - 單一敵人最長的等待步數
+        spawn_frames: int - 有生成敵人的步數
+        spawn_time: float - 累計生成敵人花費的時間（秒）
+        max_frame_time: float - 單一步生成敵人花費的最長時間（秒）
+        deferred: int - 因每步上限、時間預算或沒有空位而延後的步數
+    """
+
+    # --waves 使用的波次表：(數量, 類型權重, 與前一波相隔的秒數)；
+    # 對局開始時的 3-5 個敵人不在表中
+    WAVES: Sequence[Tuple[int, Dict[str, float], float]] = (
+        (4, {"basic": 3, "fast": 1}, 20.0),
+        (6, {"basic": 2, "fast": 1, "heavy": 1}, 30.0),
+        (8, {"basic": 1, "fast": 1, "heavy": 1}, 30.0),
+    )
+    PER_FRAME = 2  # 每一步最多生成的敵人數
+
+    def __init__(
+        self,
+        waves: Optional[Sequence[Wave]] = None,
+        per_frame: int = PER_FRAME,
+        budget_ms: Optional[float] = None,
+    ) -> None:
+        """
+        初始化排程器
+
+        每步生成數上限（per_frame）只取決於遊戲狀態，一律生效；
+        時間預算取決於實際執行時間，設定後相同種子與輸入不再得到相同結果，
+        因此錄製與播放回放時不要設定（main.py 只在一般遊玩時套用 --spawn-budget-ms）。
+
+        參數：
+            waves: 波次表，None 表示使用 WAVES，空的波次表表示不派出波次
+            per_frame: 每一步最多生成的敵人數
+            budget_ms: 每一步生成敵人的時間預算（毫秒），None 表示不限制
+        """
+        self.waves: List[Wave] = (
+            list(waves) if waves is not None else self.default_waves()
+        )
+        self.per_frame = per_frame
+        self.budget_ms = budget_ms
+        self.next_wave = 0
+        self.last_wave_tick = 0
+        self.pending: Deque[Tuple[str, int]] = deque()
+        self.spawned = 0
+        self.latency_ticks = 0
+        self.max_latency_ticks = 0
+        self.spawn_frames = 0
+        self.spawn_time = 0.0
+        self.max_frame_time = 0.0
+        self.deferred = 0
+        self._step_ms = 0.0
+
+    @classmethod
+    def default_waves(cls) -> List[Wave]:
+        """
+        建立 WAVES 描述的波次表
+
+        返回：
+            List[Wave] - 預設的波次表
+        """
+        return [Wave(count, mix, interval) for count, mix, interval in cls.WAVES]
+
+    @property
+    def finished(self) -> bool:
+        """所有波次都已出發且佇列中沒有等待生成的敵人"""
+        return self.next_wave >= len(self.waves) and not self.pending
+
+    def reset(self) -> None:
+        """從第一波重新開始（新對局時使用，統計數據保留）"""
+        self.next_wave = 0
+        self.last_wave_tick = 0
+        self.pending.clear()
+
+    def update(self, game: "Game") -> None:
+        """
+        推進波次一步：到了出發時間的波次放入佇列，再生成佇列前端的敵人
+
+        參數：
+            game: Game - 遊戲（提供模擬時鐘、亂數產生器與 spawn_enemy）
+        """
+        clock = game.clock
+        ticks = clock.ticks
+        self._step_ms = clock.step_ms
+
+        # 出發時間已到、或場上與佇列都沒有敵人時，派出下一波
+        if self.next_wave < len(self.waves):
+            wave = self.waves[self.next_wave]
+            due = self.last_wave_tick + round(wave.interval * clock.tick_rate)
+            if ticks >= due or (not self.pending and not game.enemies):
+                types = list(wave.mix)
+                weights = [wave.mix[enemy_type] for enemy_type in types]
+                for enemy_type in game.rng.choices(
+                    types, weights=weights, k=wave.count
+                ):
+                    self.pending.append((enemy_type, ticks))
+                self.next_wave += 1
+                self.last_wave_tick = ticks
+
+        if not self.pending:
+            return
+
+        perf_counter = time.perf_counter
+        start = perf_counter()
+        deadline = (
+            start + self.budget_ms / 1000 if self.budget_ms is not None else None
+        )
+        spawned = 0
+        while self.pending and spawned < self.per_frame:
+            if deadline is not None and spawned and perf_counter() > deadline:
+                break
+            enemy_type, queued = self.pending[0]
+            if game.spawn_enemy(enemy_type) is None:
+                break  # 沒有空的出生格子，下一步再試
+            self.pending.popleft()
+            spawned += 1
+            latency = ticks - queued
+            self.latency_ticks += latency
+            self.max_latency_ticks = max(self.max_latency_ticks, latency)
+        if self.pending:
+            self.deferred += 1
+        if spawned:
+            elapsed = perf_counter() - start
+            self.spawned += spawned
+            self.spawn_frames += 1
+            self.spawn_time += elapsed
+            self.max_frame_time = max(self.max_frame_time, elapsed)
+
+    def get_state(self) -> tuple:
+        """
+        取得還原排程所需的狀態（統計數據除外）
+
+        返回：
+            tuple - (下一波索引, 前一波出發步數, 等待生成的 (類型, 加入步數) 列表)
+        """
+        return (self.next_wave, self.last_wave_tick, list(self.pending))
+
+    def set_state(self, state: tuple) -> None:
+        """
+        還原 get_state 取得的狀態
+
+        參數：
+            state: tuple - get_state 的返回值（tuple 可以是 list）
+        """
+        self.next_wave, self.last_wave_tick, pending = state
+        self.pending = deque((enemy_type, queued) for enemy_type, queued in pending)
+
+    def report(self) -> List[str]:
+        """
+        產生生成延遲與每步生成成本的統計摘要
+
+        返回：
+            List[str] - 波次進度、生成延遲（模擬時間）與每步生成耗時
+        """
+        step_ms = self._step_ms
+        spawned = max(self.spawned, 1)
+        frames = max(self.spawn_frames, 1)
+        return [
+            f"waves {self.next_wave}/{len(self.waves)}  spawned {self.spawned:>6}  "
+            f"pending {len(self.pending):>4}  deferred {self.deferred:>6}",
+            f"latency avg {self.latency_ticks / spawned * step_ms:.1f} ms  "
+            f"max {self.max_latency_ticks * step_ms:.1f} ms",
+            f"cost avg {self.spawn_time / frames * 1000:.3f} ms/frame  "
+            f"max {self.max_frame_time * 1000:.3f} ms/frame",
+        ]
@@ -0,0 +1,15 @@
+"""
+測試共用設定
+
+所有測試以 SDL 的虛擬驅動程式執行（不開啟視窗、不輸出聲音）。
+"""
+
+import pytest
+
+from src.headless import init_headless
+
+
+@pytest.fixture(scope="session", autouse=True)
+def headless_pygame() -> None:
+    """整個測試階段只初始化一次無頭的 pygame"""
+    init_headless()
@@ -0,0 +1,17 @@
+"""
+批次模擬測試
+"""
+
+from src import batch
+
+
+def test_worker_count_does_not_change_results() -> None:
+    """單一工作行程與多個工作行程模擬相同種子，每一欄結果都相同"""
+    options = dict(matches=6, seed=3, max_frames=1200)
+    single = batch.run_batch(workers=1, **options)
+    parallel = batch.run_batch(workers=3, **options)
+
+    assert list(single["seed"]) == list(range(3, 9))
+    assert single.keys() == parallel.keys()
+    for name in single:
+        assert list(single[name]) == list(parallel[name]), name
@@ -0,0 +1,36 @@
+"""
+流場測試
+"""
+
+from src.flowfield import FlowField
+from src.game import Game
+from src.headless import ScriptedPlayer, simulate
+
+
+def test_not_computed_when_map_fits_viewport() -> None:
+    """整張地圖都在畫面內時沒有敵人循流場，流場從不計算"""
+    game = Game(headless=True, seed=1)
+    assert game.camera.rect.contains(game.map.rect)
+    game.player.invincible = True
+    game.player.invincible_time = 10**9
+    simulate(game, ScriptedPlayer(1), 3000)
+
+    assert game.flow_field.target is not None
+    assert game.flow_field.computations == 0
+
+
+def test_lazy_field_matches_fresh_computation() -> None:
+    """大型地圖上延後計算的流場與立即計算的結果相同"""
+    game = Game(60, 45, headless=True, seed=4)
+    game.player.invincible = True
+    game.player.invincible_time = 10**9
+    simulate(game, ScriptedPlayer(4), 1500)
+    field = game.flow_field
+    assert field.computations > 0
+
+    fresh = FlowField(game.map)
+    fresh.update(*field.target)
+    for grid_y in range(game.map.height):
+        for grid_x in range(game.map.width):
+            expected = fresh.direction_at(grid_x, grid_y)
+            assert field.direction_at(grid_x, grid_y) == expected
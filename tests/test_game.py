@@ -0,0 +1,77 @@
+"""
+對局確定性測試
+"""
+
+import random
+
+from src.game import Game
+from src.headless import ScriptedPlayer
+
+SEED = 21
+FRAMES = 1500
+
+
+def step(game: Game, player: ScriptedPlayer) -> None:
+    """
+    以腳本玩家推進遊戲一步，分出勝負時重新開始
+
+    參數：
+        game: Game - 要推進的遊戲
+        player: ScriptedPlayer - 操作玩家的腳本
+    """
+    if game.game_over or game.game_won:
+        game.reset()
+    player.step(game)
+    game.update(player)
+
+
+def terrain(game: Game) -> bytes:
+    """
+    讀取整張地圖的地形代碼
+
+    參數：
+        game: Game - 遊戲
+
+    返回：
+        bytes - 逐列串接的地形代碼
+    """
+    game_map = game.map
+    return b"".join(
+        bytes(game_map.tile_row(grid_y, 0, game_map.width))
+        for grid_y in range(game_map.height)
+    )
+
+
+def test_same_seed_and_inputs_give_the_same_game() -> None:
+    """同一行程中交錯推進的兩局，相同種子與輸入每一步的狀態都相同"""
+    first, second = Game(headless=True, seed=SEED), Game(headless=True, seed=SEED)
+    first_player, second_player = ScriptedPlayer(SEED), ScriptedPlayer(SEED)
+    assert terrain(first) == terrain(second)
+
+    noise = random.Random(0)
+    saved = random.getstate()
+    try:
+        for frame in range(FRAMES):
+            step(first, first_player)
+            # 兩局之間使用全域的 random 模組，不影響任何一局
+            random.seed(noise.random())
+            random.random()
+            step(second, second_player)
+            if frame % 100 == 0:
+                assert first.get_state() == second.get_state(), frame
+    finally:
+        random.setstate(saved)
+    assert first.get_state() == second.get_state()
+
+
+def test_different_seed_gives_a_different_game() -> None:
+    """不同的種子產生不同的地圖與對局"""
+    first = Game(headless=True, seed=SEED)
+    second = Game(headless=True, seed=SEED + 1)
+    assert terrain(first) != terrain(second)
+
+    first_player, second_player = ScriptedPlayer(SEED), ScriptedPlayer(SEED + 1)
+    for _ in range(300):
+        step(first, first_player)
+        step(second, second_player)
+    assert first.get_state() != second.get_state()
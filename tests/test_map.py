@@ -0,0 +1,59 @@
+"""
+地圖碰撞查詢測試
+"""
+
+import random
+
+import pygame
+import pytest
+
+from src.map import Map
+
+GRID_SIZE = Map.GRID_SIZE
+
+
+def rect_can_move(game_map: Map, rect: pygame.Rect) -> bool:
+    """
+    以矩形碰撞判斷位置是否可通行（can_shift 取代的原始檢查）
+
+    參數：
+        game_map: Map - 地圖
+        rect: pygame.Rect - 位置的矩形
+
+    返回：
+        bool - True 表示在地圖內且不與障礙物重疊
+    """
+    if not game_map.rect.contains(rect):
+        return False
+    return not game_map.collides_with_obstacle(rect)
+
+
+@pytest.mark.parametrize("memory_budget", [Map.MEMORY_BUDGET, 2500])
+def test_can_shift_matches_rect_collision(memory_budget: int) -> None:
+    """隨機位置、大小與位移下，can_shift 與矩形碰撞檢查的結果相同（含磚塊被摧毀後）"""
+    rng = random.Random(1)
+    for seed in range(3):
+        game_map = Map(seed=seed, width=50, height=50, memory_budget=memory_budget)
+        checks = 0
+        for step in range(3000):
+            size = rng.randint(GRID_SIZE // 2, GRID_SIZE)
+            rect = pygame.Rect(
+                rng.randrange(game_map.pixel_width - size + 1),
+                rng.randrange(game_map.pixel_height - size + 1),
+                size,
+                size,
+            )
+            if step % 25 == 0:
+                # 隨機摧毀磚塊，通行方向表必須跟著更新
+                grid_x = rng.randrange(game_map.width)
+                grid_y = rng.randrange(game_map.height)
+                game_map.destroy_brick(grid_x, grid_y)
+            if not rect_can_move(game_map, rect):
+                continue
+            shift = rng.choice((1, 2, 4, rng.randint(1, GRID_SIZE)))
+            shift *= rng.choice((-1, 1))
+            dx, dy = (shift, 0) if rng.random() < 0.5 else (0, shift)
+            expected = rect_can_move(game_map, rect.move(dx, dy))
+            assert game_map.can_shift(rect, dx, dy) == expected, (seed, rect, dx, dy)
+            checks += 1
+        assert checks > 500
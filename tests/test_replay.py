@@ -0,0 +1,93 @@
+"""
+回放錄製與播放測試
+"""
+
+import random
+from pathlib import Path
+from typing import Dict
+
+from src.game import Game
+from src.replay import (
+    INPUT_DOWN,
+    INPUT_LEFT,
+    INPUT_RESET,
+    INPUT_RIGHT,
+    INPUT_SHOOT,
+    INPUT_UP,
+    Replay,
+    ReplayPlayer,
+    ReplayRecorder,
+    apply_input,
+)
+
+TICKS = 1500
+SNAPSHOT_INTERVAL = 200
+CHECKPOINTS = (1, 199, 200, 201, 777, TICKS)
+DIRECTIONS = (INPUT_UP, INPUT_DOWN, INPUT_LEFT, INPUT_RIGHT)
+
+
+def record(path: Path) -> Dict[int, dict]:
+    """
+    以隨機輸入錄製一段回放並寫入檔案
+
+    參數：
+        path: 回放檔案路徑
+
+    返回：
+        Dict[int, dict] - CHECKPOINTS 各步數完成後的遊戲狀態
+    """
+    rng = random.Random(2)
+    game = Game(headless=True, seed=11)
+    recorder = ReplayRecorder(game, snapshot_interval=SNAPSHOT_INTERVAL)
+    direction = INPUT_UP
+    states = {}
+    for tick in range(1, TICKS + 1):
+        if rng.random() < 0.02:
+            direction = rng.choice(DIRECTIONS)
+        mask = direction
+        if rng.random() < 0.05:
+            mask |= INPUT_SHOOT
+        if game.game_over or game.game_won:
+            mask |= INPUT_RESET
+        apply_input(game, mask)
+        recorder.record(mask)
+        if tick in CHECKPOINTS:
+            states[tick] = game.get_state()
+    recorder.save(path)
+    return states
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    """寫入再讀回的回放內容相同，從頭播放到結尾得到錄製時的最終狀態"""
+    path = tmp_path / "match.twr"
+    states = record(path)
+    replay = Replay.load(path)
+
+    assert replay.ticks == TICKS
+    assert (replay.seed, replay.map_width, replay.map_height) == (11, 20, 15)
+    assert [tick for tick, _ in replay.keyframes] == list(
+        range(0, TICKS + 1, SNAPSHOT_INTERVAL)
+    )
+
+    player = ReplayPlayer(replay)
+    while player.step():
+        pass
+    assert player.tick == TICKS
+    assert player.game.get_state() == states[TICKS]
+
+
+def test_seek(tmp_path: Path) -> None:
+    """往前、往後與跳到關鍵幀上下一步，結果都和錄製時的狀態相同"""
+    path = tmp_path / "match.twr"
+    states = record(path)
+    player = ReplayPlayer(Replay.load(path))
+
+    for tick in (777, 200, 1, 201, 199, TICKS, 777):
+        player.seek(tick)
+        assert player.tick == tick
+        assert player.game.get_state() == states[tick], tick
+
+    # 超過總步數時停在結尾
+    player.seek(TICKS + 100)
+    assert player.tick == TICKS
+    assert not player.step()
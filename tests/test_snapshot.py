@@ -0,0 +1,63 @@
+"""
+快照保存與還原測試
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src import snapshot
+from src.game import Game
+from src.headless import ScriptedPlayer, simulate
+from src.waves import WaveScheduler
+
+
+def play(game: Game, frames: int) -> None:
+    """
+    以腳本玩家推進遊戲，分出勝負時重新開始
+
+    參數：
+        game: Game - 要推進的遊戲
+        frames: 步數
+    """
+    player = ScriptedPlayer(game.seed)
+    done = 0
+    while done < frames:
+        if game.game_over or game.game_won:
+            game.reset()
+        done += simulate(game, player, frames - done) or 1
+
+
+@pytest.mark.parametrize("size", [(20, 15), (60, 45)])
+def test_round_trip(size, tmp_path: Path) -> None:
+    """快照還原到另一個遊戲後狀態相同，之後的模擬也保持一致"""
+    waves = WaveScheduler.default_waves()
+    game = Game(*size, headless=True, seed=5, waves=waves)
+    play(game, 1500)
+    blob = snapshot.dumps(game)
+    state = game.get_state()
+
+    other = Game(*size, headless=True, seed=99, waves=waves)
+    play(other, 50)
+    snapshot.loads(blob, other)
+    assert other.get_state() == state
+
+    # 經由檔案（mmap）還原
+    path = tmp_path / "game.tws"
+    snapshot.save(game, path)
+    restored = Game(*size, headless=True, seed=1, waves=waves)
+    snapshot.load(path, restored)
+    assert restored.get_state() == state
+
+    play(game, 1200)
+    play(other, 1200)
+    play(restored, 1200)
+    assert other.get_state() == game.get_state()
+    assert restored.get_state() == game.get_state()
+
+
+def test_rejects_unknown_data() -> None:
+    """不是快照的資料會引發 ValueError，而不是還原出錯誤的狀態"""
+    game = Game(headless=True, seed=5)
+    with pytest.raises(ValueError):
+        snapshot.loads(b"junk" * 20, game)
@@ -0,0 +1,31 @@
+"""
+壓力測試場景測試
+"""
+
+from src import stress
+from src.headless import ScriptedPlayer
+
+
+def test_load_is_kept_for_the_whole_run() -> None:
+    """每一幀開始前補回敵人與子彈，負載維持在場景要求的規模"""
+    game = stress.build_scenario(enemies=3, bullets=60, seed=1)
+    assert game.enemy_targets == {"basic": 3, "fast": 3, "heavy": 3}
+    assert game.bullet_target == 60
+
+    player = ScriptedPlayer(game.seed)
+    game.player.invincible = True
+    game.player.invincible_time = 10**9
+    for _ in range(300):
+        game.replenish()
+        assert len(game.enemies) == 9
+        assert game.bullets.count >= 60
+        player.step(game)
+        game.update(player)
+    assert game.refilled > 0
+
+
+def test_same_seed_builds_the_same_scenario() -> None:
+    """相同參數與種子建立相同的場景"""
+    first = stress.build_scenario(enemies=2, bullets=40, seed=7)
+    second = stress.build_scenario(enemies=2, bullets=40, seed=7)
+    assert first.get_state() == second.get_state()